@@ -0,0 +1,59 @@
+"""email campaigns
+
+Revision ID: 0c7e5a93d2b6
+Revises: 6f2d8b0c4e17
+Create Date: 2026-10-19 19:14:27.306154
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c7e5a93d2b6'
+down_revision: Union[str, None] = '6f2d8b0c4e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('email_campaigns',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('subject', sa.String(length=255), nullable=False),
+    sa.Column('template', sa.String(length=100), nullable=False),
+    sa.Column('context', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+    sa.Column('role', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('rate_per_second', sa.Float(), nullable=False),
+    sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('sent_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('failed_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_user_id', sa.UUID(), nullable=True),
+    sa.Column('lease_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_email_campaigns_running', 'email_campaigns', ['created_at'], unique=False, postgresql_where=sa.text("status = 'running'"))
+    op.create_table('email_campaign_recipients',
+    sa.Column('campaign_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('last_error', sa.String(length=500), nullable=True),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['campaign_id'], ['email_campaigns.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('campaign_id', 'user_id')
+    )
+    op.create_index('ix_email_campaign_recipients_pending', 'email_campaign_recipients', ['campaign_id', 'user_id'], unique=False, postgresql_where=sa.text("status = 'pending'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_campaign_recipients_pending', table_name='email_campaign_recipients', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_table('email_campaign_recipients')
+    op.drop_index('ix_email_campaigns_running', table_name='email_campaigns', postgresql_where=sa.text("status = 'running'"))
+    op.drop_table('email_campaigns')
@@ -0,0 +1,38 @@
+"""notification digests
+
+Revision ID: 3a6c1e8f5d27
+Revises: 0c7e5a93d2b6
+Create Date: 2026-10-19 21:14:08.402716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a6c1e8f5d27'
+down_revision: Union[str, None] = '0c7e5a93d2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default is stored in the catalog, so existing users are not rewritten.
+    op.add_column('users', sa.Column('notification_delivery', sa.String(length=20), server_default='immediate', nullable=False))
+    op.create_table('pending_notifications',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('message', sa.String(length=500), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_pending_notifications_user_id', 'pending_notifications', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pending_notifications_user_id', table_name='pending_notifications')
+    op.drop_table('pending_notifications')
+    op.drop_column('users', 'notification_delivery')
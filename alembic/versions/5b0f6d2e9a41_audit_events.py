@@ -0,0 +1,49 @@
+"""audit events
+
+Revision ID: 5b0f6d2e9a41
+Revises: ce460261fbc0
+Create Date: 2026-10-19 10:02:17.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b0f6d2e9a41'
+down_revision: Union[str, None] = 'ce460261fbc0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('audit_events',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('actor', sa.String(length=255), nullable=True),
+    sa.Column('action', sa.String(length=50), nullable=False),
+    sa.Column('target_user_id', sa.UUID(), nullable=True),
+    sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_audit_events_target_user_id_id', 'audit_events', ['target_user_id', 'id'], unique=False)
+    op.execute("""
+    CREATE OR REPLACE FUNCTION audit_events_append_only() RETURNS trigger AS $$
+    BEGIN
+        RAISE EXCEPTION 'audit_events is append-only';
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE TRIGGER audit_events_append_only BEFORE UPDATE OR DELETE ON audit_events
+    FOR EACH ROW EXECUTE FUNCTION audit_events_append_only()
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_events_target_user_id_id', table_name='audit_events')
+    op.drop_table('audit_events')
+    op.execute('DROP FUNCTION IF EXISTS audit_events_append_only()')
@@ -0,0 +1,40 @@
+"""email outbox
+
+Revision ID: 6f2d8b0c4e17
+Revises: a58f2c91d7e3
+Create Date: 2026-10-19 18:02:41.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f2d8b0c4e17'
+down_revision: Union[str, None] = 'a58f2c91d7e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('email_outbox',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('email_type', sa.String(length=50), nullable=False),
+    sa.Column('recipient', sa.String(length=255), nullable=False),
+    sa.Column('context', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('last_error', sa.String(length=500), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_email_outbox_next_attempt_at', 'email_outbox', ['next_attempt_at'], unique=False, postgresql_where=sa.text('next_attempt_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_next_attempt_at', table_name='email_outbox', postgresql_where=sa.text('next_attempt_at IS NOT NULL'))
+    op.drop_table('email_outbox')
@@ -0,0 +1,49 @@
+"""login events
+
+Revision ID: 9c3e7a1f4b28
+Revises: 5b0f6d2e9a41
+Create Date: 2026-10-19 11:40:05.122874
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e7a1f4b28'
+down_revision: Union[str, None] = '5b0f6d2e9a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('login_events',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+    sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('succeeded', sa.Boolean(), nullable=False),
+    sa.Column('failure_reason', sa.String(length=50), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'occurred_at'),
+    postgresql_partition_by='RANGE (occurred_at)'
+    )
+    op.create_index('ix_login_events_user_id_occurred_at', 'login_events', ['user_id', 'occurred_at'], unique=False)
+    # This month's partition and the next two; later months are created by LoginEventService's
+    # partition maintenance.
+    today = datetime.now(timezone.utc).date()
+    for offset in range(3):
+        index = today.year * 12 + today.month - 1 + offset
+        start, end = (f"{i // 12:04d}-{i % 12 + 1:02d}" for i in (index, index + 1))
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS login_events_p{start.replace('-', '')} PARTITION OF login_events "
+            f"FOR VALUES FROM ('{start}-01 00:00+00') TO ('{end}-01 00:00+00')"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_login_events_user_id_occurred_at', table_name='login_events')
+    op.drop_table('login_events')
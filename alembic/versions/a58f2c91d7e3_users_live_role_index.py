@@ -0,0 +1,28 @@
+"""users live role index
+
+Revision ID: a58f2c91d7e3
+Revises: e3a9d47c1b60
+Create Date: 2026-10-19 16:55:12.804133
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a58f2c91d7e3'
+down_revision: Union[str, None] = 'e3a9d47c1b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently('ix_users_live_role_id', 'users', ['role', 'id'], postgresql_where=sa.text('deleted_at IS NULL'))
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_users_live_role_id', 'users')
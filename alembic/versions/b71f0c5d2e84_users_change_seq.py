@@ -0,0 +1,46 @@
+"""users change sequence for the change feed
+
+Revision ID: b71f0c5d2e84
+Revises: 9c3e7a1f4b28
+Create Date: 2026-10-19 14:21:37.660184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71f0c5d2e84'
+down_revision: Union[str, None] = '9c3e7a1f4b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default is stored in the catalog, so existing rows are not rewritten; they all
+    # start at 0 and are fed out in id order on a consumer's first full sync.
+    op.add_column('users', sa.Column('change_seq', sa.BigInteger(), server_default=sa.text('0'), nullable=False))
+    op.execute("""
+    CREATE OR REPLACE FUNCTION users_stamp_change() RETURNS trigger AS $$
+    BEGIN
+        NEW.change_seq := pg_current_xact_id()::text::bigint;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE TRIGGER users_stamp_change BEFORE INSERT OR UPDATE ON users
+    FOR EACH ROW EXECUTE FUNCTION users_stamp_change()
+    """)
+    create_index_concurrently('ix_users_change_seq_id', 'users', ['change_seq', 'id'])
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_users_change_seq_id', 'users')
+    op.execute('DROP TRIGGER IF EXISTS users_stamp_change ON users')
+    op.execute('DROP FUNCTION IF EXISTS users_stamp_change()')
+    op.drop_column('users', 'change_seq')
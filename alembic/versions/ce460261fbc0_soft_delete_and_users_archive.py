@@ -0,0 +1,63 @@
+"""soft delete and users archive
+
+Revision ID: ce460261fbc0
+Revises: ef1d775276c0
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.utils.online_migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ce460261fbc0'
+down_revision: Union[str, None] = 'ef1d775276c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+    create_index_concurrently('ix_users_live_id', 'users', ['id'], postgresql_where=sa.text('deleted_at IS NULL'))
+    create_index_concurrently('ix_users_deleted_at', 'users', ['deleted_at'], postgresql_where=sa.text('deleted_at IS NOT NULL'))
+    create_index_concurrently('ix_users_unverified_created_at', 'users', ['created_at'], postgresql_where=sa.text('email_verified = false AND deleted_at IS NULL'))
+    op.create_table('users_archive',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('nickname', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=True),
+    sa.Column('last_name', sa.String(length=100), nullable=True),
+    sa.Column('bio', sa.String(length=500), nullable=True),
+    sa.Column('profile_picture_url', sa.String(length=255), nullable=True),
+    sa.Column('linkedin_profile_url', sa.String(length=255), nullable=True),
+    sa.Column('github_profile_url', sa.String(length=255), nullable=True),
+    sa.Column('role', postgresql.ENUM('ANONYMOUS', 'AUTHENTICATED', 'MANAGER', 'ADMIN', name='UserRole', create_type=False), nullable=False),
+    sa.Column('is_professional', sa.Boolean(), nullable=True),
+    sa.Column('professional_status_updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_login_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('failed_login_attempts', sa.Integer(), nullable=True),
+    sa.Column('is_locked', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('verification_token', sa.String(), nullable=True),
+    sa.Column('email_verified', sa.Boolean(), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_archive_email'), 'users_archive', ['email'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_archive_email'), table_name='users_archive')
+    op.drop_table('users_archive')
+    drop_index_concurrently('ix_users_unverified_created_at', 'users')
+    drop_index_concurrently('ix_users_deleted_at', 'users')
+    drop_index_concurrently('ix_users_live_id', 'users')
+    op.drop_column('users', 'deleted_at')
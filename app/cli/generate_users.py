@@ -0,0 +1,64 @@
+"""
+Fill the users table with synthetic users, for benchmarking against production-sized data.
+
+Every user's password is `Synthetic$<n>Password` for some n below --password-count. Rows are
+generated on --workers processes while earlier chunks are COPYed. By default the secondary indexes
+are dropped for the load and rebuilt at the end, all in one transaction that holds an exclusive lock
+on the table; pass --keep-indexes to commit chunk by chunk instead. The table is ANALYZEd at the end
+so the planner sees the new data right away.
+
+Usage:
+    python -m app.cli.generate_users 1000000
+    python -m app.cli.generate_users 5000000 --seed 42 --verified-ratio 0.6 --chunk-size 100000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from sqlalchemy import text
+from app.database import Database
+from app.dependencies import get_settings
+from app.utils.synthetic_users import SyntheticUsers, copy_users
+
+async def main(count: int, chunk_size: int, workers: int, defer_indexes: bool = True, analyze: bool = True, **options) -> int:
+    settings = get_settings()
+    Database.initialize(settings.database_url)
+    started = time.perf_counter()
+    users = SyntheticUsers(**options)
+    print(f"prepared value pools and {len(users.password_hashes)} password hashes in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    def report(loaded: int):
+        elapsed = time.perf_counter() - started
+        print(f"{loaded} users loaded, {loaded / elapsed:,.0f} rows/s", file=sys.stderr)
+
+    async with Database.get_session_factory()() as session:
+        loaded = await copy_users(session, users, count, chunk_size, workers, defer_indexes, on_chunk=report)
+        if analyze:
+            await session.execute(text("ANALYZE users"))
+            await session.commit()
+    print(f"loaded {loaded} users in {time.perf_counter() - started:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("count", type=int)
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Rows per COPY and transaction")
+    parser.add_argument("--workers", type=int, default=max((os.cpu_count() or 1) - 1, 0),
+                        help="Processes generating rows; 0 generates on a thread (default: one per CPU but one)")
+    parser.add_argument("--keep-indexes", dest="defer_indexes", action="store_false",
+                        help="Maintain indexes during the load and commit every chunk")
+    parser.add_argument("--seed", type=int, default=None, help="Generate the same users on every run")
+    parser.add_argument("--verified-ratio", type=float, default=0.8, help="Share of users with a verified email")
+    parser.add_argument("--locked-ratio", type=float, default=0.02, help="Share of users locked out by failed logins")
+    parser.add_argument("--professional-ratio", type=float, default=0.1, help="Share of verified users with professional status")
+    parser.add_argument("--history-days", type=int, default=730, help="Spread account creation over this many past days")
+    parser.add_argument("--password-count", type=int, default=16, help="Distinct precomputed bcrypt hashes to draw from")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="Cost of the precomputed hashes")
+    parser.add_argument("--no-analyze", dest="analyze", action="store_false", help="Skip ANALYZE after loading")
+    args = vars(parser.parse_args())
+    sys.exit(asyncio.run(main(
+        args.pop("count"), args.pop("chunk_size"), args.pop("workers"), args.pop("defer_indexes"), args.pop("analyze"), **args
+    )))
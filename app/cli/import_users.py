@@ -0,0 +1,51 @@
+"""
+Bulk-import users from a CSV or NDJSON file, the same way `POST /users/import` does.
+
+Usage:
+    python -m app.cli.import_users partner_users.csv
+    python -m app.cli.import_users partner_users.ndjson --format ndjson --report conflicts.json
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import AsyncIterator
+from app.database import Database
+from app.dependencies import get_settings
+from app.schemas.user_import_schemas import UserFileFormat
+from app.services.audit_service import audit_writer
+from app.services.user_import_service import UserImportService
+
+async def _read_file(path: str, block_size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while block := await asyncio.to_thread(f.read, block_size):
+            yield block
+
+async def main(path: str, format: UserFileFormat, report: str = None) -> int:
+    settings = get_settings()
+    Database.initialize(settings.database_url)
+    session_factory = Database.get_session_factory()
+    audit_writer.start(session_factory)
+    try:
+        async with session_factory() as session:
+            result = await UserImportService.import_users(session, _read_file(path), format, actor="cli:import_users")
+    finally:
+        await audit_writer.stop()
+    print(f"received {result.received}, imported {result.imported}, "
+          f"invalid {len(result.invalid)}, conflicts {len(result.conflicts)}")
+    if report:
+        with open(report, "w") as f:
+            f.write(result.model_dump_json(indent=2))
+    return 0 if not result.invalid and not result.conflicts else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=[f.value for f in UserFileFormat], default=None,
+                        help="Input format; defaults to ndjson for .ndjson/.jsonl files and csv otherwise")
+    parser.add_argument("--report", help="Write the full result, with every invalid and conflicting row, as JSON to this file")
+    args = parser.parse_args()
+    format = UserFileFormat(args.format) if args.format else (
+        UserFileFormat.NDJSON if args.path.endswith((".ndjson", ".jsonl")) else UserFileFormat.CSV
+    )
+    sys.exit(asyncio.run(main(args.path, format, args.report)))
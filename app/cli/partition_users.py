@@ -0,0 +1,44 @@
+"""
+Rebuild the users table hash-partitioned by id into COUNT partitions, or unpartitioned with COUNT 0.
+
+Every row is copied into a new table in one transaction that holds an exclusive lock on users, so run
+it in a maintenance window. Then set USERS_PARTITION_COUNT to COUNT and restart the application; it
+refuses to start while the setting and the database disagree on whether users is partitioned.
+
+The migrations work on either layout and do not record it, so this can run at any revision. Run it
+with COUNT 0 before downgrading past the initial migration, which drops users but not the lookup
+tables of a partitioned one.
+
+Usage:
+    python -m app.cli.partition_users 8
+    python -m app.cli.partition_users 0
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from app.database import Database
+from app.dependencies import get_settings
+from app.utils.users_partitioning import repartition_users
+
+async def main(count: int) -> int:
+    settings = get_settings()
+    Database.initialize(settings.database_url)
+    started = time.perf_counter()
+    async with Database.get_session_factory()() as session:
+        previous = await repartition_users(session, count)
+        await session.commit()
+    if previous == count:
+        print(f"users already has {count} partitions; nothing to do" if count else "users is already unpartitioned; nothing to do")
+    else:
+        print(f"rebuilt users from {previous} to {count} partitions in {time.perf_counter() - started:.1f}s")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("count", type=int, help="Hash partitions of users; 0 makes it an ordinary table")
+    args = parser.parse_args()
+    if args.count < 0:
+        parser.error("count must be 0 or more")
+    sys.exit(asyncio.run(main(args.count)))
@@ -0,0 +1,68 @@
+from builtins import BaseException
+import asyncio
+from typing import List
+from app.database import Database
+from app.services.audit_service import audit_writer
+from app.services.campaign_service import campaign_runner
+from app.services.email_outbox_service import email_dispatcher
+from app.services.email_service import EmailService
+from app.services.login_event_service import LoginEventService, login_event_writer
+from app.services.notification_service import notification_digester
+from app.services.user_purge_service import UserPurgeService
+from app.services.webhook_service import webhook_dispatcher
+from app.utils.users_partitioning import check_users_partitioning
+from settings.config import Settings
+
+class AppContainer:
+    """
+    The process-wide resources of a running application: settings, the database engine, the email
+    service with its SMTP connection pool, and the background workers.
+
+    Entering the container initializes `Database`, checks that the users table is laid out as the
+    settings declare, and starts the workers; leaving it stops the workers in reverse order, so that
+    nothing records audit events after the audit writer has flushed, then closes the SMTP sessions
+    and disposes of the engine's connections. It is entered by the application's lifespan; request
+    dependencies resolve to the same settings and email service, which are built once per process.
+    """
+
+    def __init__(self, settings: Settings, email_service: EmailService):
+        self.settings = settings
+        self.email_service = email_service
+        self.session_factory = None
+        self._stop = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._workers = []
+
+    async def __aenter__(self) -> "AppContainer":
+        Database.initialize(self.settings.database_url, self.settings.debug)
+        self.session_factory = Database.get_session_factory()
+        try:
+            async with self.session_factory() as session:
+                await check_users_partitioning(session, self.settings.users_partition_count)
+        except BaseException:
+            await Database.dispose()
+            raise
+        for worker, resources in (
+            (audit_writer, ()),
+            (login_event_writer, ()),
+            (webhook_dispatcher, ()),
+            (email_dispatcher, (self.email_service,)),
+            (campaign_runner, (self.email_service,)),
+            (notification_digester, ()),
+        ):
+            worker.start(self.session_factory, *resources)
+            self._workers.append(worker)
+        self._tasks.append(asyncio.create_task(LoginEventService.run(self.session_factory, self._stop)))
+        if self.settings.purge_enabled:
+            self._tasks.append(asyncio.create_task(UserPurgeService.run(self.session_factory, self._stop)))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._stop.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for worker in reversed(self._workers):
+            await worker.stop()
+        self._tasks.clear()
+        self._workers.clear()
+        await asyncio.to_thread(self.email_service.smtp_client.close)
+        await Database.dispose()
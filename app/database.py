@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
+from app.utils.statement_cache import statement_cache_stats
 
 Base = declarative_base()
 
@@ -13,10 +14,24 @@ class Database:
         """Initialize the async engine and sessionmaker."""
         if cls._engine is None:  # Ensure engine is created once
             cls._engine = create_async_engine(database_url, echo=echo, future=True)
+            statement_cache_stats.install(cls._engine)
             cls._session_factory = sessionmaker(
                 bind=cls._engine, class_=AsyncSession, expire_on_commit=False, future=True
             )
 
+    @classmethod
+    async def dispose(cls):
+        """Close every pooled connection and forget the engine, so `initialize()` may be called again."""
+        if cls._engine is not None:
+            await cls._engine.dispose()
+            cls._engine = None
+            cls._session_factory = None
+
+    @classmethod
+    def statement_cache_stats(cls) -> dict:
+        """Returns compiled-statement cache hit statistics for the engine."""
+        return statement_cache_stats.snapshot()
+
     @classmethod
     def get_session_factory(cls):
         """Returns the session factory, ensuring it's initialized."""
@@ -1,4 +1,5 @@
 from builtins import Exception, dict, str
+from functools import lru_cache
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,17 +7,23 @@ from app.database import Database
 from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
 from app.services.jwt_service import decode_token
-from settings.config import Settings
+from settings.config import Settings, settings
 from fastapi import Depends
 
 def get_settings() -> Settings:
-    """Return application settings."""
-    return Settings()
+    """Return the application settings, read from the environment once when `settings.config` is imported."""
+    return settings
 
+@lru_cache(maxsize=None)
 def get_email_service() -> EmailService:
+    """Return the process-wide email service, so its compiled templates and pooled SMTP sessions are shared."""
     template_manager = TemplateManager()
     return EmailService(template_manager=template_manager)
 
+def get_session_factory():
+    """Dependency for work that outlives the request's own session, such as streaming responses."""
+    return Database.get_session_factory()
+
 async def get_db() -> AsyncSession:
     """Dependency that provides a database session for each request."""
     async_session_factory = Database.get_session_factory()
@@ -1,10 +1,18 @@
 from builtins import Exception
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from starlette.responses import JSONResponse
-from app.database import Database
-from app.dependencies import get_settings
-from app.routers import user_routes
+from app.container import AppContainer
+from app.dependencies import get_email_service, get_settings
+from app.routers import admin_routes, audit_routes, campaign_routes, user_routes, webhook_routes
 from app.utils.api_description import getDescription
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with AppContainer(get_settings(), get_email_service()) as container:
+        app.state.container = container
+        yield
+
 app = FastAPI(
     title="User Management",
     description=getDescription(),
@@ -15,17 +23,15 @@ app = FastAPI(
         "email": "support@example.com",
     },
     license_info={"name": "MIT", "url": "https://opensource.org/licenses/MIT"},
+    lifespan=lifespan,
 )
 
-@app.on_event("startup")
-async def startup_event():
-    settings = get_settings()
-    Database.initialize(settings.database_url, settings.debug)
-
 @app.exception_handler(Exception)
 async def exception_handler(request, exc):
     return JSONResponse(status_code=500, content={"message": "An unexpected error occurred."})
 
 app.include_router(user_routes.router)
-
-
+app.include_router(audit_routes.router)
+app.include_router(admin_routes.router)
+app.include_router(webhook_routes.router)
+app.include_router(campaign_routes.router)
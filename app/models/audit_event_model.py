@@ -0,0 +1,49 @@
+from builtins import int, str
+from datetime import datetime
+import uuid
+from sqlalchemy import BigInteger, Column, DDL, DateTime, Identity, Index, String, event
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class AuditEvent(Base):
+    """
+    An append-only record of a change made to a user, corresponding to the 'audit_events' table.
+
+    Attributes:
+        id (int): Monotonic identifier, also used for keyset pagination.
+        occurred_at (datetime): When the change happened (not when the row was written).
+        actor (str): Subject of the token that made the change, if it came through the API.
+        action (str): What happened, e.g. 'user.role_changed'.
+        target_user_id (UUID): The user that was changed.
+        details (dict): Action-specific data, e.g. the new role.
+    """
+    __tablename__ = "audit_events"
+    __table_args__ = (
+        Index("ix_audit_events_target_user_id_id", "target_user_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True)
+    occurred_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False)
+    actor: Mapped[str] = Column(String(255), nullable=True)
+    action: Mapped[str] = Column(String(50), nullable=False)
+    target_user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), nullable=True)
+    details = Column(JSONB, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<AuditEvent {self.action} on {self.target_user_id}>"
+
+# Rows can be added but never changed or removed, whoever is connected.
+APPEND_ONLY_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION audit_events_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'audit_events is append-only';
+END;
+$$ LANGUAGE plpgsql
+""")
+APPEND_ONLY_TRIGGER = DDL("""
+CREATE TRIGGER audit_events_append_only BEFORE UPDATE OR DELETE ON audit_events
+FOR EACH ROW EXECUTE FUNCTION audit_events_append_only()
+""")
+event.listen(AuditEvent.__table__, "after_create", APPEND_ONLY_FUNCTION.execute_if(dialect="postgresql"))
+event.listen(AuditEvent.__table__, "after_create", APPEND_ONLY_TRIGGER.execute_if(dialect="postgresql"))
@@ -0,0 +1,78 @@
+from builtins import float, int, str
+from datetime import datetime
+from enum import Enum
+import uuid
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class CampaignStatus(str, Enum):
+    RUNNING = "running"
+    PAUSED = "paused"
+    COMPLETED = "completed"
+
+class RecipientStatus(str, Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+class EmailCampaign(Base):
+    """
+    One email sent to every verified user, or to every verified user with a role, corresponding to the
+    'email_campaigns' table.
+
+    Attributes:
+        id (UUID): Unique identifier for the campaign.
+        name (str): What the campaign is about, for admins.
+        subject (str): Subject line of every email.
+        template (str): The email template to render, from the email_templates directory.
+        context (dict): Values the template is rendered with, besides each user's own.
+        role (str): Only users with this role receive the email; everyone verified when unset.
+        status (str): 'running', 'paused' or 'completed'.
+        rate_per_second (float): Most emails sent per second.
+        total (int): Recipients the campaign had when it was created.
+        sent_count (int): Emails sent so far.
+        failed_count (int): Emails that could not be sent.
+        last_user_id (UUID): Recipients are taken from users in id order; the last one taken so far.
+        lease_until (datetime): While set, a runner is sending a batch and no other may claim the campaign.
+        created_at (datetime): When the campaign was created.
+        completed_at (datetime): When the last email was sent.
+    """
+    __tablename__ = "email_campaigns"
+    __table_args__ = (
+        Index("ix_email_campaigns_running", "created_at", postgresql_where=text("status = 'running'")),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name: Mapped[str] = Column(String(255), nullable=False)
+    subject: Mapped[str] = Column(String(255), nullable=False)
+    template: Mapped[str] = Column(String(100), nullable=False)
+    context = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    role: Mapped[str] = Column(String(50), nullable=True)
+    status: Mapped[str] = Column(String(20), nullable=False, default=CampaignStatus.RUNNING.value)
+    rate_per_second: Mapped[float] = Column(Float, nullable=False)
+    total: Mapped[int] = Column(Integer, nullable=False, server_default="0")
+    sent_count: Mapped[int] = Column(Integer, nullable=False, server_default="0")
+    failed_count: Mapped[int] = Column(Integer, nullable=False, server_default="0")
+    last_user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), nullable=True)
+    lease_until: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<EmailCampaign {self.name}, Status: {self.status}>"
+
+class CampaignRecipient(Base):
+    """A user a campaign has taken on, and whether the email reached them, corresponding to the 'email_campaign_recipients' table."""
+    __tablename__ = "email_campaign_recipients"
+    __table_args__ = (
+        Index("ix_email_campaign_recipients_pending", "campaign_id", "user_id", postgresql_where=text("status = 'pending'")),
+    )
+
+    campaign_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("email_campaigns.id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    email: Mapped[str] = Column(String(255), nullable=False)
+    status: Mapped[str] = Column(String(20), nullable=False, default=RecipientStatus.PENDING.value)
+    last_error: Mapped[str] = Column(String(500), nullable=True)
+    sent_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,44 @@
+from builtins import int, str
+from datetime import datetime
+import uuid
+from sqlalchemy import BigInteger, Column, DateTime, Identity, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class EmailOutbox(Base):
+    """
+    An email waiting to be sent, corresponding to the 'email_outbox' table.
+
+    Rows are written in the transaction that makes the change the email is about, and deleted once
+    the email is sent. A row that failed every attempt is kept with no `next_attempt_at`, so it can
+    be inspected and retried.
+
+    Attributes:
+        id (int): Identifier.
+        user_id (UUID): The user the email is about, if any.
+        email_type (str): The template to render, e.g. 'email_verification'.
+        recipient (str): The address to send to.
+        context (dict): Values the template is rendered with.
+        attempts (int): Failed attempts so far.
+        next_attempt_at (datetime): When the email is next due, which also leases it to a dispatcher;
+            none once the email has been given up on.
+        last_error (str): Why the last attempt failed.
+    """
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index("ix_email_outbox_next_attempt_at", "next_attempt_at", postgresql_where=text("next_attempt_at IS NOT NULL")),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True)
+    user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), nullable=True)
+    email_type: Mapped[str] = Column(String(50), nullable=False)
+    recipient: Mapped[str] = Column(String(255), nullable=False)
+    context = Column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+    attempts: Mapped[int] = Column(Integer, nullable=False, server_default="0")
+    next_attempt_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True, server_default=func.now())
+    last_error: Mapped[str] = Column(String(500), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<EmailOutbox {self.email_type} to {self.recipient}>"
@@ -0,0 +1,98 @@
+from builtins import bool, int, str
+from datetime import date, datetime, timezone
+import re
+from typing import List
+import uuid
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Identity, Index, PrimaryKeyConstraint, String, event, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped
+from app.database import Base
+from settings.config import settings
+
+class LoginEvent(Base):
+    """
+    One login attempt, corresponding to the 'login_events' table.
+
+    The table is range-partitioned by `occurred_at`, one partition per calendar month, so old history
+    is removed by dropping whole partitions and queries bounded in time only read the months they
+    cover. Postgres requires the partition key in the primary key, hence `(id, occurred_at)`.
+
+    Attributes:
+        id (int): Identifier, unique together with `occurred_at`.
+        occurred_at (datetime): When the attempt was made.
+        user_id (UUID): The user whose credentials were tried; null when the email matched no user.
+        email (str): The email the attempt was made with.
+        succeeded (bool): Whether the attempt logged the user in.
+        failure_reason (str): Why it failed, e.g. 'bad_password' or 'locked'.
+    """
+    __tablename__ = "login_events"
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "occurred_at"),
+        Index("ix_login_events_user_id_occurred_at", "user_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    id: Mapped[int] = Column(BigInteger, Identity(always=True), nullable=False)
+    occurred_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False)
+    user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), nullable=True)
+    email: Mapped[str] = Column(String(255), nullable=False)
+    succeeded: Mapped[bool] = Column(Boolean, nullable=False)
+    failure_reason: Mapped[str] = Column(String(50), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<LoginEvent {self.email} at {self.occurred_at}: {'ok' if self.succeeded else self.failure_reason}>"
+
+_PARTITION_NAME = re.compile(r"^login_events_p(\d{4})(\d{2})$")
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"login_events_p{month.year:04d}{month.month:02d}"
+
+def partition_ddl(month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF login_events "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') TO ('{_add_months(month, 1).isoformat()} 00:00+00')"
+    )
+
+def upcoming_months(today: date, months_ahead: int) -> List[date]:
+    return [_add_months(today.replace(day=1), offset) for offset in range(months_ahead + 1)]
+
+def existing_partitions(connection: Connection) -> List[str]:
+    return connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = 'login_events' ORDER BY child.relname"
+    )).scalars().all()
+
+def create_partitions(connection: Connection, today: date, months_ahead: int) -> List[str]:
+    """
+    Create the partitions for the month of `today` and the next `months_ahead` months, if missing.
+
+    Months are UTC calendar months. There is deliberately no DEFAULT partition: it would have to be
+    scanned and split whenever a new month is added, so partitions are always made ahead of time.
+    """
+    months = upcoming_months(today, months_ahead)
+    for month in months:
+        connection.execute(text(partition_ddl(month)))
+    return [partition_name(month) for month in months]
+
+def drop_partitions(connection: Connection, today: date, retention_months: int) -> List[str]:
+    """Drop partitions that lie entirely before the last `retention_months` months (the current one included)."""
+    oldest_kept = _add_months(today.replace(day=1), 1 - retention_months)
+    dropped = []
+    for name in existing_partitions(connection):
+        match = _PARTITION_NAME.match(name)
+        if match and date(int(match[1]), int(match[2]), 1) < oldest_kept:
+            connection.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    return dropped
+
+@event.listens_for(LoginEvent.__table__, "after_create")
+def _create_initial_partitions(target, connection, **kw):
+    if connection.dialect.name == "postgresql":
+        create_partitions(connection, datetime.now(timezone.utc).date(), settings.login_events_months_ahead)
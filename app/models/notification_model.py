@@ -0,0 +1,42 @@
+from builtins import int, str
+from datetime import datetime
+from enum import Enum
+import uuid
+from sqlalchemy import BigInteger, Column, DateTime, Identity, Index, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class NotificationDelivery(str, Enum):
+    """How a user wants to hear about changes to their account."""
+    IMMEDIATE = "immediate"
+    DIGEST = "digest"
+
+class PendingNotification(Base):
+    """
+    A notification waiting to go out in a user's next digest email, corresponding to the
+    'pending_notifications' table.
+
+    Rows are written in the transaction that makes the change, and deleted by the digest dispatcher
+    in the transaction that queues the digest email.
+
+    Attributes:
+        id (int): Identifier, increasing in the order notifications were made.
+        user_id (UUID): The user to notify.
+        kind (str): What happened, e.g. 'user.locked'.
+        message (str): The line shown in the digest.
+        created_at (datetime): When the notification was made.
+    """
+    __tablename__ = "pending_notifications"
+    __table_args__ = (
+        Index("ix_pending_notifications_user_id", "user_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True)
+    user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), nullable=False)
+    kind: Mapped[str] = Column(String(50), nullable=False)
+    message: Mapped[str] = Column(String(500), nullable=False)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<PendingNotification {self.kind} for {self.user_id}>"
@@ -0,0 +1,44 @@
+from builtins import bool, int, str
+from datetime import datetime
+import uuid
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, func, Enum as SQLAlchemyEnum
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+from app.models.user_model import UserRole
+
+class UserArchive(Base):
+    """
+    Cold storage for users purged from the 'users' table, corresponding to the 'users_archive' table.
+
+    Rows are moved here by the background purger once they have been soft-deleted, or have stayed
+    unverified for too long, so that the hot table only holds live accounts. The columns mirror
+    `User` without its unique indexes, plus the time the row was archived.
+    """
+    __tablename__ = "users_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    nickname: Mapped[str] = Column(String(50), nullable=False)
+    email: Mapped[str] = Column(String(255), nullable=False, index=True)
+    first_name: Mapped[str] = Column(String(100), nullable=True)
+    last_name: Mapped[str] = Column(String(100), nullable=True)
+    bio: Mapped[str] = Column(String(500), nullable=True)
+    profile_picture_url: Mapped[str] = Column(String(255), nullable=True)
+    linkedin_profile_url: Mapped[str] = Column(String(255), nullable=True)
+    github_profile_url: Mapped[str] = Column(String(255), nullable=True)
+    role: Mapped[UserRole] = Column(SQLAlchemyEnum(UserRole, name='UserRole', create_constraint=False), nullable=False)
+    is_professional: Mapped[bool] = Column(Boolean)
+    professional_status_updated_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    last_login_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    failed_login_attempts: Mapped[int] = Column(Integer)
+    is_locked: Mapped[bool] = Column(Boolean)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = Column(DateTime(timezone=True))
+    verification_token = Column(String, nullable=True)
+    email_verified: Mapped[bool] = Column(Boolean, nullable=False)
+    hashed_password: Mapped[str] = Column(String(255), nullable=False)
+    deleted_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    archived_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UserArchive {self.nickname}, archived at {self.archived_at}>"
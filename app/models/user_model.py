@@ -2,12 +2,22 @@ from builtins import bool, int, str
 from datetime import datetime
 from enum import Enum
 import uuid
+from typing import Dict, List
 from sqlalchemy import (
-    Column, String, Integer, DateTime, Boolean, func, Enum as SQLAlchemyEnum
+    BigInteger, Column, DDL, FetchedValue, String, Integer, DateTime, Boolean, Index, Table, event, func, select, text,
+    Enum as SQLAlchemyEnum
 )
 from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.orm import Mapped, mapped_column
 from app.database import Base
+from settings.config import settings
+
+# With USERS_PARTITION_COUNT > 0 the users table is hash-partitioned by id. Postgres cannot enforce
+# uniqueness across partitions on a column other than the partition key, so email and nickname
+# uniqueness then moves to the user_emails / user_nicknames lookup tables defined below. The setting
+# only declares the layout; an existing database is rebuilt into it with app.cli.partition_users.
+USERS_PARTITION_COUNT = settings.users_partition_count
+USERS_PARTITIONED = USERS_PARTITION_COUNT > 0
 
 class UserRole(Enum):
     """Enumeration of user roles within the application, stored as ENUM in the database."""
@@ -42,6 +52,10 @@ class User(Base):
         is_locked (bool): Flag indicating if the account is locked.
         created_at (datetime): Timestamp when the user was created, set by the server.
         updated_at (datetime): Timestamp of the last update, set by the server.
+        deleted_at (datetime): Tombstone set when the user is soft-deleted; live users have none.
+        change_seq (int): Id of the transaction that last changed the row, set by a trigger; orders the change feed.
+        notification_delivery (str): 'immediate' to email each notification as it happens, 'digest' to
+            collect them into one email per digest window.
 
     Methods:
         lock_account(): Locks the user account.
@@ -49,13 +63,24 @@ class User(Base):
         verify_email(): Marks the user's email as verified.
         has_role(role_name): Checks if the user has a specified role.
         update_professional_status(status): Updates the professional status and logs the update time.
+        is_deleted: Whether the user has been soft-deleted.
     """
     __tablename__ = "users"
     __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Hot queries only ever touch live rows; the purger only ever touches dead or stale ones.
+        Index("ix_users_live_id", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_users_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+        Index("ix_users_unverified_created_at", "created_at", postgresql_where=text("email_verified = false AND deleted_at IS NULL")),
+        Index("ix_users_change_seq_id", "change_seq", "id"),
+        # Bulk admin updates filtered by role walk the matching live users in id order.
+        Index("ix_users_live_role_id", "role", "id", postgresql_where=text("deleted_at IS NULL")),
+        *([{"postgresql_partition_by": "HASH (id)"}] if USERS_PARTITIONED else []),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    nickname: Mapped[str] = Column(String(50), unique=True, nullable=False, index=True)
-    email: Mapped[str] = Column(String(255), unique=True, nullable=False, index=True)
+    nickname: Mapped[str] = Column(String(50), unique=not USERS_PARTITIONED, nullable=False, index=True)
+    email: Mapped[str] = Column(String(255), unique=not USERS_PARTITIONED, nullable=False, index=True)
     first_name: Mapped[str] = Column(String(100), nullable=True)
     last_name: Mapped[str] = Column(String(100), nullable=True)
     bio: Mapped[str] = Column(String(500), nullable=True)
@@ -73,6 +98,9 @@ class User(Base):
     verification_token = Column(String, nullable=True)
     email_verified: Mapped[bool] = Column(Boolean, default=False, nullable=False)
     hashed_password: Mapped[str] = Column(String(255), nullable=False)
+    deleted_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    change_seq: Mapped[int] = Column(BigInteger, nullable=False, server_default=text("0"), server_onupdate=FetchedValue())
+    notification_delivery: Mapped[str] = Column(String(20), nullable=False, default="immediate", server_default="immediate")
 
 
     def __repr__(self) -> str:
@@ -95,3 +123,96 @@ class User(Base):
         """Updates the professional status and logs the update time."""
         self.is_professional = status
         self.professional_status_updated_at = func.now()
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.deleted_at is not None
+
+
+# Every write to users, whether through the ORM, bulk SQL or the asyncpg fast path, is stamped with
+# the id of the transaction making it. Transaction ids only grow, and once one is below the oldest
+# running transaction every change made before it is committed and visible.
+STAMP_CHANGE_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION users_stamp_change() RETURNS trigger AS $$
+BEGIN
+    NEW.change_seq := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+""")
+STAMP_CHANGE_TRIGGER = DDL("""
+CREATE TRIGGER users_stamp_change BEFORE INSERT OR UPDATE ON users
+FOR EACH ROW EXECUTE FUNCTION users_stamp_change()
+""")
+event.listen(User.__table__, "after_create", STAMP_CHANGE_FUNCTION.execute_if(dialect="postgresql"))
+event.listen(User.__table__, "after_create", STAMP_CHANGE_TRIGGER.execute_if(dialect="postgresql"))
+
+# Lookup tables for partitioned mode: each email and nickname maps to the id of the user that owns
+# it. Their primary keys enforce global uniqueness, and lookups by email or nickname go through them
+# to the id, so Postgres only reads the one partition holding that user.
+USER_LOOKUP_TABLES: Dict[str, Table] = {}
+if USERS_PARTITIONED:
+    USER_LOOKUP_TABLES = {
+        "email": Table("user_emails", Base.metadata,
+                       Column("email", String(255), primary_key=True),
+                       Column("user_id", UUID(as_uuid=True), nullable=False)),
+        "nickname": Table("user_nicknames", Base.metadata,
+                          Column("nickname", String(50), primary_key=True),
+                          Column("user_id", UUID(as_uuid=True), nullable=False)),
+    }
+
+def partition_routing(column: str, value) -> List:
+    """Extra criteria that pin a lookup by `column` to a single partition; none when unpartitioned."""
+    table = USER_LOOKUP_TABLES.get(column)
+    if table is None:
+        return []
+    return [User.id == select(table.c.user_id).where(table.c[column] == value).scalar_subquery()]
+
+def partition_routing_sql(column: str, placeholder: str) -> str:
+    """`partition_routing` for hand-written SQL, e.g. `partition_routing_sql('email', '$1')`."""
+    table = USER_LOOKUP_TABLES.get(column)
+    if table is None:
+        return ""
+    return f"id = (SELECT user_id FROM {table.name} WHERE {column} = {placeholder}) AND "
+
+def users_partition_ddl(count: int) -> List[str]:
+    return [
+        f"CREATE TABLE IF NOT EXISTS users_p{remainder} PARTITION OF users "
+        f"FOR VALUES WITH (MODULUS {count}, REMAINDER {remainder})"
+        for remainder in range(count)
+    ]
+
+# Keeps the lookup tables in step with users. A duplicate email or nickname fails on the lookup
+# table's primary key, raising the same IntegrityError a unique index on users would.
+SYNC_LOOKUPS_FUNCTION = DDL("""
+CREATE OR REPLACE FUNCTION users_sync_lookups() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.email IS DISTINCT FROM NEW.email) THEN
+        DELETE FROM user_emails WHERE email = OLD.email;
+    END IF;
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.nickname IS DISTINCT FROM NEW.nickname) THEN
+        DELETE FROM user_nicknames WHERE nickname = OLD.nickname;
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND OLD.email IS DISTINCT FROM NEW.email) THEN
+        INSERT INTO user_emails (email, user_id) VALUES (NEW.email, NEW.id);
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND OLD.nickname IS DISTINCT FROM NEW.nickname) THEN
+        INSERT INTO user_nicknames (nickname, user_id) VALUES (NEW.nickname, NEW.id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""")
+SYNC_LOOKUPS_TRIGGER = DDL("""
+CREATE TRIGGER users_sync_lookups AFTER INSERT OR UPDATE OF email, nickname OR DELETE ON users
+FOR EACH ROW EXECUTE FUNCTION users_sync_lookups()
+""")
+
+if USERS_PARTITIONED:
+    @event.listens_for(User.__table__, "after_create")
+    def _create_partitions(target, connection, **kw):
+        if connection.dialect.name == "postgresql":
+            for statement in users_partition_ddl(USERS_PARTITION_COUNT):
+                connection.execute(text(statement))
+            connection.execute(SYNC_LOOKUPS_FUNCTION)
+            connection.execute(SYNC_LOOKUPS_TRIGGER)
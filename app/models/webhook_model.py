@@ -0,0 +1,79 @@
+from builtins import bool, int, str
+from datetime import datetime
+from typing import List
+import uuid
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Identity, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+
+class WebhookSubscription(Base):
+    """
+    An endpoint that wants to be told about user events, corresponding to the 'webhook_subscriptions' table.
+
+    Attributes:
+        id (UUID): Unique identifier for the subscription.
+        url (str): Where deliveries are POSTed.
+        secret (str): Key used to sign each request body (HMAC-SHA256).
+        events (list[str]): Event types to deliver, e.g. 'user.created'.
+        max_concurrency (int): Most requests in flight to this endpoint at once.
+        is_active (bool): Inactive subscriptions receive no new events.
+        created_at (datetime): When the subscription was created.
+    """
+    __tablename__ = "webhook_subscriptions"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    url: Mapped[str] = Column(String(2048), nullable=False)
+    secret: Mapped[str] = Column(String(255), nullable=False)
+    events: Mapped[List[str]] = Column(ARRAY(String(50)), nullable=False)
+    max_concurrency: Mapped[int] = Column(Integer, nullable=False, default=4)
+    is_active: Mapped[bool] = Column(Boolean, nullable=False, default=True)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<WebhookSubscription {self.url}>"
+
+class WebhookDelivery(Base):
+    """
+    One event waiting to be delivered to one subscription, corresponding to the 'webhook_deliveries' table.
+
+    Rows are deleted once delivered, or moved to 'webhook_dead_letters' after the last failed attempt.
+
+    Attributes:
+        id (int): Identifier, also sent to the endpoint so it can discard duplicates.
+        subscription_id (UUID): The subscription to deliver to.
+        event_type (str): What happened, e.g. 'user.locked'.
+        user_id (UUID): The user it happened to.
+        payload (dict): The event as sent to the endpoint.
+        attempts (int): Failed attempts so far.
+        next_attempt_at (datetime): When the delivery is next due; also leases it to a dispatcher.
+        last_error (str): Why the last attempt failed.
+    """
+    __tablename__ = "webhook_deliveries"
+    __table_args__ = (
+        Index("ix_webhook_deliveries_next_attempt_at", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(always=True), primary_key=True)
+    subscription_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), ForeignKey("webhook_subscriptions.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_type: Mapped[str] = Column(String(50), nullable=False)
+    user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), nullable=True)
+    payload = Column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
+    attempts: Mapped[int] = Column(Integer, nullable=False, server_default="0")
+    next_attempt_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error: Mapped[str] = Column(String(500), nullable=True)
+
+class WebhookDeadLetter(Base):
+    """A delivery that failed every attempt, corresponding to the 'webhook_dead_letters' table."""
+    __tablename__ = "webhook_dead_letters"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    subscription_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), ForeignKey("webhook_subscriptions.id", ondelete="CASCADE"), nullable=False, index=True)
+    event_type: Mapped[str] = Column(String(50), nullable=False)
+    user_id: Mapped[uuid.UUID] = Column(UUID(as_uuid=True), nullable=True)
+    payload = Column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = Column(DateTime(timezone=True), nullable=True)
+    attempts: Mapped[int] = Column(Integer, nullable=False)
+    last_error: Mapped[str] = Column(String(500), nullable=True)
+    failed_at: Mapped[datetime] = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,21 @@
+"""
+Operational endpoints for administrators, such as runtime diagnostics of the database layer.
+"""
+
+from builtins import dict
+from fastapi import APIRouter, Depends
+from fastapi.security import OAuth2PasswordBearer
+from app.database import Database
+from app.dependencies import require_role
+from app.schemas.admin_schemas import StatementCacheStatsResponse
+
+router = APIRouter()
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+
+@router.get("/admin/statement-cache", response_model=StatementCacheStatsResponse, name="statement_cache_stats", tags=["Diagnostics Requires (Admin Role)"])
+async def statement_cache_stats(token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN"]))):
+    """
+    Report how often executed SQL statements were served from SQLAlchemy's compiled-statement cache.
+    """
+    return Database.statement_cache_stats()
@@ -0,0 +1,41 @@
+"""
+Read access to the audit trail of changes made to users.
+
+The trail is append-only and can grow without bound, so it is paged newest first with a `before_id`
+cursor rather than with OFFSET and a total count. Only admins may read it.
+"""
+
+from builtins import dict, int, len
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db, require_role
+from app.schemas.audit_schemas import AuditEventListResponse, AuditEventResponse
+from app.services.audit_service import AuditService
+
+router = APIRouter()
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+
+@router.get("/audit-events", response_model=AuditEventListResponse, name="list_audit_events", tags=["Audit Trail Requires (Admin Role)"])
+async def list_audit_events(
+    before_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    target_user_id: Optional[UUID] = None,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """
+    List audit events, newest first.
+
+    - **before_id**: Only return events older than this one; use `next_before_id` from the previous page.
+    - **limit**: Maximum number of events to return.
+    - **target_user_id**: Only return events about this user.
+    """
+    events = await AuditService.list_events(db, before_id, limit, target_user_id)
+    items = [AuditEventResponse.model_validate(event) for event in events]
+    next_before_id = items[-1].id if len(items) == limit else None
+    return AuditEventListResponse(items=items, next_before_id=next_before_id)
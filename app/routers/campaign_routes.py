@@ -0,0 +1,106 @@
+"""
+Email campaigns: one email to every verified user, or to every verified user with a role.
+
+A campaign starts sending as soon as it is created. The background runner takes recipients from the
+users table in batches, sends at the campaign's rate and records, per recipient, whether the email
+went out. Campaigns can be paused and resumed at any point. Only admins may run campaigns.
+"""
+
+from builtins import dict, int, len
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db, get_email_service, require_role
+from app.models.campaign_model import RecipientStatus
+from app.schemas.campaign_schemas import CampaignCreate, CampaignRecipientListResponse, CampaignRecipientResponse, CampaignResponse
+from app.services.campaign_service import CampaignService
+from app.services.email_service import EmailService
+
+router = APIRouter()
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+
+@router.post("/campaigns", response_model=CampaignResponse, status_code=status.HTTP_201_CREATED, name="create_campaign", tags=["Campaigns Requires (Admin Role)"])
+async def create_campaign(
+    campaign: CampaignCreate,
+    db: AsyncSession = Depends(get_db),
+    email_service: EmailService = Depends(get_email_service),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """Create a campaign and start sending it."""
+    try:
+        created = await CampaignService.create(
+            db, campaign.name, campaign.subject, campaign.template, campaign.context, campaign.role, campaign.rate_per_second, email_service,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return CampaignResponse.model_validate(created)
+
+@router.get("/campaigns", response_model=List[CampaignResponse], name="list_campaigns", tags=["Campaigns Requires (Admin Role)"])
+async def list_campaigns(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    campaigns = await CampaignService.list_campaigns(db)
+    return [CampaignResponse.model_validate(campaign) for campaign in campaigns]
+
+@router.get("/campaigns/{campaign_id}", response_model=CampaignResponse, name="get_campaign", tags=["Campaigns Requires (Admin Role)"])
+async def get_campaign(
+    campaign_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """A campaign and its progress."""
+    campaign = await CampaignService.get(db, campaign_id)
+    if campaign is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+    return CampaignResponse.model_validate(campaign)
+
+async def _transition(db: AsyncSession, campaign_id: UUID, transition, required_status: str) -> CampaignResponse:
+    campaign = await transition(db, campaign_id)
+    if campaign is None:
+        if await CampaignService.get(db, campaign_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign not found")
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Campaign is not {required_status}")
+    return CampaignResponse.model_validate(campaign)
+
+@router.post("/campaigns/{campaign_id}/pause", response_model=CampaignResponse, name="pause_campaign", tags=["Campaigns Requires (Admin Role)"])
+async def pause_campaign(
+    campaign_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """Stop sending once the batch in progress is done."""
+    return await _transition(db, campaign_id, CampaignService.pause, "running")
+
+@router.post("/campaigns/{campaign_id}/resume", response_model=CampaignResponse, name="resume_campaign", tags=["Campaigns Requires (Admin Role)"])
+async def resume_campaign(
+    campaign_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """Carry on sending a paused campaign where it stopped."""
+    return await _transition(db, campaign_id, CampaignService.resume, "paused")
+
+@router.get("/campaigns/{campaign_id}/recipients", response_model=CampaignRecipientListResponse, name="list_campaign_recipients", tags=["Campaigns Requires (Admin Role)"])
+async def list_campaign_recipients(
+    campaign_id: UUID,
+    status_filter: Optional[RecipientStatus] = Query(None, alias="status"),
+    after_user_id: Optional[UUID] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """The users a campaign has reached so far and whether their email was sent, in user id order."""
+    recipients = await CampaignService.list_recipients(db, campaign_id, status_filter, after_user_id, limit)
+    items = [CampaignRecipientResponse.model_validate(recipient) for recipient in recipients]
+    next_after_user_id = items[-1].user_id if len(items) == limit else None
+    return CampaignRecipientListResponse(items=items, next_after_user_id=next_after_user_id)
@@ -18,16 +18,25 @@ Key Highlights:
 - Utilizes OAuth2PasswordBearer for securing API endpoints, requiring valid access tokens for operations.
 """
 
-from builtins import dict, int, len, str
-from datetime import timedelta
+from builtins import dict, float, int, len, sorted, str
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, Request
+from fastapi.responses import StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from pydantic_core import to_json
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.dependencies import get_current_user, get_db, get_email_service, require_role
+from app.dependencies import get_current_user, get_db, get_email_service, get_session_factory, require_role
+from app.schemas.user_import_schemas import UserFileFormat, UserImportResult
+from app.schemas.login_event_schemas import LoginEventListResponse, LoginEventResponse
 from app.schemas.pagination_schema import EnhancedPagination
 from app.schemas.token_schema import TokenResponse
-from app.schemas.user_schemas import LoginRequest, UserBase, UserCreate, UserListResponse, UserResponse, UserUpdate
+from app.models.user_model import UserRole
+from app.schemas.user_schemas import BulkUserOperation, LoginRequest, UserBase, UserChange, UserChangeFeedResponse, UserBatchGetRequest, UserBatchGetResponse, UserBulkUpdateRequest, UserBulkUpdateResponse, UserCreate, UserListResponse, UserResponse, UserResponseList, UserUpdate, USER_RESPONSE_FIELDS, sparse_user_response, sparse_user_response_list
+from app.services.login_event_service import LoginEventService
+from app.services.user_export_service import UserExportService
+from app.services.user_import_service import UserImportService
 from app.services.user_service import UserService
 from app.services.jwt_service import create_access_token
 from app.utils.link_generation import create_user_links, generate_pagination_links
@@ -40,40 +49,194 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
 settings = get_settings()
 
+_FEED_START = (-1, UUID(int=0))
+
+def _json_response(content, status_code: int = status.HTTP_200_OK) -> Response:
+    """Serialize already valid response content straight to JSON bytes, with pydantic-core's serializer."""
+    return Response(content=to_json(content), media_type="application/json", status_code=status_code)
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """The `UserResponse` fields selected by `fields=`, in response order and always with `id`; None selects all."""
+    if fields is None:
+        return None
+    selected = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = selected.difference(USER_RESPONSE_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    selected.add("id")
+    return tuple(name for name in USER_RESPONSE_FIELDS if name in selected)
+
+def _parse_include(include: Optional[str]) -> bool:
+    """Whether `include=` asks for links, the only part of a user response that is left out by default."""
+    if include is None:
+        return False
+    included = {name.strip() for name in include.split(",") if name.strip()}
+    if not included <= {"links"}:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only links can be included")
+    return "links" in included
+
+_FIELDS_QUERY = Query(None, description="Comma-separated user fields to return, e.g. `id,nickname,profile_picture_url`; `id` is always returned. Only these columns are read.")
+_INCLUDE_QUERY = Query(None, description="`links` to add HATEOAS links to each user (and pagination links to a page).")
+
+def _parse_change_cursor(cursor: Optional[str]):
+    if cursor is None:
+        return _FEED_START
+    try:
+        seq, user_id = cursor.split(".", 1)
+        return int(seq), UUID(user_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid change cursor")
+
+# Declared before /users/{user_id}, which would otherwise capture "changes" as an ID.
+@router.get("/users/changes", response_model=UserChangeFeedResponse, name="list_user_changes", tags=["User Management Requires (Admin or Manager Roles)"])
+async def list_user_changes(since: Optional[str] = None, limit: int = Query(100, ge=1, le=1000), db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """
+    List users changed since a cursor, for incremental sync.
+
+    Changes come in the order they were made, one entry per user with its latest state. Deleted users
+    appear as tombstones. Start without `since` to receive every user, then keep polling with
+    `next_cursor`. Tombstones are only kept until the purger archives deleted users, so consumers must
+    poll more often than the purge grace period or start over.
+
+    - **since**: `next_cursor` from the previous response.
+    - **limit**: Maximum number of changes to return.
+    """
+    after_seq, after_id = _parse_change_cursor(since)
+    users = await UserService.list_changes(db, after_seq, after_id, limit)
+    items = [
+        UserChange(id=user.id, deleted=True) if user.is_deleted
+        else UserChange(id=user.id, deleted=False, user=UserResponse.model_validate(user))
+        for user in users
+    ]
+    next_cursor = f"{users[-1].change_seq}.{users[-1].id}" if users else since
+    return UserChangeFeedResponse(items=items, next_cursor=next_cursor, has_more=len(users) == limit)
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an `Accept-Encoding` header allows gzip: listed, or covered by `*`, with a q-value above 0."""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+# Declared before /users/{user_id}, which would otherwise capture "export" as an ID.
+@router.get("/users/export", name="export_users", response_class=StreamingResponse, tags=["User Import and Export Requires (Admin Role)"])
+async def export_users(request: Request, format: UserFileFormat = Query(UserFileFormat.NDJSON), session_factory=Depends(get_session_factory), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN"]))):
+    """
+    Stream every user as NDJSON or CSV, without paging.
+
+    Users are read through a server-side cursor and written out batch by batch, so the export starts
+    immediately and does not grow in memory with the table. The body is gzip-compressed when the
+    client's `Accept-Encoding` allows gzip with a q-value above 0.
+
+    - **format**: `ndjson` (one JSON object per line) or `csv` (with a header line).
+    """
+    gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    headers = {"Content-Disposition": f'attachment; filename="users.{format.value}"', "Vary": "Accept-Encoding"}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    media_type = "text/csv" if format == UserFileFormat.CSV else "application/x-ndjson"
+    return StreamingResponse(UserExportService.stream(session_factory, format, gzip), media_type=media_type, headers=headers)
+
 @router.get("/users/{user_id}", response_model=UserResponse, name="get_user", tags=["User Management Requires (Admin or Manager Roles)"])
-async def get_user(user_id: UUID, request: Request, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+async def get_user(user_id: UUID, request: Request, fields: Optional[str] = _FIELDS_QUERY, include: Optional[str] = _INCLUDE_QUERY, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
     """
     Endpoint to fetch a user by their unique identifier (UUID).
 
-    Utilizes the UserService to query the database asynchronously for the user and constructs a response
-    model that includes the user's details along with HATEOAS links for possible next actions.
+    Utilizes the UserService fast path to read the user's profile columns asynchronously and map them
+    straight into the response model, without building an ORM instance, which is serialized as is.
 
     Args:
         user_id: UUID of the user to fetch.
         request: The request object, used to generate full URLs in the response.
+        fields: Comma-separated fields to return; only their columns are read.
+        include: `links` to add the user's HATEOAS links.
         db: Dependency that provides an AsyncSession for database access.
         token: The OAuth2 access token obtained through OAuth2PasswordBearer dependency.
     """
-    user = await UserService.get_by_id(db, user_id)
+    fieldset, links = _parse_fields(fields), _parse_include(include)
+    if links and fieldset is None:
+        fieldset = USER_RESPONSE_FIELDS
+    user = await UserService.get_profile_by_id(db, user_id, fieldset)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    if links:
+        user = sparse_user_response(fieldset, True).model_construct(**dict(user), links=create_user_links(user.id, request))
+    return _json_response(user)
 
-    return UserResponse.model_construct(
-        id=user.id,
-        nickname=user.nickname,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        bio=user.bio,
-        profile_picture_url=user.profile_picture_url,
-        github_profile_url=user.github_profile_url,
-        linkedin_profile_url=user.linkedin_profile_url,
-        role=user.role,
-        email=user.email,
-        last_login_at=user.last_login_at,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        links=create_user_links(user.id, request)  
-    )
+@router.post("/users/batch-get", response_model=UserBatchGetResponse, name="batch_get_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def batch_get_users(batch: UserBatchGetRequest, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """
+    Resolve several users by their unique identifiers in one request.
+
+    All IDs are looked up with a single query. Found users are returned in the order their IDs
+    were requested, and IDs that do not match any user are reported in `missing`.
+
+    - **ids**: UUIDs of the users to fetch (up to the configured batch limit).
+    """
+    users_by_id = {user.id: user for user in await UserService.get_by_ids(db, batch.ids)}
+    found, missing = [], []
+    for user_id in dict.fromkeys(batch.ids):
+        user = users_by_id.get(user_id)
+        if user is None:
+            missing.append(user_id)
+        else:
+            found.append(user)
+    items = UserResponseList.validate_python(found, from_attributes=True)
+    return UserBatchGetResponse(items=items, missing=missing)
+
+@router.post("/users/bulk-update", response_model=UserBulkUpdateResponse, name="bulk_update_users", tags=["User Management Requires (Admin or Manager Roles)"])
+async def bulk_update_users(bulk: UserBulkUpdateRequest, db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
+    """
+    Apply one admin operation to many users at once.
+
+    The operation is applied with set-based updates, either to an explicit list of IDs or to every
+    user matching a filter, and the number of affected users is returned. Only admins may change roles.
+
+    - **operation**: One of `set_role`, `lock`, `unlock` or `set_professional_status`.
+    - **ids** / **filter**: The target users; exactly one must be given.
+    - **role** / **is_professional**: The new value for `set_role` / `set_professional_status`.
+    """
+    if bulk.operation == BulkUserOperation.SET_ROLE and current_user["role"] != "ADMIN":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can change user roles")
+
+    filters = bulk.filter.model_dump(exclude_none=True) if bulk.filter else None
+    if filters and "role" in filters:
+        filters["role"] = UserRole(filters["role"].value)
+
+    if bulk.operation == BulkUserOperation.SET_ROLE:
+        affected = await UserService.bulk_set_role(db, UserRole(bulk.role.value), bulk.ids, filters, actor=current_user["user_id"])
+    elif bulk.operation == BulkUserOperation.LOCK:
+        affected = await UserService.bulk_lock(db, bulk.ids, filters, actor=current_user["user_id"])
+    elif bulk.operation == BulkUserOperation.UNLOCK:
+        affected = await UserService.bulk_unlock(db, bulk.ids, filters, actor=current_user["user_id"])
+    else:
+        affected = await UserService.bulk_update_professional_status(db, bulk.is_professional, bulk.ids, filters, actor=current_user["user_id"])
+    return UserBulkUpdateResponse(operation=bulk.operation, affected=affected)
+
+@router.post("/users/import", response_model=UserImportResult, name="import_users", tags=["User Import and Export Requires (Admin Role)"])
+async def import_users(request: Request, format: UserFileFormat = Query(UserFileFormat.CSV), db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN"]))):
+    """
+    Create many users from a CSV or NDJSON request body, streamed rather than buffered.
+
+    Each record has the fields of `POST /users/` (`email` and `password` required). A `password` that is
+    already a bcrypt hash is stored as-is. Invalid records and records whose email or nickname is taken
+    are skipped and reported; everything else is imported. No verification emails are sent.
+
+    - **format**: `csv` (with a header line) or `ndjson` (one JSON object per line).
+    """
+    return await UserImportService.import_users(db, request.stream(), format, actor=current_user["user_id"])
 
 # Additional endpoints for update, delete, create, and list users follow a similar pattern, using
 # asynchronous database operations, handling security with OAuth2PasswordBearer, and enhancing response
@@ -91,7 +254,7 @@ async def update_user(user_id: UUID, user_update: UserUpdate, request: Request,
     - **user_update**: UserUpdate model with updated user information.
     """
     user_data = user_update.model_dump(exclude_unset=True)
-    updated_user = await UserService.update(db, user_id, user_data)
+    updated_user = await UserService.update(db, user_id, user_data, actor=current_user["user_id"])
     if not updated_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
@@ -119,12 +282,43 @@ async def delete_user(user_id: UUID, db: AsyncSession = Depends(get_db), token:
 
     - **user_id**: UUID of the user to delete.
     """
-    success = await UserService.delete(db, user_id)
+    success = await UserService.delete(db, user_id, actor=current_user["user_id"])
     if not success:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@router.get("/users/{user_id}/logins", response_model=LoginEventListResponse, name="list_user_logins", tags=["User Management Requires (Admin or Manager Roles)"])
+async def list_user_logins(
+    user_id: UUID,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
+):
+    """
+    List a user's login attempts, newest first.
+
+    - **user_id**: UUID of the user.
+    - **since**, **until**: Time window to search; defaults to the last 30 days. Narrow windows only read the months they cover.
+    - **before_id**: With `until`, continue from a previous page using its `next_until` and `next_before_id`.
+    - **limit**: Maximum number of attempts to return.
+    """
+    until = until or datetime.now(timezone.utc)
+    since = since or until - timedelta(days=30)
+    events = await LoginEventService.list_for_user(db, user_id, since, until, before_id, limit)
+    items = [LoginEventResponse.model_validate(event) for event in events]
+    last = items[-1] if len(items) == limit else None
+    return LoginEventListResponse(
+        items=items,
+        next_until=last.occurred_at if last else None,
+        next_before_id=last.id if last else None,
+    )
+
+
 
 @router.post("/users/", response_model=UserResponse, status_code=status.HTTP_201_CREATED, tags=["User Management Requires (Admin or Manager Roles)"], name="create_user")
 async def create_user(user: UserCreate, request: Request, db: AsyncSession = Depends(get_db), email_service: EmailService = Depends(get_email_service), token: str = Depends(oauth2_scheme), current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))):
@@ -143,7 +337,8 @@ async def create_user(user: UserCreate, request: Request, db: AsyncSession = Dep
     Returns:
     - UserResponse: The newly created user's information along with navigation links.
     """
-    existing_user = await UserService.get_by_email(db, user.email)
+    # Soft-deleted users keep their email until they are purged.
+    existing_user = await UserService.get_by_email(db, user.email, include_deleted=True)
     if existing_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
     
@@ -172,26 +367,38 @@ async def list_users(
     request: Request,
     skip: int = 0,
     limit: int = 10,
+    fields: Optional[str] = _FIELDS_QUERY,
+    include: Optional[str] = _INCLUDE_QUERY,
     db: AsyncSession = Depends(get_db),
     current_user: dict = Depends(require_role(["ADMIN", "MANAGER"]))
 ):
-    total_users = await UserService.count(db)
-    users = await UserService.list_users(db, skip, limit)
+    """
+    List users a page at a time.
 
-    user_responses = [
-        UserResponse.model_validate(user) for user in users
-    ]
-    
-    pagination_links = generate_pagination_links(request, skip, limit, total_users)
-    
-    # Construct the final response with pagination details
-    return UserListResponse(
-        items=user_responses,
-        total=total_users,
-        page=skip // limit + 1,
-        size=len(user_responses),
-        links=pagination_links  # Ensure you have appropriate logic to create these links
-    )
+    The page is validated in bulk and serialized straight to JSON bytes; returning a `Response`
+    skips FastAPI validating and serializing the `response_model` a second time.
+
+    - **fields**: Comma-separated user fields to return; only their columns are read.
+    - **include**: `links` to add each user's links and the page's pagination links.
+    """
+    fieldset, links = _parse_fields(fields), _parse_include(include)
+    total_users = await UserService.count(db)
+    page = skip // limit + 1
+
+    if fieldset is None and not links:
+        users = await UserService.list_users(db, skip, limit)
+        user_responses = UserResponseList.validate_python(users, from_attributes=True)
+        return _json_response(UserListResponse.model_construct(items=user_responses, total=total_users, page=page, size=len(user_responses)))
+
+    fieldset = fieldset or USER_RESPONSE_FIELDS
+    users = await UserService.list_users(db, skip, limit, fieldset)
+    items = sparse_user_response_list(fieldset, links).validate_python(users, from_attributes=True)
+    content = {"items": items, "total": total_users, "page": page, "size": len(items)}
+    if links:
+        for item in items:
+            item.links = create_user_links(item.id, request)
+        content["links"] = generate_pagination_links(request, skip, limit, total_users)
+    return _json_response(content)
 
 
 @router.post("/register/", response_model=UserResponse, tags=["Login and Registration"])
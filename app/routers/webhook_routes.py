@@ -0,0 +1,90 @@
+"""
+Management of outbound webhook subscriptions.
+
+Subscribers are told when users are created, verified, locked or deleted. Events are delivered in
+batches by the background dispatcher; the ones that keep failing end up in the dead-letter list,
+from where they can be replayed once the endpoint is fixed. Only admins may manage webhooks.
+"""
+
+from builtins import dict, int, len
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_db, require_role
+from app.schemas.webhook_schemas import (
+    WebhookDeadLetterListResponse, WebhookDeadLetterResponse, WebhookSubscriptionCreate, WebhookSubscriptionCreated,
+    WebhookSubscriptionResponse,
+)
+from app.services.webhook_service import WebhookService
+
+router = APIRouter()
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+
+@router.post("/webhooks", response_model=WebhookSubscriptionCreated, status_code=status.HTTP_201_CREATED, name="create_webhook", tags=["Webhooks Requires (Admin Role)"])
+async def create_webhook(
+    subscription: WebhookSubscriptionCreate,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """
+    Subscribe an endpoint to user events.
+
+    Each POST carries `{"deliveries": [...]}` and an `X-Webhook-Signature: sha256=<hex>` header, the
+    HMAC-SHA256 of the body keyed with the returned `secret`.
+    """
+    created = await WebhookService.create_subscription(
+        db, subscription.url, [event.value for event in subscription.events], subscription.secret, subscription.max_concurrency,
+    )
+    return WebhookSubscriptionCreated.model_validate(created)
+
+@router.get("/webhooks", response_model=List[WebhookSubscriptionResponse], name="list_webhooks", tags=["Webhooks Requires (Admin Role)"])
+async def list_webhooks(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    subscriptions = await WebhookService.list_subscriptions(db)
+    return [WebhookSubscriptionResponse.model_validate(subscription) for subscription in subscriptions]
+
+# Declared before /webhooks/{subscription_id} routes so that "dead-letters" is not read as an ID.
+@router.get("/webhooks/dead-letters", response_model=WebhookDeadLetterListResponse, name="list_webhook_dead_letters", tags=["Webhooks Requires (Admin Role)"])
+async def list_webhook_dead_letters(
+    before_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """List deliveries that failed every attempt, newest first."""
+    dead_letters = await WebhookService.list_dead_letters(db, before_id, limit)
+    items = [WebhookDeadLetterResponse.model_validate(dead_letter) for dead_letter in dead_letters]
+    next_before_id = items[-1].id if len(items) == limit else None
+    return WebhookDeadLetterListResponse(items=items, next_before_id=next_before_id)
+
+@router.post("/webhooks/dead-letters/{dead_letter_id}/replay", status_code=status.HTTP_202_ACCEPTED, name="replay_webhook_dead_letter", tags=["Webhooks Requires (Admin Role)"])
+async def replay_webhook_dead_letter(
+    dead_letter_id: int,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """Queue a dead letter for delivery again, with a fresh set of attempts."""
+    if not await WebhookService.replay_dead_letter(db, dead_letter_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dead letter not found")
+    return Response(status_code=status.HTTP_202_ACCEPTED)
+
+@router.delete("/webhooks/{subscription_id}", status_code=status.HTTP_204_NO_CONTENT, name="delete_webhook", tags=["Webhooks Requires (Admin Role)"])
+async def delete_webhook(
+    subscription_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: dict = Depends(require_role(["ADMIN"]))
+):
+    """Delete a subscription along with its undelivered events and dead letters."""
+    if not await WebhookService.delete_subscription(db, subscription_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Webhook not found")
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+class StatementCacheStatsResponse(BaseModel):
+    hits: int = Field(..., description="Executions whose compiled SQL came from the cache.", example=9950)
+    misses: int = Field(..., description="Executions that had to compile their SQL.", example=50)
+    uncached: int = Field(..., description="Executions that were not eligible for caching, e.g. DDL or raw SQL.", example=3)
+    hit_ratio: float = Field(..., description="hits / (hits + misses).", example=0.995)
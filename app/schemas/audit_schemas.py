@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import uuid
+from pydantic import BaseModel, Field
+
+class AuditEventResponse(BaseModel):
+    id: int = Field(..., example=1024)
+    occurred_at: datetime = Field(..., example="2024-04-20T21:20:32+00:00")
+    actor: Optional[str] = Field(None, example="admin@example.com")
+    action: str = Field(..., example="user.role_changed")
+    target_user_id: Optional[uuid.UUID] = Field(None, example=uuid.uuid4())
+    details: Optional[Dict[str, Any]] = Field(None, example={"role": "MANAGER"})
+
+    class Config:
+        from_attributes = True
+
+class AuditEventListResponse(BaseModel):
+    items: List[AuditEventResponse]
+    next_before_id: Optional[int] = Field(None, description="Pass as `before_id` to fetch the next (older) page; null on the last page.", example=1000)
@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+import uuid
+from pydantic import BaseModel, Field
+from app.models.campaign_model import CampaignStatus, RecipientStatus
+from app.models.user_model import UserRole
+
+class CampaignCreate(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255, example="Spring product update")
+    subject: str = Field(..., min_length=1, max_length=255, example="What's new this spring")
+    template: str = Field("announcement", pattern=r"^[A-Za-z0-9_-]+$", max_length=100, description="An email template, without the .md extension.")
+    context: Dict[str, str] = Field(default_factory=dict, description="Template values shared by every recipient; `name`, `nickname` and `email` are filled in per user.", example={"message": "We have shipped dark mode."})
+    role: Optional[UserRole] = Field(None, description="Only send to verified users with this role; to every verified user when omitted.")
+    rate_per_second: float = Field(10.0, gt=0, le=1000, description="Most emails sent per second.")
+
+class CampaignResponse(BaseModel):
+    id: uuid.UUID = Field(..., example=uuid.uuid4())
+    name: str = Field(..., example="Spring product update")
+    subject: str = Field(..., example="What's new this spring")
+    template: str = Field(..., example="announcement")
+    role: Optional[UserRole] = Field(None, example=None)
+    status: CampaignStatus = Field(..., example=CampaignStatus.RUNNING)
+    rate_per_second: float = Field(..., example=10.0)
+    total: int = Field(..., description="Recipients when the campaign was created.", example=120000)
+    sent_count: int = Field(..., example=4500)
+    failed_count: int = Field(..., example=3)
+    created_at: Optional[datetime] = Field(None, example="2024-04-20T21:20:32+00:00")
+    completed_at: Optional[datetime] = Field(None, example=None)
+
+    class Config:
+        from_attributes = True
+
+class CampaignRecipientResponse(BaseModel):
+    user_id: uuid.UUID = Field(..., example=uuid.uuid4())
+    email: str = Field(..., example="john.doe@example.com")
+    status: RecipientStatus = Field(..., example=RecipientStatus.FAILED)
+    last_error: Optional[str] = Field(None, example="SMTPRecipientsRefused: {'john.doe@example.com': (550, b'No such user')}")
+    sent_at: Optional[datetime] = Field(None, example=None)
+
+    class Config:
+        from_attributes = True
+
+class CampaignRecipientListResponse(BaseModel):
+    items: List[CampaignRecipientResponse]
+    next_after_user_id: Optional[uuid.UUID] = Field(None, description="Pass as `after_user_id` to fetch the next page; null on the last page.")
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import List, Optional
+import uuid
+from pydantic import BaseModel, Field
+
+class LoginEventResponse(BaseModel):
+    id: int = Field(..., example=4096)
+    occurred_at: datetime = Field(..., example="2024-04-20T21:20:32+00:00")
+    user_id: Optional[uuid.UUID] = Field(None, example=uuid.uuid4())
+    email: str = Field(..., example="john.doe@example.com")
+    succeeded: bool = Field(..., example=False)
+    failure_reason: Optional[str] = Field(None, example="bad_password")
+
+    class Config:
+        from_attributes = True
+
+class LoginEventListResponse(BaseModel):
+    items: List[LoginEventResponse]
+    next_until: Optional[datetime] = Field(None, description="Pass as `until`, with `next_before_id` as `before_id`, to fetch the next (older) page; null on the last page.")
+    next_before_id: Optional[int] = Field(None, example=4000)
@@ -0,0 +1,23 @@
+from enum import Enum
+from typing import List
+from pydantic import BaseModel, Field
+
+class UserFileFormat(str, Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+class ImportRowError(BaseModel):
+    line: int = Field(..., example=12)
+    errors: List[str] = Field(..., example=["email: value is not a valid email address"])
+
+class ImportConflict(BaseModel):
+    line: int = Field(..., example=57)
+    email: str = Field(..., example="john.doe@example.com")
+    nickname: str = Field(..., example="john_doe")
+    reason: str = Field(..., description="'email_taken' or 'nickname_taken' by an existing user, or 'duplicate_in_file' when an earlier record of the same chunk was imported with that email or nickname", example="email_taken")
+
+class UserImportResult(BaseModel):
+    received: int = Field(0, description="Records read from the input.")
+    imported: int = Field(0, description="Users created.")
+    invalid: List[ImportRowError] = Field(default_factory=list, description="Records rejected by validation.")
+    conflicts: List[ImportConflict] = Field(default_factory=list, description="Valid records whose email or nickname was already taken.")
@@ -1,11 +1,15 @@
-from pydantic import BaseModel, Field, validator, root_validator,EmailStr
-from typing import List, Optional
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model, validator, root_validator,EmailStr
+from typing import List, Optional, Tuple, Type
 import uuid
 from datetime import datetime
 from enum import Enum
 import re
 
+from app.models.notification_model import NotificationDelivery
+from app.schemas.link_schema import Link
 from app.utils.nickname_gen import generate_nickname
+from settings.config import settings
 
 class UserRole(str, Enum):
     ANONYMOUS = "ANONYMOUS"
@@ -49,6 +53,7 @@ class UserUpdate(UserBase):
     profile_picture_url: Optional[str] = Field(None, example="https://example.com/profiles/john.jpg")
     linkedin_profile_url: Optional[str] = Field(None, example="https://linkedin.com/in/johndoe")
     github_profile_url: Optional[str] = Field(None, example="https://github.com/johndoe")
+    notification_delivery: Optional[NotificationDelivery] = Field(None, description="'digest' collects notifications into one email per digest window.", example="digest")
 
     @root_validator(pre=True)
     def check_at_least_one_value(cls, values):
@@ -61,6 +66,64 @@ class UserResponse(UserBase):
     role: UserRole = Field(default=UserRole.AUTHENTICATED, example="AUTHENTICATED")
     is_professional: Optional[bool] = Field(default=False, example=True)
     last_login_at: Optional[datetime] = None  # Make this optional
+    notification_delivery: NotificationDelivery = Field(default=NotificationDelivery.IMMEDIATE, example="immediate")
+
+class UserChange(BaseModel):
+    id: uuid.UUID = Field(..., example=uuid.uuid4())
+    deleted: bool = Field(..., description="True for a tombstone: the user was deleted and `user` is null.", example=False)
+    user: Optional[UserResponse] = Field(None, description="The user's current state, unless deleted.")
+
+class UserChangeFeedResponse(BaseModel):
+    items: List[UserChange]
+    next_cursor: Optional[str] = Field(None, description="Pass as `since` on the next poll; the same cursor comes back when nothing changed.", example="48213.7f1c7c1e-4a55-4c4e-9a43-1bb4e8f6e0d2")
+    has_more: bool = Field(..., description="Whether more changes are ready right away.")
+
+class UserBatchGetRequest(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1, max_length=settings.batch_get_max_ids, example=[uuid.uuid4(), uuid.uuid4()])
+
+class UserBatchGetResponse(BaseModel):
+    items: List[UserResponse] = Field(..., description="Users found, in the order their IDs were requested.")
+    missing: List[uuid.UUID] = Field(default_factory=list, description="Requested IDs that did not match any user.")
+
+class BulkUserOperation(str, Enum):
+    SET_ROLE = "set_role"
+    LOCK = "lock"
+    UNLOCK = "unlock"
+    SET_PROFESSIONAL_STATUS = "set_professional_status"
+
+class UserBulkFilter(BaseModel):
+    role: Optional[UserRole] = Field(None, example="AUTHENTICATED")
+    is_locked: Optional[bool] = Field(None, example=False)
+    email_verified: Optional[bool] = Field(None, example=True)
+    is_professional: Optional[bool] = Field(None, example=False)
+
+    @root_validator(pre=True)
+    def check_at_least_one_value(cls, values):
+        if not any(value is not None for value in values.values()):
+            raise ValueError("At least one filter field must be provided")
+        return values
+
+class UserBulkUpdateRequest(BaseModel):
+    operation: BulkUserOperation = Field(..., example="lock")
+    ids: Optional[List[uuid.UUID]] = Field(None, min_length=1, example=[uuid.uuid4()])
+    filter: Optional[UserBulkFilter] = None
+    role: Optional[UserRole] = Field(None, example="MANAGER")
+    is_professional: Optional[bool] = Field(None, example=True)
+
+    @root_validator(pre=True)
+    def check_target_and_arguments(cls, values):
+        if (values.get("ids") is None) == (values.get("filter") is None):
+            raise ValueError("Exactly one of 'ids' or 'filter' must be provided")
+        operation = values.get("operation")
+        if operation == BulkUserOperation.SET_ROLE and values.get("role") is None:
+            raise ValueError("'role' is required for the set_role operation")
+        if operation == BulkUserOperation.SET_PROFESSIONAL_STATUS and values.get("is_professional") is None:
+            raise ValueError("'is_professional' is required for the set_professional_status operation")
+        return values
+
+class UserBulkUpdateResponse(BaseModel):
+    operation: BulkUserOperation = Field(..., example="lock")
+    affected: int = Field(..., example=42)
 
 class LoginRequest(BaseModel):
     email: str = Field(..., example="john.doe@example.com")
@@ -106,4 +169,29 @@ class UserListResponse(BaseModel):
         total, size = values.get("total"), values.get("size")
         values["total_pages"] = (total + size - 1) // size  # Calculate total pages
         return values
-    
\ No newline at end of file
+
+# Built once: validates a whole page of users in a single call into pydantic-core.
+UserResponseList = TypeAdapter(List[UserResponse])
+
+# The fields a client may select with `fields=`, in the order they are returned.
+USER_RESPONSE_FIELDS = tuple(UserResponse.model_fields)
+_URL_FIELDS = ('profile_picture_url', 'linkedin_profile_url', 'github_profile_url')
+
+@lru_cache(maxsize=256)
+def sparse_user_response(fields: Tuple[str, ...], links: bool = False) -> Type[BaseModel]:
+    """
+    A `UserResponse` narrowed to `fields`, with a `links` field when `links` is set.
+
+    The fields keep their `UserResponse` definitions and URL validation. Built once per fieldset.
+    """
+    definitions = {name: (UserResponse.model_fields[name].annotation, UserResponse.model_fields[name]) for name in fields}
+    if links:
+        definitions["links"] = (List[Link], Field(default_factory=list))
+    url_fields = [name for name in fields if name in _URL_FIELDS]
+    validators = {"_validate_urls": validator(*url_fields, pre=True, allow_reuse=True)(validate_url)} if url_fields else None
+    return create_model("UserResponse", __config__=ConfigDict(from_attributes=True), __validators__=validators, **definitions)
+
+@lru_cache(maxsize=256)
+def sparse_user_response_list(fields: Tuple[str, ...], links: bool = False) -> TypeAdapter:
+    """Validates a page of users into `sparse_user_response(fields, links)` models in one call."""
+    return TypeAdapter(List[sparse_user_response(fields, links)])
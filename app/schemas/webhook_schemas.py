@@ -0,0 +1,51 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+import uuid
+from pydantic import BaseModel, Field, validator
+from app.schemas.user_schemas import validate_url
+
+class WebhookEvent(str, Enum):
+    USER_CREATED = "user.created"
+    USER_EMAIL_VERIFIED = "user.email_verified"
+    USER_LOCKED = "user.locked"
+    USER_DELETED = "user.deleted"
+
+class WebhookSubscriptionCreate(BaseModel):
+    url: str = Field(..., max_length=2048, example="https://hooks.example.com/users")
+    events: List[WebhookEvent] = Field(..., min_length=1, example=[WebhookEvent.USER_CREATED, WebhookEvent.USER_DELETED])
+    secret: Optional[str] = Field(None, min_length=16, max_length=255, description="Signing key; generated when omitted.")
+    max_concurrency: int = Field(4, ge=1, le=64, description="Most requests in flight to this endpoint at once.")
+
+    _validate_url = validator('url', pre=True, allow_reuse=True)(validate_url)
+
+class WebhookSubscriptionResponse(BaseModel):
+    id: uuid.UUID = Field(..., example=uuid.uuid4())
+    url: str = Field(..., example="https://hooks.example.com/users")
+    events: List[WebhookEvent] = Field(..., example=[WebhookEvent.USER_CREATED])
+    max_concurrency: int = Field(..., example=4)
+    is_active: bool = Field(..., example=True)
+    created_at: Optional[datetime] = Field(None, example="2024-04-20T21:20:32+00:00")
+
+    class Config:
+        from_attributes = True
+
+class WebhookSubscriptionCreated(WebhookSubscriptionResponse):
+    secret: str = Field(..., description="Key of the `X-Webhook-Signature` HMAC-SHA256; only shown once.")
+
+class WebhookDeadLetterResponse(BaseModel):
+    id: int = Field(..., example=1024)
+    subscription_id: uuid.UUID = Field(..., example=uuid.uuid4())
+    event_type: str = Field(..., example="user.locked")
+    user_id: Optional[uuid.UUID] = Field(None, example=uuid.uuid4())
+    payload: Dict[str, Any]
+    attempts: int = Field(..., example=8)
+    last_error: Optional[str] = Field(None, example="HTTP 503")
+    failed_at: Optional[datetime] = Field(None, example="2024-04-20T21:20:32+00:00")
+
+    class Config:
+        from_attributes = True
+
+class WebhookDeadLetterListResponse(BaseModel):
+    items: List[WebhookDeadLetterResponse]
+    next_before_id: Optional[int] = Field(None, description="Pass as `before_id` to fetch the next (older) page; null on the last page.", example=1000)
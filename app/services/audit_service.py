@@ -0,0 +1,49 @@
+from builtins import classmethod, int, str
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_settings
+from app.models.audit_event_model import AuditEvent
+from app.utils.batch_writer import BatchWriter
+
+settings = get_settings()
+
+audit_writer = BatchWriter(
+    AuditEvent.__table__,
+    max_batch_size=settings.audit_batch_size,
+    flush_interval_ms=settings.audit_flush_interval_ms,
+    max_queue_size=settings.audit_queue_size,
+)
+
+class AuditService:
+    """Records user changes to the append-only audit trail and reads them back."""
+
+    @classmethod
+    async def record(cls, action: str, target_user_id: Optional[UUID] = None, actor: Optional[str] = None, details: Optional[Dict] = None):
+        """Queue an audit event; it is written by `audit_writer` in a later multi-row INSERT."""
+        await audit_writer.record(
+            occurred_at=datetime.now(timezone.utc),
+            actor=actor,
+            action=action,
+            target_user_id=target_user_id,
+            details=details,
+        )
+
+    @classmethod
+    async def record_many(cls, action: str, target_user_ids: List[UUID], actor: Optional[str] = None, details: Optional[Dict] = None):
+        for target_user_id in target_user_ids:
+            await cls.record(action, target_user_id, actor, details)
+
+    @classmethod
+    async def list_events(cls, session: AsyncSession, before_id: Optional[int] = None, limit: int = 50,
+                          target_user_id: Optional[UUID] = None) -> List[AuditEvent]:
+        """List events newest first, paging with `before_id` instead of OFFSET."""
+        query = select(AuditEvent).order_by(AuditEvent.id.desc()).limit(limit)
+        if before_id is not None:
+            query = query.where(AuditEvent.id < before_id)
+        if target_user_id is not None:
+            query = query.where(AuditEvent.target_user_id == target_user_id)
+        result = await session.execute(query)
+        return result.scalars().all()
@@ -0,0 +1,261 @@
+from builtins import Exception, bool, classmethod, float, int, len, max, min, str, sum, type
+from datetime import timedelta
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import Interval, String, and_, bindparam, case, func, insert, null, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.campaign_model import CampaignRecipient, CampaignStatus, EmailCampaign, RecipientStatus
+from app.models.user_model import User, UserRole
+from app.utils.background_worker import BackgroundWorker
+from app.utils.leases import renewing
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+_FIRST_ID = UUID(int=0)
+_CAMPAIGN_ID = bindparam("campaign", type_=PG_UUID(as_uuid=True))
+_CLAIM = (
+    update(EmailCampaign.__table__)
+    .where(EmailCampaign.id == (
+        select(EmailCampaign.id)
+        .where(EmailCampaign.status == CampaignStatus.RUNNING.value,
+               or_(EmailCampaign.lease_until.is_(None), EmailCampaign.lease_until <= func.now()))
+        .order_by(EmailCampaign.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    ))
+    .values(lease_until=func.now() + bindparam("lease", type_=Interval))
+    .returning(*EmailCampaign.__table__.c)
+)
+# Recipients left pending by a batch that never finished, e.g. because its runner died, are sent first.
+_PENDING = (
+    select(User.id, User.email, User.first_name, User.nickname)
+    .join(CampaignRecipient, and_(CampaignRecipient.user_id == User.id, CampaignRecipient.campaign_id == _CAMPAIGN_ID))
+    .where(CampaignRecipient.status == RecipientStatus.PENDING.value)
+    .order_by(User.id)
+    .limit(bindparam("limit"))
+)
+_AUDIENCE = (User.deleted_at.is_(None), User.email_verified.is_(True))
+# Walks the live-users index in id order, picking up where the previous batch stopped.
+_NEXT_USERS = {
+    with_role: select(User.id, User.email, User.first_name, User.nickname)
+    .where(*_AUDIENCE, User.id > bindparam("after", type_=PG_UUID(as_uuid=True)), *((User.role == bindparam("role"),) if with_role else ()))
+    .order_by(User.id)
+    .limit(bindparam("limit"))
+    for with_role in (False, True)
+}
+_ADD_RECIPIENTS = insert(CampaignRecipient.__table__)
+_ADVANCE = update(EmailCampaign.__table__).where(EmailCampaign.id == _CAMPAIGN_ID).values(last_user_id=bindparam("last_user_id"))
+_COMPLETE = (
+    update(EmailCampaign.__table__)
+    .where(EmailCampaign.id == _CAMPAIGN_ID, EmailCampaign.status == CampaignStatus.RUNNING.value)
+    .values(status=CampaignStatus.COMPLETED.value, completed_at=func.now(), lease_until=null())
+)
+_results = func.unnest(
+    bindparam("user_ids", type_=ARRAY(PG_UUID(as_uuid=True))), bindparam("errors", type_=ARRAY(String)),
+).table_valued("user_id", "error").render_derived(name="results")
+_RECORD = (
+    update(CampaignRecipient.__table__)
+    .where(CampaignRecipient.campaign_id == _CAMPAIGN_ID, CampaignRecipient.user_id == _results.c.user_id)
+    .values(
+        status=case((_results.c.error.is_(None), RecipientStatus.SENT.value), else_=RecipientStatus.FAILED.value),
+        last_error=_results.c.error,
+        sent_at=case((_results.c.error.is_(None), func.now())),
+    )
+)
+# Extends the lease of a campaign whose batch is still being sent, so no other runner claims it meanwhile.
+_RENEW = (
+    update(EmailCampaign.__table__)
+    .where(EmailCampaign.id == _CAMPAIGN_ID, EmailCampaign.lease_until.is_not(None))
+    .values(lease_until=func.now() + bindparam("lease", type_=Interval))
+)
+_FINISH_BATCH = (
+    update(EmailCampaign.__table__)
+    .where(EmailCampaign.id == _CAMPAIGN_ID)
+    .values(
+        sent_count=EmailCampaign.sent_count + bindparam("sent"),
+        failed_count=EmailCampaign.failed_count + bindparam("failed"),
+        lease_until=null(),
+    )
+)
+
+def _audience(role: Optional[UserRole]):
+    return select(func.count()).select_from(User).where(*_AUDIENCE, *((User.role == role,) if role else ()))
+
+def recipient_context(campaign_context: Dict[str, str], email: str, first_name: Optional[str], nickname: str) -> Dict[str, str]:
+    """What a campaign's template is rendered with for one user; the user's own values win."""
+    return {**campaign_context, "name": first_name or nickname, "nickname": nickname, "email": email}
+
+class CampaignService:
+    """Creates and controls email campaigns, which `campaign_runner` sends in the background."""
+
+    @classmethod
+    async def create(cls, session: AsyncSession, name: str, subject: str, template: str, context: Dict[str, str],
+                     role: Optional[UserRole], rate_per_second: float, email_service) -> EmailCampaign:
+        """
+        Start a campaign to every verified user, or to those with `role`.
+
+        :raises ValueError: if the template does not exist or cannot be rendered with `context`.
+        """
+        try:
+            email_service.template_manager.render_template(template, **recipient_context(context, "user@example.com", "Jane", "jane"))
+        except (KeyError, IndexError) as e:
+            raise ValueError(f"Template {template} needs a value for {e}") from e
+        campaign = EmailCampaign(
+            name=name, subject=subject, template=template, context=context, role=role.name if role else None,
+            rate_per_second=rate_per_second, total=await session.scalar(_audience(role)),
+        )
+        session.add(campaign)
+        await session.commit()
+        await session.refresh(campaign)
+        return campaign
+
+    @classmethod
+    async def get(cls, session: AsyncSession, campaign_id: UUID) -> Optional[EmailCampaign]:
+        return await session.get(EmailCampaign, campaign_id, populate_existing=True)
+
+    @classmethod
+    async def list_campaigns(cls, session: AsyncSession) -> List[EmailCampaign]:
+        result = await session.execute(select(EmailCampaign).order_by(EmailCampaign.created_at.desc()))
+        return result.scalars().all()
+
+    @classmethod
+    async def _transition(cls, session: AsyncSession, campaign_id: UUID, current: CampaignStatus, new: CampaignStatus) -> Optional[EmailCampaign]:
+        result = await session.execute(
+            update(EmailCampaign).where(EmailCampaign.id == campaign_id, EmailCampaign.status == current.value)
+            .values(status=new.value).returning(EmailCampaign).execution_options(populate_existing=True)
+        )
+        campaign = result.scalar_one_or_none()
+        await session.commit()
+        return campaign
+
+    @classmethod
+    async def pause(cls, session: AsyncSession, campaign_id: UUID) -> Optional[EmailCampaign]:
+        """
+        Pause a running campaign; the batch being sent, if any, is finished first.
+
+        :return: The campaign, or None if it does not exist or is not running.
+        """
+        return await cls._transition(session, campaign_id, CampaignStatus.RUNNING, CampaignStatus.PAUSED)
+
+    @classmethod
+    async def resume(cls, session: AsyncSession, campaign_id: UUID) -> Optional[EmailCampaign]:
+        """
+        Resume a paused campaign where it stopped.
+
+        :return: The campaign, or None if it does not exist or is not paused.
+        """
+        return await cls._transition(session, campaign_id, CampaignStatus.PAUSED, CampaignStatus.RUNNING)
+
+    @classmethod
+    async def list_recipients(cls, session: AsyncSession, campaign_id: UUID, status: Optional[RecipientStatus] = None,
+                              after_user_id: Optional[UUID] = None, limit: int = 100) -> List[CampaignRecipient]:
+        query = select(CampaignRecipient).where(CampaignRecipient.campaign_id == campaign_id).order_by(CampaignRecipient.user_id).limit(limit)
+        if status is not None:
+            query = query.where(CampaignRecipient.status == status.value)
+        if after_user_id is not None:
+            query = query.where(CampaignRecipient.user_id > after_user_id)
+        result = await session.execute(query)
+        return result.scalars().all()
+
+class _Pacer:
+    """Spaces out calls to `wait` so that no more than `rate` return per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self.next_at = asyncio.get_running_loop().time()
+
+    async def wait(self):
+        now = asyncio.get_running_loop().time()
+        at, self.next_at = max(self.next_at, now), max(self.next_at, now) + self.interval
+        if at > now:
+            await asyncio.sleep(at - now)
+
+class CampaignRunner(BackgroundWorker):
+    """
+    Sends running campaigns in the background, one batch at a time.
+
+    A batch takes the next `campaign_batch_size` recipients of the oldest running campaign, or about
+    `campaign_batch_seconds` worth of them at its rate if that is fewer, and records them as pending.
+    It then renders and sends their emails on worker threads, at most `campaign_max_concurrency` at
+    once and no faster than the campaign's rate, and records who was sent to and who failed. The
+    campaign is leased for the batch, so runners in other processes take other campaigns or the next
+    batch; the lease is renewed while the batch is sent, however slow the mail server. Pausing takes
+    effect when the current batch is done.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._email_service = None
+
+    @property
+    def poll_interval(self) -> float:
+        return settings.campaign_poll_interval_seconds
+
+    def open(self, session_factory, email_service):
+        """Set what to claim from and send with; `run_batch` can be called from then on."""
+        super().open(session_factory)
+        self._email_service = email_service
+
+    async def run_once(self) -> bool:
+        return await self.run_batch()
+
+    async def run_batch(self) -> bool:
+        """
+        Send one batch of the oldest running campaign that no other runner is sending.
+
+        :return: Whether there was a campaign to work on.
+        """
+        async with self._session_factory() as session:
+            campaign = (await session.execute(_CLAIM, {"lease": timedelta(seconds=settings.campaign_lease_seconds)})).one_or_none()
+            if campaign is None:
+                await session.commit()
+                return False
+            limit = min(settings.campaign_batch_size, max(int(campaign.rate_per_second * settings.campaign_batch_seconds), 1))
+            recipients = (await session.execute(_PENDING, {"campaign": campaign.id, "limit": limit})).all()
+            if not recipients:
+                parameters = {"after": campaign.last_user_id or _FIRST_ID, "limit": limit}
+                if campaign.role is not None:
+                    parameters["role"] = UserRole[campaign.role]
+                recipients = (await session.execute(_NEXT_USERS[campaign.role is not None], parameters)).all()
+                if recipients:
+                    await session.execute(_ADD_RECIPIENTS, [
+                        {"campaign_id": campaign.id, "user_id": recipient.id, "email": recipient.email, "status": RecipientStatus.PENDING.value}
+                        for recipient in recipients
+                    ])
+                    await session.execute(_ADVANCE, {"campaign": campaign.id, "last_user_id": recipients[-1].id})
+                else:
+                    await session.execute(_COMPLETE, {"campaign": campaign.id})
+            await session.commit()
+        if not recipients:
+            return True
+
+        pacer = _Pacer(campaign.rate_per_second)
+        slots = asyncio.Semaphore(settings.campaign_max_concurrency)
+        lease = {"campaign": campaign.id, "lease": timedelta(seconds=settings.campaign_lease_seconds)}
+        async with renewing(self._session_factory, _RENEW, lease, settings.campaign_lease_seconds / 3):
+            errors = await asyncio.gather(*(self._send(campaign, recipient, pacer, slots) for recipient in recipients))
+        async with self._session_factory() as session:
+            await session.execute(_RECORD, {"campaign": campaign.id, "user_ids": [recipient.id for recipient in recipients], "errors": errors})
+            failed = sum(error is not None for error in errors)
+            await session.execute(_FINISH_BATCH, {"campaign": campaign.id, "sent": len(errors) - failed, "failed": failed})
+            await session.commit()
+        return True
+
+    async def _send(self, campaign, recipient, pacer: _Pacer, slots: asyncio.Semaphore) -> Optional[str]:
+        """Send one recipient's email; returns why it failed, or None."""
+        context = recipient_context(campaign.context, recipient.email, recipient.first_name, recipient.nickname)
+        async with slots:
+            await pacer.wait()
+            try:
+                await self._email_service.send_templated_email(campaign.subject, campaign.template, context)
+            except Exception as e:
+                logger.warning(f"Campaign {campaign.id} email to {recipient.email} failed: {e}")
+                return f"{type(e).__name__}: {e}"[:500]
+        return None
+
+campaign_runner = CampaignRunner()
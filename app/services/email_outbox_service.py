@@ -0,0 +1,136 @@
+from builtins import Exception, bool, classmethod, float, int, len, str, type, zip
+from datetime import timedelta
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import String, and_, any_, bindparam, case, delete, func, insert, null, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.email_outbox_model import EmailOutbox
+from app.utils.background_worker import BackgroundWorker
+from app.utils.leases import backoff_delay, claim_due
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+_ID = bindparam("email_id", type_=EmailOutbox.id.type)
+_ERROR = bindparam("error", type_=String)
+_ENQUEUE = insert(EmailOutbox.__table__)
+_CLAIM = claim_due(EmailOutbox.__table__, EmailOutbox.next_attempt_at, EmailOutbox.id, EmailOutbox.email_type, EmailOutbox.context)
+_SENT = delete(EmailOutbox.__table__).where(EmailOutbox.id == any_(bindparam("ids", type_=ARRAY(EmailOutbox.id.type))))
+# A failed email is retried after a backoff delay; after the last attempt it is kept with no due time.
+_FAILED = (
+    update(EmailOutbox.__table__)
+    .where(EmailOutbox.id == _ID)
+    .values(
+        attempts=EmailOutbox.attempts + 1,
+        last_error=_ERROR,
+        next_attempt_at=case(
+            (EmailOutbox.attempts + 1 >= bindparam("max_attempts"), null()),
+            else_=func.now() + backoff_delay(EmailOutbox.attempts),
+        ),
+    )
+)
+_RETRY = (
+    update(EmailOutbox.__table__)
+    .where(and_(EmailOutbox.id == _ID, EmailOutbox.next_attempt_at.is_(None)))
+    .values(attempts=0, next_attempt_at=func.now())
+)
+
+class EmailOutboxService:
+    """Queues emails in the database for `email_dispatcher` to send."""
+
+    @classmethod
+    async def enqueue(cls, session: AsyncSession, email_type: str, recipient: str, context: Dict[str, str],
+                      user_id: Optional[UUID] = None):
+        """
+        Queue an email rendered from the `email_type` template with `context`.
+
+        Does not commit, so that an email announcing a change is only sent once the caller's
+        transaction commits the change.
+        """
+        await session.execute(_ENQUEUE, {
+            "email_type": email_type, "recipient": recipient, "context": context, "user_id": user_id,
+        })
+
+    @classmethod
+    async def list_failed(cls, session: AsyncSession, limit: int = 50) -> List[EmailOutbox]:
+        """Emails that failed every attempt, newest first."""
+        result = await session.execute(
+            select(EmailOutbox).where(EmailOutbox.next_attempt_at.is_(None)).order_by(EmailOutbox.id.desc()).limit(limit)
+        )
+        return result.scalars().all()
+
+    @classmethod
+    async def retry(cls, session: AsyncSession, email_id: int) -> bool:
+        """Make an email that failed every attempt due again, with a fresh set of attempts."""
+        result = await session.execute(_RETRY, {"email_id": email_id})
+        await session.commit()
+        return result.rowcount > 0
+
+class EmailDispatcher(BackgroundWorker):
+    """
+    Sends queued emails in the background.
+
+    Each round claims up to `email_claim_size` due emails and sends them through the `EmailService`
+    it was opened with, at most `email_max_concurrency` at a time. Sent rows are deleted; failed ones
+    are retried with exponential backoff until `email_max_attempts` attempts have failed. Delivery is
+    at least once: a dispatcher that dies between sending and deleting sends the email again.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._email_service = None
+
+    @property
+    def poll_interval(self) -> float:
+        return settings.email_poll_interval_seconds
+
+    def open(self, session_factory, email_service):
+        """Set what to claim from and send with; `dispatch_once` can be called from then on."""
+        super().open(session_factory)
+        self._email_service = email_service
+
+    async def run_once(self) -> bool:
+        return await self.dispatch_once() >= settings.email_claim_size
+
+    async def dispatch_once(self) -> int:
+        """
+        Run one round of sends.
+
+        :return: The number of emails claimed.
+        """
+        async with self._session_factory() as session:
+            rows = (await session.execute(_CLAIM, {
+                "limit": settings.email_claim_size, "lease": timedelta(seconds=settings.email_lease_seconds),
+            })).all()
+            await session.commit()
+        if not rows:
+            return 0
+        limit = asyncio.Semaphore(settings.email_max_concurrency)
+        errors = await asyncio.gather(*(self._send(row, limit) for row in rows))
+        async with self._session_factory() as session:
+            sent = [row.id for row, error in zip(rows, errors) if error is None]
+            if sent:
+                await session.execute(_SENT, {"ids": sent})
+            for row, error in zip(rows, errors):
+                if error is not None:
+                    await session.execute(_FAILED, {
+                        "email_id": row.id, "error": error, "max_attempts": settings.email_max_attempts,
+                        "backoff_base": settings.email_backoff_base_seconds, "backoff_max": settings.email_backoff_max_seconds,
+                    })
+            await session.commit()
+        return len(rows)
+
+    async def _send(self, row, limit: asyncio.Semaphore) -> Optional[str]:
+        """Send one claimed email; returns why it failed, or None."""
+        async with limit:
+            try:
+                await self._email_service.send_user_email(row.context, row.email_type)
+            except Exception as e:
+                logger.warning(f"Sending {row.email_type} email {row.id} failed: {e}")
+                return f"{type(e).__name__}: {e}"[:500]
+        return None
+
+email_dispatcher = EmailDispatcher()
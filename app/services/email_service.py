@@ -1,6 +1,9 @@
+import asyncio
 import smtplib
 from builtins import ValueError, dict, str
+from sqlalchemy.ext.asyncio import AsyncSession
 from settings.config import settings
+from app.services.email_outbox_service import EmailOutboxService
 from app.utils.smtp_connection import SMTPClient
 from app.utils.template_manager import TemplateManager
 from app.models.user_model import User
@@ -8,13 +11,26 @@ import logging
 import re
 
 class EmailService:
+    subject_map = {
+        'email_verification': "Verify Your Account",
+        'password_reset': "Password Reset Instructions",
+        'account_locked': "Account Locked Notification",
+        'notification': "Your Account Was Updated",
+        'notification_digest': "Your Account Updates"
+    }
+
     def __init__(self, template_manager: TemplateManager):
         """Initialize the EmailService with SMTP client and template manager."""
         self.smtp_client = SMTPClient(
             server=settings.smtp_server,
             port=settings.smtp_port,
             username=settings.smtp_username,
-            password=settings.smtp_password
+            password=settings.smtp_password,
+            max_connections=settings.smtp_max_connections,
+            max_messages=settings.smtp_max_messages_per_connection,
+            max_age=settings.smtp_connection_max_age_seconds,
+            health_check_after=settings.smtp_health_check_after_seconds,
+            use_tls=settings.smtp_use_tls,
         )
         self.template_manager = template_manager
 
@@ -23,21 +39,18 @@ class EmailService:
         email_regex = r"(^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$)"
         return re.match(email_regex, email) is not None
 
-    async def send_user_email(self, user_data: dict, email_type: str):
-        """Send an email based on the user data and email type."""
-        subject_map = {
-            'email_verification': "Verify Your Account",
-            'password_reset': "Password Reset Instructions",
-            'account_locked': "Account Locked Notification"
-        }
-
+    def _validate(self, user_data: dict, email_type: str):
         # Validate email format
         if not self.is_valid_email(user_data['email']):
             raise ValueError("Invalid email address format")
 
-        if email_type not in subject_map:
+        if email_type not in self.subject_map:
             raise ValueError("Invalid email type")
 
+    async def send_user_email(self, user_data: dict, email_type: str):
+        """Send an email based on the user data and email type."""
+        self._validate(user_data, email_type)
+
         # Render email content from template
         try:
             html_content = self.template_manager.render_template(email_type, **user_data)
@@ -45,9 +58,9 @@ class EmailService:
             logging.error(f"Error rendering template: {e}")
             raise ValueError("Error rendering the email template")
 
-        # Send the email via SMTP client
+        # Send the email via SMTP client, on a thread so the SMTP exchange does not block the event loop
         try:
-            self.smtp_client.send_email(subject_map[email_type], html_content, user_data['email'])
+            await asyncio.to_thread(self.smtp_client.send_email, self.subject_map[email_type], html_content, user_data['email'])
         except smtplib.SMTPException as e:
             logging.error(f"Failed to send email: {e}")
             raise ConnectionError("Failed to send the email due to SMTP error.") from e
@@ -55,11 +68,35 @@ class EmailService:
             logging.error(f"Unexpected error: {e}")
             raise
 
-    async def send_verification_email(self, user: User):
-        """Send an email verification link to the user."""
+    def _render_and_send(self, subject: str, template_name: str, context: dict):
+        html_content = self.template_manager.render_template(template_name, **context)
+        self.smtp_client.send_email(subject, html_content, context['email'])
+
+    async def send_templated_email(self, subject: str, template_name: str, context: dict):
+        """Render and send an email on a worker thread, so that many can be rendered and sent at once."""
+        await asyncio.to_thread(self._render_and_send, subject, template_name, context)
+
+    async def queue_user_email(self, session: AsyncSession, user_data: dict, email_type: str, user_id=None):
+        """
+        Queue an email in the outbox, to be sent by the email dispatcher.
+
+        Does not commit, so the email is sent only if the caller's transaction commits.
+        """
+        self._validate(user_data, email_type)
+        await EmailOutboxService.enqueue(session, email_type, user_data['email'], user_data, user_id)
+
+    def _verification_data(self, user: User) -> dict:
         verification_url = f"{settings.server_base_url}verify-email/{user.id}/{user.verification_token}"
-        await self.send_user_email({
+        return {
             "name": user.first_name,
             "verification_url": verification_url,
             "email": user.email
-        }, 'email_verification')
+        }
+
+    async def send_verification_email(self, user: User):
+        """Send an email verification link to the user."""
+        await self.send_user_email(self._verification_data(user), 'email_verification')
+
+    async def queue_verification_email(self, session: AsyncSession, user: User):
+        """Queue an email verification link to the user, in the caller's transaction."""
+        await self.queue_user_email(session, self._verification_data(user), 'email_verification', user.id)
@@ -0,0 +1,83 @@
+from builtins import Exception, bool, classmethod, int, str
+from datetime import datetime, timezone
+import asyncio
+import logging
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_settings
+from app.models.login_event_model import LoginEvent, create_partitions, drop_partitions
+from app.utils.batch_writer import BatchWriter
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+login_event_writer = BatchWriter(
+    LoginEvent.__table__,
+    max_batch_size=settings.login_events_batch_size,
+    flush_interval_ms=settings.login_events_flush_interval_ms,
+    max_queue_size=settings.login_events_queue_size,
+)
+
+# The email is whatever was typed into the login form, so it is cut to fit its column.
+_EMAIL_LENGTH = LoginEvent.__table__.c.email.type.length
+
+class LoginEventService:
+    """Records login attempts into the monthly-partitioned `login_events` table and maintains its partitions."""
+
+    @classmethod
+    async def record(cls, email: str, succeeded: bool, user_id: Optional[UUID] = None, failure_reason: Optional[str] = None):
+        """Queue a login attempt; it is written by `login_event_writer` in a later multi-row INSERT."""
+        await login_event_writer.record(
+            occurred_at=datetime.now(timezone.utc),
+            user_id=user_id,
+            email=email[:_EMAIL_LENGTH],
+            succeeded=succeeded,
+            failure_reason=failure_reason,
+        )
+
+    @classmethod
+    async def list_for_user(cls, session: AsyncSession, user_id: UUID, since: datetime, until: datetime,
+                            before_id: Optional[int] = None, limit: int = 50) -> List[LoginEvent]:
+        """
+        List a user's login attempts in `[since, until]`, newest first.
+
+        The time bounds let Postgres prune the partitions outside the window. The next page continues
+        from the last event returned: pass its `occurred_at` as `until` and its `id` as `before_id`.
+        """
+        query = (
+            select(LoginEvent)
+            .where(LoginEvent.user_id == user_id, LoginEvent.occurred_at >= since, LoginEvent.occurred_at <= until)
+            .order_by(LoginEvent.occurred_at.desc(), LoginEvent.id.desc())
+            .limit(limit)
+        )
+        if before_id is not None:
+            query = query.where(tuple_(LoginEvent.occurred_at, LoginEvent.id) < tuple_(until, before_id))
+        result = await session.execute(query)
+        return result.scalars().all()
+
+    @classmethod
+    async def maintain_partitions(cls, session: AsyncSession, now: Optional[datetime] = None):
+        """Create the coming months' partitions and drop those past the retention period."""
+        today = (now or datetime.now(timezone.utc)).date()
+        created = await session.run_sync(lambda s: create_partitions(s.connection(), today, settings.login_events_months_ahead))
+        dropped = await session.run_sync(lambda s: drop_partitions(s.connection(), today, settings.login_events_retention_months))
+        await session.commit()
+        if dropped:
+            logger.info(f"Dropped expired login_events partitions: {', '.join(dropped)}")
+        return created, dropped
+
+    @classmethod
+    async def run(cls, session_factory, stop_event: asyncio.Event):
+        """Maintain partitions on a fixed interval until `stop_event` is set."""
+        while not stop_event.is_set():
+            try:
+                async with session_factory() as session:
+                    await cls.maintain_partitions(session)
+            except Exception:
+                logger.exception("login_events partition maintenance failed; retrying on the next interval")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=settings.login_events_maintenance_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,140 @@
+from builtins import bool, classmethod, dict, float, int, len, sorted, str
+from collections import defaultdict
+from datetime import timedelta, timezone
+import logging
+from typing import Dict, List, Optional
+from sqlalchemy import Interval, any_, bindparam, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.email_outbox_model import EmailOutbox
+from app.models.notification_model import NotificationDelivery, PendingNotification
+from app.models.user_model import User
+from app.services.email_outbox_service import EmailOutboxService
+from app.utils.background_worker import BackgroundWorker
+from settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+# What users are told about changes to their account, by audit action.
+NOTIFICATION_MESSAGES = {
+    "user.role_changed": "Your role is now {role}.",
+    "user.locked": "Your account has been locked.",
+    "user.unlocked": "Your account has been unlocked.",
+    "user.professional_status_changed": "Your professional status has been {professional}.",
+}
+
+# Columns `notify` needs from each user; statements that change users return these to notify them.
+NOTIFY_COLUMNS = (User.id, User.email, User.first_name, User.nickname, User.email_verified, User.notification_delivery)
+_QUEUE_DIGEST = insert(PendingNotification.__table__)
+_QUEUE_IMMEDIATE = insert(EmailOutbox.__table__)
+# A user's digest is due once their oldest pending notification is a window old; every notification
+# they have pending by then goes into it. SKIP LOCKED lets several digesters run side by side.
+_DUE_USERS = (
+    select(PendingNotification.user_id)
+    .group_by(PendingNotification.user_id)
+    .having(func.min(PendingNotification.created_at) <= func.now() - bindparam("window", type_=Interval))
+    .limit(bindparam("limit"))
+)
+_TAKE_DUE = (
+    delete(PendingNotification.__table__)
+    .where(PendingNotification.id.in_(
+        select(PendingNotification.id)
+        .where(PendingNotification.user_id.in_(_DUE_USERS.scalar_subquery()))
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    ))
+    .returning(PendingNotification.user_id, PendingNotification.message, PendingNotification.created_at)
+)
+_DIGEST_RECIPIENTS = select(User.id, User.email, User.first_name, User.nickname).where(
+    User.id == any_(bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True)))), User.deleted_at.is_(None), User.email_verified.is_(True),
+)
+
+class NotificationService:
+    """Tells users about changes to their account, by email right away or in a periodic digest, as each user prefers."""
+
+    @classmethod
+    def message_for(cls, action: str, details: Optional[Dict] = None) -> Optional[str]:
+        """The notification for an audit action, or None if users are not notified of it."""
+        template = NOTIFICATION_MESSAGES.get(action)
+        if template is None:
+            return None
+        details = dict(details or {})
+        if "is_professional" in details:
+            details["professional"] = "granted" if details["is_professional"] else "removed"
+        return template.format(**details)
+
+    @classmethod
+    async def notify(cls, session: AsyncSession, users: List, kind: str, message: str):
+        """
+        Notify users: queue an email for those who want each notification right away, and hold the
+        notification for the next digest for the rest. Only verified users are notified; an
+        unverified address may not be theirs.
+
+        `users` are `User` instances or rows with the `NOTIFY_COLUMNS`. Does not commit: call it
+        inside the transaction that makes the change.
+        """
+        immediate, digest = [], []
+        for user in users:
+            if not user.email_verified:
+                continue
+            if user.notification_delivery == NotificationDelivery.DIGEST.value:
+                digest.append({"user_id": user.id, "kind": kind, "message": message})
+            else:
+                immediate.append({
+                    "user_id": user.id, "email_type": "notification", "recipient": user.email,
+                    "context": {"name": user.first_name or user.nickname, "message": message, "email": user.email},
+                })
+        if immediate:
+            await session.execute(_QUEUE_IMMEDIATE, immediate)
+        if digest:
+            await session.execute(_QUEUE_DIGEST, digest)
+
+    @classmethod
+    async def digest_due(cls, session: AsyncSession, window: timedelta, limit: int) -> int:
+        """
+        Replace the pending notifications of up to `limit` users whose digest is due with one digest
+        email each, queued in the email outbox, and commit.
+
+        :return: The number of users whose notifications were taken.
+        """
+        taken = (await session.execute(_TAKE_DUE, {"window": window, "limit": limit})).all()
+        if not taken:
+            await session.commit()
+            return 0
+        pending = defaultdict(list)
+        for row in taken:
+            pending[row.user_id].append(row)
+        # Users deleted or unverified since are dropped along with their notifications.
+        for user in (await session.execute(_DIGEST_RECIPIENTS, {"ids": list(pending)})).all():
+            lines = [
+                f"- {row.created_at.astimezone(timezone.utc):%Y-%m-%d %H:%M} UTC: {row.message}"
+                for row in sorted(pending[user.id], key=lambda row: row.created_at)
+            ]
+            await EmailOutboxService.enqueue(session, "notification_digest", user.email, {
+                "name": user.first_name or user.nickname, "notifications": "\n".join(lines), "email": user.email,
+            }, user.id)
+        await session.commit()
+        return len(pending)
+
+class NotificationDigester(BackgroundWorker):
+    """
+    Turns pending notifications into digest emails in the background.
+
+    Each round takes the users whose oldest pending notification is `notification_digest_window_seconds`
+    old, up to `notification_digest_batch_size` of them, and queues one digest email for each. The
+    email dispatcher sends them; a digest is queued in the transaction that deletes its notifications,
+    so none are lost or repeated.
+    """
+
+    @property
+    def poll_interval(self) -> float:
+        return settings.notification_digest_poll_interval_seconds
+
+    async def run_once(self) -> bool:
+        async with self._session_factory() as session:
+            digested = await NotificationService.digest_due(
+                session, timedelta(seconds=settings.notification_digest_window_seconds), settings.notification_digest_batch_size,
+            )
+        return digested >= settings.notification_digest_batch_size
+
+notification_digester = NotificationDigester()
@@ -0,0 +1,79 @@
+from builtins import bool, classmethod, dict, int, isinstance, map, str, zip
+from datetime import datetime
+from enum import Enum
+import csv
+import io
+import json
+from typing import AsyncIterator, Optional
+from uuid import UUID
+import zlib
+from sqlalchemy import select
+from app.dependencies import get_settings
+from app.models.user_model import User
+from app.schemas.user_import_schemas import UserFileFormat
+
+settings = get_settings()
+
+# Everything an admin may take out of the system; credentials and tokens are never exported.
+EXPORT_COLUMNS = (
+    "id", "nickname", "email", "first_name", "last_name", "bio", "profile_picture_url", "linkedin_profile_url",
+    "github_profile_url", "role", "is_professional", "email_verified", "is_locked", "last_login_at",
+    "created_at", "updated_at",
+)
+_EXPORT_USERS = (
+    select(*(getattr(User, column) for column in EXPORT_COLUMNS))
+    .where(User.deleted_at.is_(None))
+    .order_by(User.id)
+)
+
+def _plain(value):
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+class UserExportService:
+    """
+    Streams every live user out as NDJSON or CSV.
+
+    Rows come from a server-side cursor, `export_batch_size` at a time, and each batch is encoded and
+    yielded before the next is fetched, so memory stays flat however many users there are and the
+    first bytes go out as soon as the first batch arrives. With `gzip`, every batch is compressed and
+    sync-flushed, so the compressed stream is just as incremental.
+    """
+
+    @classmethod
+    async def stream(cls, session_factory, format: UserFileFormat, gzip: bool = False,
+                     batch_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16) if gzip else None
+
+        def emit(text: str) -> bytes:
+            data = text.encode("utf-8")
+            return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH) if compressor else data
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if format == UserFileFormat.CSV:
+            writer.writerow(EXPORT_COLUMNS)
+            yield emit(buffer.getvalue())
+
+        async with session_factory() as session:
+            result = await session.stream(
+                _EXPORT_USERS.execution_options(yield_per=batch_size or settings.export_batch_size)
+            )
+            async for rows in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                if format == UserFileFormat.CSV:
+                    writer.writerows([_plain(value) for value in row] for row in rows)
+                else:
+                    for row in rows:
+                        buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, map(_plain, row)))))
+                        buffer.write("\n")
+                yield emit(buffer.getvalue())
+
+        if compressor:
+            yield compressor.flush()
@@ -0,0 +1,132 @@
+from builtins import bool, classmethod, dict, int, str
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional, Tuple, Type
+from uuid import UUID
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.user_model import User, UserRole, partition_routing_sql
+from pydantic import BaseModel
+from app.schemas.user_schemas import UserResponse, UserRole as UserResponseRole, sparse_user_response
+
+# Columns needed to build a UserResponse, in the order asyncpg returns them.
+PROFILE_COLUMNS = (
+    "id", "nickname", "email", "first_name", "last_name", "bio", "profile_picture_url",
+    "linkedin_profile_url", "github_profile_url", "role", "is_professional", "last_login_at",
+    "notification_delivery",
+)
+CREDENTIAL_COLUMNS = ("id", "email", "role", "hashed_password", "email_verified", "is_locked", "failed_login_attempts")
+
+class UserRecord:
+    """
+    Read-only, attribute-style view of a `users` row fetched by the fast path.
+
+    Exposes the same attribute names as `User` for the columns that were selected, with `role`
+    converted to `UserRole`, without the cost of building and tracking an ORM instance.
+    """
+    __slots__ = ("_record",)
+
+    def __init__(self, record: asyncpg.Record):
+        self._record = record
+
+    def __getattr__(self, name: str):
+        try:
+            value = self._record[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return UserRole(value) if name == "role" else value
+
+class UserFastPath:
+    """
+    Raw asyncpg access for the hottest read paths, bypassing the ORM.
+
+    Statements run on the asyncpg connection underneath the session's pooled SQLAlchemy connection,
+    so they share the pool configured by `Database` and the session's transaction. asyncpg prepares
+    each statement once per connection and reuses it from its statement cache afterwards. Rows are
+    mapped straight from `asyncpg.Record` to a response model or a `UserRecord`.
+    """
+    _PROFILE_BY_ID = f"SELECT {', '.join(PROFILE_COLUMNS)} FROM users WHERE id = $1 AND deleted_at IS NULL"
+    _PROFILE_BY_EMAIL = f"SELECT {', '.join(PROFILE_COLUMNS)} FROM users WHERE {partition_routing_sql('email', '$1')}email = $1 AND deleted_at IS NULL"
+    _CREDENTIALS_BY_EMAIL = f"SELECT {', '.join(CREDENTIAL_COLUMNS)} FROM users WHERE {partition_routing_sql('email', '$1')}email = $1 AND deleted_at IS NULL"
+    _IS_LOCKED_BY_EMAIL = f"SELECT is_locked FROM users WHERE {partition_routing_sql('email', '$1')}email = $1 AND deleted_at IS NULL"
+    _RECORD_LOGIN_SUCCESS = (
+        "UPDATE users SET failed_login_attempts = 0, last_login_at = $2, updated_at = now() WHERE id = $1"
+    )
+    _RECORD_LOGIN_FAILURE = (
+        "UPDATE users SET failed_login_attempts = failed_login_attempts + 1, "
+        "is_locked = is_locked OR failed_login_attempts + 1 >= $2, updated_at = now() "
+        "WHERE id = $1 RETURNING failed_login_attempts, is_locked"
+    )
+
+    @classmethod
+    def is_available(cls, session: AsyncSession) -> bool:
+        return session.bind is not None and session.bind.dialect.driver == "asyncpg"
+
+    @classmethod
+    async def _connection(cls, session: AsyncSession) -> asyncpg.Connection:
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _profile_by_id_sparse(cls, columns: Tuple[str, ...]) -> str:
+        return f"SELECT {', '.join(columns)} FROM users WHERE id = $1 AND deleted_at IS NULL"
+
+    @classmethod
+    def _to_response(cls, record: Optional[asyncpg.Record], model: Type[BaseModel] = UserResponse) -> Optional[BaseModel]:
+        if record is None:
+            return None
+        values = dict(record)
+        if "role" in values:
+            values["role"] = UserResponseRole(values["role"])
+        return model.model_construct(**values)
+
+    @classmethod
+    def _sync_identity_map(cls, session: AsyncSession, user_id: UUID, **values):
+        """Keep an already loaded `User` consistent with a write made behind the ORM's back."""
+        user = session.identity_map.get(session.identity_key(User, user_id))
+        if user is not None:
+            for name, value in values.items():
+                set_committed_value(user, name, value)
+
+    @classmethod
+    async def fetch_profile_by_id(cls, session: AsyncSession, user_id: UUID, fields: Optional[Tuple[str, ...]] = None) -> Optional[BaseModel]:
+        """Fetch a profile, selecting only `fields` (names of `PROFILE_COLUMNS`) when given."""
+        connection = await cls._connection(session)
+        if fields is None:
+            return cls._to_response(await connection.fetchrow(cls._PROFILE_BY_ID, user_id))
+        record = await connection.fetchrow(cls._profile_by_id_sparse(fields), user_id)
+        return cls._to_response(record, sparse_user_response(fields))
+
+    @classmethod
+    async def fetch_profile_by_email(cls, session: AsyncSession, email: str) -> Optional[UserResponse]:
+        connection = await cls._connection(session)
+        return cls._to_response(await connection.fetchrow(cls._PROFILE_BY_EMAIL, email))
+
+    @classmethod
+    async def fetch_credentials(cls, session: AsyncSession, email: str) -> Optional[UserRecord]:
+        connection = await cls._connection(session)
+        record = await connection.fetchrow(cls._CREDENTIALS_BY_EMAIL, email)
+        return UserRecord(record) if record is not None else None
+
+    @classmethod
+    async def is_locked(cls, session: AsyncSession, email: str) -> bool:
+        connection = await cls._connection(session)
+        return bool(await connection.fetchval(cls._IS_LOCKED_BY_EMAIL, email))
+
+    @classmethod
+    async def record_login_success(cls, session: AsyncSession, user_id: UUID):
+        last_login_at = datetime.now(timezone.utc)
+        connection = await cls._connection(session)
+        await connection.execute(cls._RECORD_LOGIN_SUCCESS, user_id, last_login_at)
+        cls._sync_identity_map(session, user_id, failed_login_attempts=0, last_login_at=last_login_at)
+
+    @classmethod
+    async def record_login_failure(cls, session: AsyncSession, user_id: UUID, max_login_attempts: int) -> bool:
+        """Count a failed login, locking the account once the limit is reached; returns whether it is locked."""
+        connection = await cls._connection(session)
+        record = await connection.fetchrow(cls._RECORD_LOGIN_FAILURE, user_id, max_login_attempts)
+        cls._sync_identity_map(session, user_id, failed_login_attempts=record["failed_login_attempts"], is_locked=record["is_locked"])
+        return record["is_locked"]
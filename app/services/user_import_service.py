@@ -0,0 +1,204 @@
+from builtins import Exception, classmethod, dict, int, isinstance, len, next, str, zip
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import csv
+import json
+import logging
+import re
+import secrets
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import uuid
+from pydantic import ValidationError
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_settings
+from app.schemas.user_schemas import UserCreate
+from app.schemas.user_import_schemas import ImportConflict, UserFileFormat, ImportRowError, UserImportResult
+from app.services.audit_service import AuditService
+from app.services.webhook_service import WebhookService
+from app.utils.nickname_gen import generate_nickname
+from app.utils.security import generate_verification_token, hash_password
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# bcrypt releases the GIL, so hashing threads run in parallel.
+_hash_executor = ThreadPoolExecutor(max_workers=settings.import_hash_workers, thread_name_prefix="import-hash")
+
+_BCRYPT_HASH = re.compile(r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$")
+
+_STAGING_COLUMNS = (
+    "line", "id", "nickname", "email", "first_name", "last_name", "bio", "profile_picture_url",
+    "linkedin_profile_url", "github_profile_url", "hashed_password", "verification_token",
+)
+_USER_COLUMNS = ", ".join(_STAGING_COLUMNS[1:])
+
+# ON COMMIT DELETE ROWS empties the table at the end of every chunk's transaction.
+_CREATE_STAGING = text(f"""
+    CREATE TEMP TABLE IF NOT EXISTS user_import_staging (
+        line integer NOT NULL, id uuid NOT NULL, nickname varchar(50) NOT NULL, email varchar(255) NOT NULL,
+        first_name varchar(100), last_name varchar(100), bio varchar(500), profile_picture_url varchar(255),
+        linkedin_profile_url varchar(255), github_profile_url varchar(255), hashed_password varchar(255) NOT NULL,
+        verification_token varchar
+    ) ON COMMIT DELETE ROWS
+""")
+# Rows whose email or nickname is already taken are filtered out up front rather than left to ON
+# CONFLICT, because with a partitioned users table uniqueness is enforced by a trigger that raises
+# instead of conflicting. Of the remaining rows that repeat an email or nickname, only the first is
+# inserted; the rest are reconsidered by running the statement again, since the row they repeated
+# may itself have lost to an earlier one.
+_MERGE_STAGING = text(f"""
+    WITH available AS (
+        SELECT s.* FROM user_import_staging s
+        WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.email = s.email)
+          AND NOT EXISTS (SELECT 1 FROM users u WHERE u.nickname = s.nickname)
+    ), ranked AS (
+        SELECT a.*,
+               row_number() OVER (PARTITION BY email ORDER BY line) AS email_rank,
+               row_number() OVER (PARTITION BY nickname ORDER BY line) AS nickname_rank
+        FROM available a
+    )
+    INSERT INTO users ({_USER_COLUMNS}, role, email_verified, is_professional, failed_login_attempts, is_locked)
+    SELECT {_USER_COLUMNS}, 'ANONYMOUS', false, false, 0, false
+    FROM ranked
+    WHERE email_rank = 1 AND nickname_rank = 1
+    ON CONFLICT DO NOTHING
+    RETURNING id
+""")
+# A row left over lost either to an existing user or to a row imported before it from this chunk.
+_STAGED_CONFLICTS = text("""
+    SELECT s.line, s.email, s.nickname,
+           CASE WHEN EXISTS (SELECT 1 FROM users u WHERE u.email = s.email AND u.id <> ALL(:imported)) THEN 'email_taken'
+                WHEN EXISTS (SELECT 1 FROM users u WHERE u.nickname = s.nickname AND u.id <> ALL(:imported)) THEN 'nickname_taken'
+                ELSE 'duplicate_in_file' END
+    FROM user_import_staging s
+    WHERE s.id <> ALL(:imported)
+    ORDER BY s.line
+""").bindparams(bindparam("imported", type_=ARRAY(PG_UUID(as_uuid=True))))
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without holding more than one line in memory."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+async def parse_rows(chunks: AsyncIterator[bytes], format: UserFileFormat) -> AsyncIterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """
+    Yield `(line_number, row, error)` for each record of a CSV (with a header line) or NDJSON stream.
+
+    CSV fields may be quoted but may not contain line breaks. Empty CSV fields are read as missing.
+    """
+    header = None
+    line_number = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        if format == UserFileFormat.NDJSON:
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield line_number, None, "Each line must be a JSON object"
+                continue
+            yield line_number, row, None
+        elif header is None:
+            header = next(csv.reader([line]))
+        else:
+            values = next(csv.reader([line]))
+            if len(values) != len(header):
+                yield line_number, None, f"Expected {len(header)} fields, got {len(values)}"
+                continue
+            yield line_number, {name: value for name, value in zip(header, values) if value != ""}, None
+
+def _hash_or_keep(password: str) -> str:
+    """Keep pre-hashed bcrypt values as they are; hash everything else."""
+    return password if _BCRYPT_HASH.match(password) else hash_password(password)
+
+class UserImportService:
+    """
+    Loads many users at once from a CSV or NDJSON stream.
+
+    Rows are read and validated with `UserCreate` a chunk at a time; passwords are hashed on a thread
+    pool; each chunk is COPYed into a temporary staging table and merged into `users` with set-based
+    statements, in its own transaction. Rows whose email or nickname is already taken, or repeats one
+    imported from the same chunk, are reported as conflicts instead of failing the import. Imported
+    users start unverified with a verification token, like users created through the API, but no
+    verification email is sent.
+    """
+
+    @classmethod
+    async def import_users(cls, session: AsyncSession, chunks: AsyncIterator[bytes], format: UserFileFormat,
+                           actor: Optional[str] = None, chunk_size: Optional[int] = None) -> UserImportResult:
+        chunk_size = chunk_size or settings.import_chunk_size
+        result = UserImportResult()
+        pending: List[Tuple[int, Dict]] = []
+        async for line_number, row, error in parse_rows(chunks, format):
+            result.received += 1
+            if error is not None:
+                result.invalid.append(ImportRowError(line=line_number, errors=[error]))
+                continue
+            try:
+                user = UserCreate(**row)
+            except ValidationError as e:
+                result.invalid.append(ImportRowError(
+                    line=line_number,
+                    errors=[f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()],
+                ))
+                continue
+            pending.append((line_number, user.model_dump()))
+            if len(pending) >= chunk_size:
+                await cls._load_chunk(session, pending, result, actor)
+                pending = []
+        if pending:
+            await cls._load_chunk(session, pending, result, actor)
+        return result
+
+    @classmethod
+    async def _load_chunk(cls, session: AsyncSession, rows: List[Tuple[int, Dict]], result: UserImportResult, actor: Optional[str]):
+        loop = asyncio.get_running_loop()
+        hashes = await asyncio.gather(*(
+            loop.run_in_executor(_hash_executor, _hash_or_keep, data["password"]) for _, data in rows
+        ))
+        records = [
+            (
+                line_number, uuid.uuid4(), data.get("nickname") or f"{generate_nickname()}_{secrets.token_hex(3)}",
+                data["email"], data.get("first_name"), data.get("last_name"), data.get("bio"),
+                data.get("profile_picture_url"), data.get("linkedin_profile_url"), data.get("github_profile_url"),
+                hashed_password, generate_verification_token(),
+            )
+            for (line_number, data), hashed_password in zip(rows, hashes)
+        ]
+        try:
+            await session.execute(_CREATE_STAGING)
+            connection = await (await session.connection()).get_raw_connection()
+            await connection.driver_connection.copy_records_to_table(
+                "user_import_staging", records=records, columns=_STAGING_COLUMNS
+            )
+            imported = []
+            while len(imported) < len(records):
+                merged = (await session.execute(_MERGE_STAGING)).scalars().all()
+                if not merged:
+                    break
+                imported.extend(merged)
+            conflicts = (await session.execute(_STAGED_CONFLICTS, {"imported": imported})).all()
+            await WebhookService.enqueue(session, "user.created", imported)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        result.imported += len(imported)
+        result.conflicts.extend(
+            ImportConflict(line=line, email=email, nickname=nickname, reason=reason)
+            for line, email, nickname, reason in conflicts
+        )
+        await AuditService.record_many("user.created", imported, actor, details={"source": "import"})
+        logger.info(f"Imported {len(imported)} of {len(rows)} users; {len(conflicts)} conflicts.")
@@ -0,0 +1,85 @@
+from builtins import Exception, int, len
+from datetime import datetime, timedelta, timezone
+import asyncio
+import logging
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_settings
+from app.models.user_archive_model import UserArchive
+from app.models.user_model import User
+from app.services.webhook_service import WebhookService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class UserPurgeService:
+    """
+    Keeps the `users` table compact by moving dead rows into `users_archive` in the background.
+
+    Purging happens in two steps, each done in small batches that are committed separately:
+    users that never verified their email are tombstoned once they are old enough, and tombstoned
+    users are moved to the archive table once their grace period has passed. Batches claim rows with
+    `FOR UPDATE SKIP LOCKED`, so the purger never waits on rows that live traffic is touching.
+    """
+
+    @classmethod
+    async def tombstone_unverified(cls, session: AsyncSession, created_before: datetime, batch_size: int) -> int:
+        """Soft-delete up to `batch_size` users that are still unverified and were created before the cutoff."""
+        stale = select(User.id).where(
+            User.email_verified.is_(False), User.deleted_at.is_(None), User.created_at < created_before
+        ).limit(batch_size).with_for_update(skip_locked=True)
+        query = update(User.__table__).where(User.id.in_(stale.scalar_subquery())).values(deleted_at=func.now()).returning(User.id)
+        tombstoned = (await session.execute(query)).scalars().all()
+        await WebhookService.enqueue(session, "user.deleted", tombstoned)
+        await session.commit()
+        return len(tombstoned)
+
+    @classmethod
+    async def archive_tombstoned(cls, session: AsyncSession, deleted_before: datetime, batch_size: int) -> int:
+        """Move up to `batch_size` users tombstoned before the cutoff into the archive, in one statement."""
+        users = User.__table__
+        doomed = select(users.c.id).where(users.c.deleted_at < deleted_before) \
+            .limit(batch_size).with_for_update(skip_locked=True)
+        moved = delete(users).where(users.c.id.in_(doomed.scalar_subquery())).returning(*users.c).cte("moved")
+        columns = [column.name for column in users.c if column.name in UserArchive.__table__.c]
+        query = insert(UserArchive).from_select(columns, select(*[moved.c[name] for name in columns]))
+        result = await session.execute(query)
+        await session.commit()
+        return result.rowcount
+
+    @classmethod
+    async def purge_once(cls, session: AsyncSession, now: datetime = None) -> int:
+        """
+        Run both purge steps until no full batch is left, pausing between batches.
+
+        :return: The number of users tombstoned and archived.
+        """
+        now = now or datetime.now(timezone.utc)
+        batch_size = settings.purge_batch_size
+        unverified_cutoff = now - timedelta(days=settings.purge_unverified_after_days)
+        tombstone_cutoff = now - timedelta(hours=settings.purge_tombstone_grace_hours)
+        total = 0
+        for step, cutoff in ((cls.tombstone_unverified, unverified_cutoff), (cls.archive_tombstoned, tombstone_cutoff)):
+            while True:
+                count = await step(session, cutoff, batch_size)
+                total += count
+                if count < batch_size:
+                    break
+                await asyncio.sleep(settings.purge_batch_pause_seconds)
+        return total
+
+    @classmethod
+    async def run(cls, session_factory, stop_event: asyncio.Event):
+        """Purge on a fixed interval until `stop_event` is set."""
+        while not stop_event.is_set():
+            try:
+                async with session_factory() as session:
+                    purged = await cls.purge_once(session)
+                if purged:
+                    logger.info(f"Purged {purged} users.")
+            except Exception:
+                logger.exception("User purge failed; retrying on the next interval")
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=settings.purge_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
@@ -1,29 +1,85 @@
 from builtins import Exception, bool, classmethod, int, str
 from datetime import datetime, timezone
+from functools import lru_cache
 import secrets
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from pydantic import ValidationError
-from sqlalchemy import func, null, update, select
+from sqlalchemy import any_, bindparam, func, literal_column, null, tuple_, update, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import get_email_service, get_settings
-from app.models.user_model import User
-from app.schemas.user_schemas import UserCreate, UserUpdate
+from app.models.user_model import User, partition_routing
+from app.schemas.user_schemas import UserCreate, UserResponse, UserUpdate, sparse_user_response
 from app.utils.nickname_gen import generate_nickname
 from app.utils.security import generate_verification_token, hash_password, verify_password
 from uuid import UUID
+from app.services.audit_service import AuditService
 from app.services.email_service import EmailService
+from app.services.login_event_service import LoginEventService
+from app.services.notification_service import NOTIFY_COLUMNS, NotificationService
+from app.services.user_fast_path import UserFastPath, UserRecord
+from app.services.webhook_service import WEBHOOK_EVENTS, WebhookService
 from app.models.user_model import UserRole
 import logging
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# The hottest statements are built once, with bound parameters for everything that varies per call.
+# SQLAlchemy memoizes the cache key of a statement object, so executing one of these skips both
+# rebuilding the construct and re-keying it before the compiled-SQL cache lookup.
+_LIVE = User.deleted_at.is_(None)
+_USER_LOOKUPS = {
+    (column, include_deleted): select(User).where(
+        getattr(User, column) == bindparam("value"),
+        *partition_routing(column, bindparam("value")),
+        *(() if include_deleted else (_LIVE,)),
+    )
+    for column in ("id", "email", "nickname")
+    for include_deleted in (False, True)
+}
+_USERS_BY_IDS = select(User).where(User.id == any_(bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True)))), _LIVE)
+# Ordering by id makes pages stable and lets deep pages walk the live-users index instead of scanning the table.
+_LIST_USERS = select(User).where(_LIVE).order_by(User.id).offset(bindparam("skip")).limit(bindparam("limit"))
+_COUNT_USERS = select(func.count()).select_from(User).where(_LIVE)
+# Only changes made by transactions older than every running one are final; newer ones wait for the next poll.
+_SETTLED_CHANGE_SEQ = literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+_LIST_CHANGES = (
+    select(User)
+    .where(
+        User.change_seq < _SETTLED_CHANGE_SEQ,
+        tuple_(User.change_seq, User.id) > tuple_(bindparam("after_seq"), bindparam("after_id", type_=PG_UUID(as_uuid=True))),
+    )
+    .order_by(User.change_seq, User.id)
+    .limit(bindparam("limit"))
+)
+
+@lru_cache(maxsize=256)
+def _list_users_sparse(fields: Tuple[str, ...]):
+    """`_LIST_USERS` reading only the `fields` columns, built once per fieldset."""
+    return _LIST_USERS.with_only_columns(*(getattr(User, name) for name in fields))
+
 class UserService:
     @classmethod
-    async def _execute_query(cls, session: AsyncSession, query):
+    async def _execute_query(cls, session: AsyncSession, query, params: Optional[Dict] = None, publish: Optional[str] = None,
+                             notify: Optional[Tuple[str, str]] = None):
+        """
+        Execute `query` in its own transaction.
+
+        With `publish`, the query must return user IDs first; the `publish` webhook event is queued
+        for them in the same transaction. Likewise with `notify`, a `(kind, message)` pair the users
+        are notified of, for which the query must return the `NOTIFY_COLUMNS`.
+        """
         try:
-            result = await session.execute(query)
+            result = await session.execute(query, params)
+            if publish is not None or notify is not None:
+                result = result.freeze()
+                if publish is not None:
+                    await WebhookService.enqueue(session, publish, result().scalars().all())
+                if notify is not None:
+                    await NotificationService.notify(session, result().all(), *notify)
+                result = result()
             await session.commit()
             return result
         except SQLAlchemyError as e:
@@ -32,28 +88,44 @@ class UserService:
             return None
 
     @classmethod
-    async def _fetch_user(cls, session: AsyncSession, **filters) -> Optional[User]:
-        query = select(User).filter_by(**filters)
-        result = await cls._execute_query(session, query)
+    async def _fetch_user(cls, session: AsyncSession, include_deleted: bool = False, **filters) -> Optional[User]:
+        """Fetch one user by exactly one of `id`, `email` or `nickname`, using the prebuilt lookup statement."""
+        [(column, value)] = filters.items()
+        result = await cls._execute_query(session, _USER_LOOKUPS[column, include_deleted], {"value": value})
         return result.scalars().first() if result else None
 
     @classmethod
     async def get_by_id(cls, session: AsyncSession, user_id: UUID) -> Optional[User]:
         return await cls._fetch_user(session, id=user_id)
 
+    @classmethod
+    async def get_by_ids(cls, session: AsyncSession, user_ids: List[UUID]) -> List[User]:
+        """
+        Fetch several users with a single `WHERE id = ANY(:ids)` round-trip.
+
+        :param session: The AsyncSession instance for database access.
+        :param user_ids: The user IDs to resolve; duplicates are collapsed.
+        :return: The users that exist, in no particular order.
+        """
+        if not user_ids:
+            return []
+        result = await cls._execute_query(session, _USERS_BY_IDS, {"ids": list(dict.fromkeys(user_ids))})
+        return result.scalars().all() if result else []
+
     @classmethod
     async def get_by_nickname(cls, session: AsyncSession, nickname: str) -> Optional[User]:
         return await cls._fetch_user(session, nickname=nickname)
 
     @classmethod
-    async def get_by_email(cls, session: AsyncSession, email: str) -> Optional[User]:
-        return await cls._fetch_user(session, email=email)
+    async def get_by_email(cls, session: AsyncSession, email: str, include_deleted: bool = False) -> Optional[User]:
+        return await cls._fetch_user(session, include_deleted, email=email)
 
     @classmethod
     async def create(cls, session: AsyncSession, user_data: Dict[str, str], email_service: EmailService) -> Optional[User]:
         try:
             validated_data = UserCreate(**user_data).model_dump()
-            existing_user = await cls.get_by_email(session, validated_data['email'])
+            # Soft-deleted users still own their email until they are purged.
+            existing_user = await cls._fetch_user(session, include_deleted=True, email=validated_data['email'])
             if existing_user:
                 logger.error("User with given email already exists.")
                 return None
@@ -61,12 +133,16 @@ class UserService:
             new_user = User(**validated_data)
             new_user.verification_token = generate_verification_token()
             new_nickname = generate_nickname()
-            while await cls.get_by_nickname(session, new_nickname):
+            while await cls._fetch_user(session, include_deleted=True, nickname=new_nickname):
                 new_nickname = generate_nickname()
             new_user.nickname = new_nickname
             session.add(new_user)
+            await session.flush()
+            await WebhookService.enqueue(session, "user.created", [new_user.id])
+            # The email dispatcher sends it once the user is committed, so registering never waits on SMTP.
+            await email_service.queue_verification_email(session, new_user)
             await session.commit()
-            await email_service.send_verification_email(new_user)
+            await AuditService.record("user.created", new_user.id)
             
             return new_user
         except ValidationError as e:
@@ -74,19 +150,20 @@ class UserService:
             return None
 
     @classmethod
-    async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str]) -> Optional[User]:
+    async def update(cls, session: AsyncSession, user_id: UUID, update_data: Dict[str, str], actor: Optional[str] = None) -> Optional[User]:
         try:
             # validated_data = UserUpdate(**update_data).dict(exclude_unset=True)
             validated_data = UserUpdate(**update_data).dict(exclude_unset=True)
 
             if 'password' in validated_data:
                 validated_data['hashed_password'] = hash_password(validated_data.pop('password'))
-            query = update(User).where(User.id == user_id).values(**validated_data).execution_options(synchronize_session="fetch")
+            query = update(User).where(User.id == user_id, User.deleted_at.is_(None)).values(**validated_data).execution_options(synchronize_session="fetch")
             await cls._execute_query(session, query)
             updated_user = await cls.get_by_id(session, user_id)
             if updated_user:
                 session.refresh(updated_user)  # Explicitly refresh the updated user object
                 logger.info(f"User {user_id} updated successfully.")
+                await AuditService.record("user.updated", user_id, actor, {"fields": sorted(validated_data)})
                 return updated_user
             else:
                 logger.error(f"User {user_id} not found after update attempt.")
@@ -96,20 +173,108 @@ class UserService:
             return None
 
     @classmethod
-    async def delete(cls, session: AsyncSession, user_id: UUID) -> bool:
-        user = await cls.get_by_id(session, user_id)
-        if not user:
+    async def delete(cls, session: AsyncSession, user_id: UUID, actor: Optional[str] = None) -> bool:
+        """
+        Soft-delete a user by setting its tombstone.
+
+        The row stays in `users` (hidden from every lookup) until the background purger moves it to
+        the archive table in a later batch.
+        """
+        query = update(User).where(User.id == user_id, User.deleted_at.is_(None)) \
+            .values(deleted_at=func.now()).returning(User.id).execution_options(synchronize_session="fetch")
+        result = await cls._execute_query(session, query, publish="user.deleted")
+        if not result or result.scalar() is None:
             logger.info(f"User with ID {user_id} not found.")
             return False
-        await session.delete(user)
-        await session.commit()
+        await AuditService.record("user.deleted", user_id, actor)
         return True
 
     @classmethod
-    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10) -> List[User]:
-        query = select(User).offset(skip).limit(limit)
-        result = await cls._execute_query(session, query)
-        return result.scalars().all() if result else []
+    async def list_users(cls, session: AsyncSession, skip: int = 0, limit: int = 10, fields: Optional[Tuple[str, ...]] = None) -> List[User]:
+        """
+        List a page of live users. With `fields`, only those columns are read, and rows with just
+        those attributes are returned instead of `User` instances.
+        """
+        if fields is None:
+            result = await cls._execute_query(session, _LIST_USERS, {"skip": skip, "limit": limit})
+            return result.scalars().all() if result else []
+        result = await cls._execute_query(session, _list_users_sparse(fields), {"skip": skip, "limit": limit})
+        return result.all() if result else []
+
+    @classmethod
+    async def _bulk_update(cls, session: AsyncSession, values: Dict, action: str, user_ids: Optional[List[UUID]] = None,
+                           filters: Optional[Dict] = None, actor: Optional[str] = None, details: Optional[Dict] = None,
+                           chunk_size: Optional[int] = None) -> int:
+        """
+        Apply the same column values to many users with set-based `UPDATE ... RETURNING` statements.
+
+        Targets are either an explicit list of IDs or a `filter_by` style mapping. Work is split into
+        chunks of `chunk_size` rows, each committed on its own so that very large sets never hold
+        row locks for long; filtered updates walk the table in primary key order. Every updated user
+        gets an audit event for `action`, and a notification if `NotificationService` has one for it.
+
+        :return: The number of rows updated.
+        """
+        chunk_size = chunk_size or settings.bulk_update_chunk_size
+        publish = action if action in WEBHOOK_EVENTS else None
+        message = NotificationService.message_for(action, details)
+        notify = (action, message) if message else None
+        # The updated rows come back with what notifying them takes, rather than being looked up again.
+        returned = NOTIFY_COLUMNS if notify else (User.id,)
+        affected = 0
+        if user_ids is not None:
+            unique_ids = list(dict.fromkeys(user_ids))
+            chunks = (unique_ids[i:i + chunk_size] for i in range(0, len(unique_ids), chunk_size))
+            for chunk in chunks:
+                ids = bindparam("ids", chunk, type_=ARRAY(PG_UUID(as_uuid=True)))
+                query = update(User).where(User.id == any_(ids), User.deleted_at.is_(None)).values(**values).returning(*returned) \
+                    .execution_options(synchronize_session="fetch")
+                result = await cls._execute_query(session, query, publish=publish, notify=notify)
+                if result is None:
+                    logger.error(f"Bulk update stopped after {affected} rows.")
+                    break
+                updated_ids = result.scalars().all()
+                affected += len(updated_ids)
+                await AuditService.record_many(action, updated_ids, actor, details)
+            return affected
+
+        last_id = None
+        while True:
+            chunk = select(User.id).filter_by(**filters).where(User.deleted_at.is_(None)).order_by(User.id).limit(chunk_size)
+            if last_id is not None:
+                chunk = chunk.where(User.id > last_id)
+            # = ANY(ARRAY(...)) instead of IN (...): the chunk is then probed through the primary key
+            # rather than joined against the table, which the planner may do with a sequential scan.
+            query = update(User).where(User.id == any_(func.array(chunk.scalar_subquery()))).values(**values).returning(*returned) \
+                .execution_options(synchronize_session="fetch")
+            result = await cls._execute_query(session, query, publish=publish, notify=notify)
+            if result is None:
+                logger.error(f"Bulk update stopped after {affected} rows.")
+                break
+            updated_ids = result.scalars().all()
+            affected += len(updated_ids)
+            await AuditService.record_many(action, updated_ids, actor, details)
+            if len(updated_ids) < chunk_size:
+                break
+            last_id = max(updated_ids)
+        return affected
+
+    @classmethod
+    async def bulk_set_role(cls, session: AsyncSession, role: UserRole, user_ids: Optional[List[UUID]] = None, filters: Optional[Dict] = None, actor: Optional[str] = None) -> int:
+        return await cls._bulk_update(session, {"role": role}, "user.role_changed", user_ids, filters, actor, {"role": role.name})
+
+    @classmethod
+    async def bulk_lock(cls, session: AsyncSession, user_ids: Optional[List[UUID]] = None, filters: Optional[Dict] = None, actor: Optional[str] = None) -> int:
+        return await cls._bulk_update(session, {"is_locked": True}, "user.locked", user_ids, filters, actor)
+
+    @classmethod
+    async def bulk_unlock(cls, session: AsyncSession, user_ids: Optional[List[UUID]] = None, filters: Optional[Dict] = None, actor: Optional[str] = None) -> int:
+        return await cls._bulk_update(session, {"is_locked": False, "failed_login_attempts": 0}, "user.unlocked", user_ids, filters, actor)
+
+    @classmethod
+    async def bulk_update_professional_status(cls, session: AsyncSession, status: bool, user_ids: Optional[List[UUID]] = None, filters: Optional[Dict] = None, actor: Optional[str] = None) -> int:
+        values = {"is_professional": status, "professional_status_updated_at": func.now()}
+        return await cls._bulk_update(session, values, "user.professional_status_changed", user_ids, filters, actor, {"is_professional": status})
 
     @classmethod
     async def register_user(cls, session: AsyncSession, user_data: Dict[str, str], get_email_service) -> Optional[User]:
@@ -118,31 +283,94 @@ class UserService:
 
     @classmethod
     async def login_user(cls, session: AsyncSession, email: str, password: str) -> Optional[User]:
+        """
+        Check a user's credentials and record the attempt.
+
+        On the fast path the returned user is a read-only `UserRecord` carrying the credential columns
+        rather than a `User` instance.
+        """
+        if settings.user_fast_path_enabled and UserFastPath.is_available(session):
+            return await cls._login_user_fast(session, email, password)
         user = await cls.get_by_email(session, email)
         if user:
             if user.email_verified is False:
+                await LoginEventService.record(email, False, user.id, "email_unverified")
                 return None
             if user.is_locked:
+                await LoginEventService.record(email, False, user.id, "locked")
                 return None
             if verify_password(password, user.hashed_password):
                 user.failed_login_attempts = 0
                 user.last_login_at = datetime.now(timezone.utc)
                 session.add(user)
                 await session.commit()
+                await LoginEventService.record(email, True, user.id)
                 return user
             else:
                 user.failed_login_attempts += 1
                 if user.failed_login_attempts >= settings.max_login_attempts:
                     user.is_locked = True
+                    await WebhookService.enqueue(session, "user.locked", [user.id])
                 session.add(user)
                 await session.commit()
+                await LoginEventService.record(email, False, user.id, "bad_password")
+                if user.is_locked:
+                    await AuditService.record("user.locked", user.id, details={"reason": "too_many_failed_logins"})
+        else:
+            await LoginEventService.record(email, False, failure_reason="unknown_email")
+        return None
+
+    @classmethod
+    async def _login_user_fast(cls, session: AsyncSession, email: str, password: str) -> Optional[UserRecord]:
+        user = await UserFastPath.fetch_credentials(session, email)
+        if user is None:
+            await LoginEventService.record(email, False, failure_reason="unknown_email")
+            return None
+        if user.email_verified is False or user.is_locked:
+            await LoginEventService.record(email, False, user.id, "locked" if user.is_locked else "email_unverified")
+            return None
+        if verify_password(password, user.hashed_password):
+            await UserFastPath.record_login_success(session, user.id)
+            await session.commit()
+            await LoginEventService.record(email, True, user.id)
+            return user
+        locked = await UserFastPath.record_login_failure(session, user.id, settings.max_login_attempts)
+        if locked:
+            await WebhookService.enqueue(session, "user.locked", [user.id])
+        await session.commit()
+        await LoginEventService.record(email, False, user.id, "bad_password")
+        if locked:
+            await AuditService.record("user.locked", user.id, details={"reason": "too_many_failed_logins"})
         return None
 
     @classmethod
     async def is_account_locked(cls, session: AsyncSession, email: str) -> bool:
+        if settings.user_fast_path_enabled and UserFastPath.is_available(session):
+            return await UserFastPath.is_locked(session, email)
         user = await cls.get_by_email(session, email)
         return user.is_locked if user else False
 
+    @classmethod
+    async def get_profile_by_id(cls, session: AsyncSession, user_id: UUID, fields: Optional[Tuple[str, ...]] = None) -> Optional[UserResponse]:
+        """
+        Fetch a live user straight into a `UserResponse`, through the asyncpg fast path when available.
+        With `fields`, the fast path reads only those columns into a `sparse_user_response(fields)`.
+        """
+        if settings.user_fast_path_enabled and UserFastPath.is_available(session):
+            return await UserFastPath.fetch_profile_by_id(session, user_id, fields)
+        user = await cls.get_by_id(session, user_id)
+        if not user:
+            return None
+        return UserResponse.model_validate(user) if fields is None else sparse_user_response(fields).model_validate(user)
+
+    @classmethod
+    async def get_profile_by_email(cls, session: AsyncSession, email: str) -> Optional[UserResponse]:
+        """Fetch a live user straight into a `UserResponse`, through the asyncpg fast path when available."""
+        if settings.user_fast_path_enabled and UserFastPath.is_available(session):
+            return await UserFastPath.fetch_profile_by_email(session, email)
+        user = await cls.get_by_email(session, email)
+        return UserResponse.model_validate(user) if user else None
+
 
     @classmethod
     async def reset_password(cls, session: AsyncSession, user_id: UUID, new_password: str) -> bool:
@@ -154,6 +382,7 @@ class UserService:
             user.is_locked = False  # Unlocking the user account, if locked
             session.add(user)
             await session.commit()
+            await AuditService.record("user.password_reset", user.id)
             return True
         return False
 
@@ -163,9 +392,14 @@ class UserService:
         if user and user.verification_token == token:
             user.email_verified = True
             user.verification_token = None  # Clear the token once used
+            previous_role = user.role
             user.role = UserRole.AUTHENTICATED
             session.add(user)
+            await WebhookService.enqueue(session, "user.email_verified", [user.id])
             await session.commit()
+            await AuditService.record("user.email_verified", user.id)
+            if previous_role != user.role:
+                await AuditService.record("user.role_changed", user.id, details={"role": user.role.name})
             return True
         return False
 
@@ -177,10 +411,20 @@ class UserService:
         :param session: The AsyncSession instance for database access.
         :return: The count of users.
         """
-        query = select(func.count()).select_from(User)
-        result = await session.execute(query)
+        result = await session.execute(_COUNT_USERS)
         count = result.scalar()
         return count
+
+    @classmethod
+    async def list_changes(cls, session: AsyncSession, after_seq: int, after_id: UUID, limit: int) -> List[User]:
+        """
+        List users changed after the `(change_seq, id)` position, in change order, soft-deleted ones included.
+
+        Only changes whose transactions are settled are returned, so a consumer that resumes from the
+        last position it saw never skips a change committed late by a long-running transaction.
+        """
+        result = await session.execute(_LIST_CHANGES, {"after_seq": after_seq, "after_id": after_id, "limit": limit})
+        return result.scalars().all()
     
     @classmethod
     async def unlock_user_account(cls, session: AsyncSession, user_id: UUID) -> bool:
@@ -189,7 +433,9 @@ class UserService:
             user.is_locked = False
             user.failed_login_attempts = 0  # Optionally reset failed login attempts
             session.add(user)
+            await NotificationService.notify(session, [user], "user.unlocked", NotificationService.message_for("user.unlocked"))
             await session.commit()
+            await AuditService.record("user.unlocked", user.id)
             return True
         return False
     
@@ -0,0 +1,231 @@
+from builtins import bool, classmethod, dict, float, int, len, list, range, str, type
+from collections import defaultdict
+from datetime import timedelta
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+from typing import Dict, List, Optional
+from uuid import UUID
+import httpx
+from sqlalchemy import String, any_, bindparam, cast, delete, func, insert, literal_column, select, true, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies import get_settings
+from app.models.webhook_model import WebhookDeadLetter, WebhookDelivery, WebhookSubscription
+from app.utils.background_worker import BackgroundWorker
+from app.utils.leases import backoff_delay, claim_due
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+WEBHOOK_EVENTS = ("user.created", "user.email_verified", "user.locked", "user.deleted")
+
+_UUIDS = ARRAY(PG_UUID(as_uuid=True))
+_IDS = bindparam("ids", type_=ARRAY(WebhookDelivery.id.type))
+_ERROR = bindparam("error", type_=String)
+
+# One delivery per active subscription to the event and per user, built by the database in a single
+# INSERT ... SELECT so that it commits or rolls back with the change it announces.
+_event_type = cast(bindparam("event_type"), String(50))
+_changed = func.unnest(bindparam("user_ids", type_=_UUIDS)).table_valued("user_id").render_derived(name="changed")
+_FAN_OUT = insert(WebhookDelivery.__table__).from_select(
+    ["subscription_id", "event_type", "user_id", "payload"],
+    select(
+        WebhookSubscription.id,
+        _event_type,
+        _changed.c.user_id,
+        func.jsonb_build_object(
+            literal_column("'event'"), _event_type,
+            literal_column("'user_id'"), _changed.c.user_id,
+            literal_column("'occurred_at'"), func.now(),
+        ),
+    )
+    .join(_changed, true())
+    .where(WebhookSubscription.is_active, _event_type == any_(WebhookSubscription.events)),
+)
+_CLAIM = claim_due(WebhookDelivery.__table__, WebhookDelivery.next_attempt_at, WebhookDelivery.id, WebhookDelivery.subscription_id, WebhookDelivery.payload)
+_DELIVERED = delete(WebhookDelivery.__table__).where(WebhookDelivery.id == any_(_IDS))
+_exhausted = (
+    delete(WebhookDelivery.__table__)
+    .where(WebhookDelivery.id == any_(_IDS), WebhookDelivery.attempts + 1 >= bindparam("max_attempts"))
+    .returning(*WebhookDelivery.__table__.c)
+    .cte("exhausted")
+)
+_DEAD_LETTER = insert(WebhookDeadLetter.__table__).from_select(
+    ["id", "subscription_id", "event_type", "user_id", "payload", "created_at", "attempts", "last_error"],
+    select(
+        _exhausted.c.id, _exhausted.c.subscription_id, _exhausted.c.event_type, _exhausted.c.user_id,
+        _exhausted.c.payload, _exhausted.c.created_at, _exhausted.c.attempts + 1, _ERROR,
+    ),
+)
+_RETRY = (
+    update(WebhookDelivery.__table__)
+    .where(WebhookDelivery.id == any_(_IDS))
+    .values(
+        attempts=WebhookDelivery.attempts + 1,
+        last_error=_ERROR,
+        next_attempt_at=func.now() + backoff_delay(WebhookDelivery.attempts),
+    )
+)
+_dead = delete(WebhookDeadLetter.__table__).where(WebhookDeadLetter.id == bindparam("id")).returning(*WebhookDeadLetter.__table__.c).cte("dead")
+_REPLAY = insert(WebhookDelivery.__table__).from_select(
+    ["subscription_id", "event_type", "user_id", "payload", "created_at"],
+    select(_dead.c.subscription_id, _dead.c.event_type, _dead.c.user_id, _dead.c.payload, _dead.c.created_at),
+)
+
+def sign(secret: str, body: bytes) -> str:
+    """The `X-Webhook-Signature` header value for `body`."""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+class WebhookService:
+    """Manages webhook subscriptions and queues user events for delivery by `webhook_dispatcher`."""
+
+    @classmethod
+    async def enqueue(cls, session: AsyncSession, event_type: str, user_ids: List[UUID]):
+        """
+        Queue `event_type` for every active subscription to it, once per user.
+
+        Does not commit: call it inside the transaction that makes the change, so the event is queued
+        if and only if the change is committed.
+        """
+        if user_ids:
+            await session.execute(_FAN_OUT, {"event_type": event_type, "user_ids": list(user_ids)})
+
+    @classmethod
+    async def create_subscription(cls, session: AsyncSession, url: str, events: List[str], secret: Optional[str] = None,
+                                  max_concurrency: int = 4) -> WebhookSubscription:
+        subscription = WebhookSubscription(
+            url=url, events=list(dict.fromkeys(events)), secret=secret or secrets.token_urlsafe(32), max_concurrency=max_concurrency,
+        )
+        session.add(subscription)
+        await session.commit()
+        await session.refresh(subscription)
+        return subscription
+
+    @classmethod
+    async def list_subscriptions(cls, session: AsyncSession) -> List[WebhookSubscription]:
+        result = await session.execute(select(WebhookSubscription).order_by(WebhookSubscription.created_at))
+        return result.scalars().all()
+
+    @classmethod
+    async def delete_subscription(cls, session: AsyncSession, subscription_id: UUID) -> bool:
+        """Delete a subscription together with its pending deliveries and dead letters."""
+        result = await session.execute(delete(WebhookSubscription).where(WebhookSubscription.id == subscription_id))
+        await session.commit()
+        return result.rowcount > 0
+
+    @classmethod
+    async def list_dead_letters(cls, session: AsyncSession, before_id: Optional[int] = None, limit: int = 50) -> List[WebhookDeadLetter]:
+        query = select(WebhookDeadLetter).order_by(WebhookDeadLetter.id.desc()).limit(limit)
+        if before_id is not None:
+            query = query.where(WebhookDeadLetter.id < before_id)
+        result = await session.execute(query)
+        return result.scalars().all()
+
+    @classmethod
+    async def replay_dead_letter(cls, session: AsyncSession, dead_letter_id: int) -> bool:
+        """Move a dead letter back into the delivery queue with a fresh set of attempts."""
+        result = await session.execute(_REPLAY, {"id": dead_letter_id})
+        await session.commit()
+        return result.rowcount > 0
+
+class WebhookDispatcher(BackgroundWorker):
+    """
+    Delivers queued webhook events in the background.
+
+    Each round claims up to `webhook_claim_size` due deliveries, groups them by subscription into
+    batches of `webhook_batch_size` events and POSTs each batch as one signed JSON request
+    (`{"deliveries": [...]}`) through a single shared `httpx` connection pool. A per-subscription
+    semaphore keeps at most `max_concurrency` requests in flight to each endpoint. Delivered rows are
+    deleted; failed ones are retried with exponential backoff and moved to `webhook_dead_letters`
+    after `webhook_max_attempts` attempts. Delivery is at least once: endpoints should discard
+    delivery ids they have already seen.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def poll_interval(self) -> float:
+        return settings.webhook_poll_interval_seconds
+
+    def open(self, session_factory):
+        """Create the shared HTTP client; `dispatch_once` can be called from then on."""
+        super().open(session_factory)
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=settings.webhook_timeout_seconds,
+                limits=httpx.Limits(max_connections=settings.webhook_max_connections,
+                                    max_keepalive_connections=settings.webhook_max_connections),
+            )
+
+    async def close(self):
+        """Close the connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def run_once(self) -> bool:
+        return await self.dispatch_once() >= settings.webhook_claim_size
+
+    async def dispatch_once(self) -> int:
+        """
+        Run one round of deliveries.
+
+        :return: The number of deliveries claimed.
+        """
+        async with self._session_factory() as session:
+            rows = (await session.execute(_CLAIM, {
+                "limit": settings.webhook_claim_size, "lease": timedelta(seconds=settings.webhook_lease_seconds),
+            })).all()
+            if not rows:
+                await session.commit()
+                return 0
+            subscriptions = {
+                subscription.id: subscription
+                for subscription in (await session.execute(
+                    select(WebhookSubscription).where(WebhookSubscription.id.in_({row.subscription_id for row in rows}))
+                )).scalars()
+            }
+            await session.commit()
+        by_subscription: Dict[UUID, List] = defaultdict(list)
+        for row in rows:
+            by_subscription[row.subscription_id].append(row)
+        sends = []
+        for subscription_id, deliveries in by_subscription.items():
+            subscription = subscriptions[subscription_id]
+            limit = asyncio.Semaphore(subscription.max_concurrency)
+            for start in range(0, len(deliveries), settings.webhook_batch_size):
+                sends.append(self._send(subscription, deliveries[start:start + settings.webhook_batch_size], limit))
+        await asyncio.gather(*sends)
+        return len(rows)
+
+    async def _send(self, subscription: WebhookSubscription, deliveries: List, limit: asyncio.Semaphore):
+        body = json.dumps({"deliveries": [{"id": row.id, **row.payload} for row in deliveries]}).encode()
+        headers = {"Content-Type": "application/json", "X-Webhook-Signature": sign(subscription.secret, body)}
+        error = None
+        async with limit:
+            try:
+                response = await self._client.post(subscription.url, content=body, headers=headers)
+                if not response.is_success:
+                    error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                error = f"{type(e).__name__}: {e}"[:500]
+        ids = [row.id for row in deliveries]
+        async with self._session_factory() as session:
+            if error is None:
+                await session.execute(_DELIVERED, {"ids": ids})
+            else:
+                logger.warning(f"Webhook delivery of {len(ids)} events to {subscription.url} failed: {error}")
+                await session.execute(_DEAD_LETTER, {"ids": ids, "error": error, "max_attempts": settings.webhook_max_attempts})
+                await session.execute(_RETRY, {
+                    "ids": ids, "error": error,
+                    "backoff_base": settings.webhook_backoff_base_seconds, "backoff_max": settings.webhook_backoff_max_seconds,
+                })
+            await session.commit()
+
+webhook_dispatcher = WebhookDispatcher()
@@ -0,0 +1,73 @@
+from builtins import Exception, NotImplementedError, bool, float, type
+import asyncio
+import logging
+from typing import Optional
+
+class BackgroundWorker:
+    """
+    Polls for work in a background task until stopped.
+
+    `start` opens the worker with its resources and calls `run_once` in a loop: again right away while
+    it reports more work ready, otherwise after `poll_interval` seconds. Whatever a round raises is
+    logged and the round retried after the poll interval, so an outage of the database or of a remote
+    service pauses the worker rather than ending it. `stop` lets the current round finish, then closes.
+
+    Subclasses implement `run_once` and `poll_interval`, extend `open` to take what they work with and
+    override `close` to release it.
+    """
+
+    def __init__(self):
+        self._session_factory = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def poll_interval(self) -> float:
+        """Seconds to wait after a round that left no work ready."""
+        raise NotImplementedError
+
+    def open(self, session_factory):
+        """Set where sessions come from; `run_once` can be called from then on."""
+        self._session_factory = session_factory
+
+    async def close(self):
+        """Release what `open` acquired."""
+
+    async def run_once(self) -> bool:
+        """Do one round of work and return whether more is ready right away."""
+        raise NotImplementedError
+
+    def start(self, session_factory, *resources):
+        """Open the worker with `resources` and start working in a background task."""
+        if self.is_running:
+            return
+        self.open(session_factory, *resources)
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Finish the current round, stop the background task and close."""
+        if self.is_running:
+            self._stop.set()
+            await self._task
+        self._task = None
+        await self.close()
+
+    async def _run(self):
+        logger = logging.getLogger(type(self).__module__)
+        while not self._stop.is_set():
+            try:
+                more = await self.run_once()
+            except Exception:
+                logger.exception(f"{type(self).__name__} round failed; retrying in {self.poll_interval} seconds")
+                more = False
+            if more:
+                continue
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,105 @@
+from builtins import Exception, bool, getattr, int, isinstance, len, list, str
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from sqlalchemy import Table, insert
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+def _is_data_error(error: Exception) -> bool:
+    """Whether Postgres rejected a value (SQLSTATE class 22); asyncpg errors are not mapped to `DataError`."""
+    return isinstance(error, DBAPIError) and str(getattr(error.orig, "sqlstate", None) or "").startswith("22")
+
+class BatchWriter:
+    """
+    Buffers rows for one table in a bounded in-process queue and writes them with multi-row INSERTs.
+
+    A batch is flushed as soon as it holds `max_batch_size` rows, or `flush_interval_ms` after its first
+    row arrived, whichever comes first. `record` only waits when the queue is full, which applies
+    backpressure instead of dropping rows. `stop` drains everything still queued before it returns.
+    """
+
+    def __init__(self, table: Table, max_batch_size: int = 100, flush_interval_ms: int = 250, max_queue_size: int = 10000):
+        self.table = table
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._session_factory = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, session_factory):
+        """Start the background flush task, writing through sessions from `session_factory`."""
+        if self.is_running:
+            return
+        self._session_factory = session_factory
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush every queued row and stop the background task."""
+        if not self.is_running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def record(self, **row):
+        """Queue one row for insertion. Rows recorded while the writer is stopped are discarded."""
+        if not self.is_running:
+            logger.debug(f"{self.table.name} writer is not running; discarding row.")
+            return
+        await self._queue.put(row)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch: List[Dict] = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict]):
+        # Any failure, including a database that refuses connections, loses this batch but never the
+        # flush task, so later rows are still written once the database is back.
+        try:
+            await self._insert(batch)
+            return
+        except Exception as e:
+            if not _is_data_error(e):
+                logger.exception(f"Failed to write {len(batch)} rows to {self.table.name}")
+                return
+        # A row the table rejects, e.g. with a value too long for its column, fails the whole INSERT;
+        # write the rows one by one so that only that row is lost.
+        for row in batch:
+            try:
+                await self._insert([row])
+            except Exception:
+                logger.exception(f"Failed to write a row to {self.table.name}")
+
+    async def _insert(self, rows: List[Dict]):
+        async with self._session_factory() as session:
+            await session.execute(insert(self.table).values(rows))
+            await session.commit()
@@ -0,0 +1,68 @@
+from builtins import Exception, float
+from contextlib import asynccontextmanager, suppress
+import asyncio
+import logging
+from typing import Dict
+from sqlalchemy import Column, Float, Interval, Table, bindparam, func, literal_column, select, update
+
+logger = logging.getLogger(__name__)
+
+def claim_due(table: Table, due: Column, *returning: Column):
+    """
+    An `UPDATE ... RETURNING` that claims up to `:limit` rows of `table` whose `due` time has passed,
+    oldest first, by pushing `due` a `:lease` interval ahead.
+
+    A worker that dies while working on its rows only delays them until the lease runs out; SKIP LOCKED
+    lets several workers claim disjoint rows concurrently.
+    """
+    key = table.primary_key.columns.values()[0]
+    return (
+        update(table)
+        .where(key.in_(
+            select(key)
+            .where(due <= func.now())
+            .order_by(due)
+            .limit(bindparam("limit"))
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        ))
+        .values({due.name: func.now() + bindparam("lease", type_=Interval)})
+        .returning(*returning)
+    )
+
+def backoff_delay(attempts: Column):
+    """
+    How long to wait after the failure that follows `attempts` earlier ones: the n-th failure waits
+    `:backoff_base` * 2^(n-1) seconds, capped at `:backoff_max`.
+    """
+    return literal_column("interval '1 second'") * func.least(
+        bindparam("backoff_max", type_=Float),
+        bindparam("backoff_base", type_=Float) * func.power(2, attempts),
+    )
+
+@asynccontextmanager
+async def renewing(session_factory, renew, parameters: Dict, interval: float):
+    """
+    Keep a lease while the block runs, by executing the `renew` statement every `interval` seconds.
+
+    Work that may outlast its lease, such as sending to a slow server, renews it at a fraction of its
+    length, so other workers do not take over work that is still in progress. A renewal that fails is
+    logged and tried again at the next interval.
+    """
+    async def keep():
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with session_factory() as session:
+                    await session.execute(renew, parameters)
+                    await session.commit()
+            except Exception:
+                logger.exception("Renewing a lease failed; retrying at the next interval")
+
+    task = asyncio.create_task(keep())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
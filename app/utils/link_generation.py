@@ -1,12 +1,25 @@
-from builtins import dict, int, max, str
-from typing import List, Callable
-from urllib.parse import urlencode
+from builtins import dict, int, len, max, str
+from typing import Dict, List, Callable, Tuple
+from urllib.parse import parse_qsl, urlencode
 from uuid import UUID
 
 from fastapi import Request
+from pydantic_core import Url
 from app.schemas.link_schema import Link
 from app.schemas.pagination_schema import PaginationLink
 
+_USER_ACTIONS = [
+    ("self", "get_user", "GET", "view"),
+    ("update", "update_user", "PUT", "update"),
+    ("delete", "delete_user", "DELETE", "delete")
+]
+_USER_ID_SLOT = "user-id-slot"
+# Per user action: the href before and after the user ID, and a link validated once, which is copied
+# with each user's href. Kept by the base URL requests came in on, and bounded because the base URL
+# comes from the client's Host header.
+_user_link_templates: Dict[str, List[Tuple[str, str, Link]]] = {}
+_MAX_BASE_URLS = 32
+
 # Utility function to create a link
 def create_link(rel: str, href: str, method: str = "GET", action: str = None) -> Link:
     return Link(rel=rel, href=href, method=method, action=action)
@@ -14,24 +27,44 @@ def create_link(rel: str, href: str, method: str = "GET", action: str = None) ->
 def create_pagination_link(rel: str, base_url: str, params: dict) -> PaginationLink:
     # Ensure parameters are added in a specific order
     query_string = f"skip={params['skip']}&limit={params['limit']}"
-    return PaginationLink(rel=rel, href=f"{base_url}?{query_string}")
+    separator = "&" if "?" in base_url else "?"
+    return PaginationLink(rel=rel, href=f"{base_url}{separator}{query_string}")
+
+def _user_link_templates_for(request: Request) -> List[Tuple[str, str, Link]]:
+    """Resolve each user action's route once per base URL, normalized the way `HttpUrl` normalizes it."""
+    base_url = str(request.base_url)
+    templates = _user_link_templates.get(base_url)
+    if templates is None:
+        if len(_user_link_templates) >= _MAX_BASE_URLS:
+            _user_link_templates.clear()
+        templates = []
+        for rel, route, method, action in _USER_ACTIONS:
+            link = create_link(rel, str(request.url_for(route, user_id=_USER_ID_SLOT)), method, action)
+            before, after = str(link.href).split(_USER_ID_SLOT)
+            templates.append((before, after, link))
+        _user_link_templates[base_url] = templates
+    return templates
 
 def create_user_links(user_id: UUID, request: Request) -> List[Link]:
     """
     Generate navigation links for user actions.
+
+    Each href is filled into a template resolved once per route, and each link is copied from one
+    validated with the template instead of being validated again; a UUID never changes how its URL
+    is normalized, so the links equal validated ones.
     """
-    actions = [
-        ("self", "get_user", "GET", "view"),
-        ("update", "update_user", "PUT", "update"),
-        ("delete", "delete_user", "DELETE", "delete")
-    ]
+    user_id = str(user_id)
     return [
-        create_link(rel, str(request.url_for(action, user_id=str(user_id))), method, action_desc)
-        for rel, action, method, action_desc in actions
+        link.model_copy(update={"href": Url(f"{before}{user_id}{after}")})
+        for before, after, link in _user_link_templates_for(request)
     ]
 
 def generate_pagination_links(request: Request, skip: int, limit: int, total_items: int) -> List[PaginationLink]:
-    base_url = str(request.url)
+    # Links keep the request's other query parameters, such as `fields`, and replace skip and limit.
+    base_url, _, query = str(request.url).partition("?")
+    kept = [(key, value) for key, value in parse_qsl(query, keep_blank_values=True) if key not in ("skip", "limit")]
+    if kept:
+        base_url = f"{base_url}?{urlencode(kept)}"
     total_pages = (total_items + limit - 1) // limit
     links = [
         create_pagination_link("self", base_url, {'skip': skip, 'limit': limit}),
@@ -0,0 +1,204 @@
+"""
+Helpers for changing the schema of large, busy tables without blocking traffic.
+
+`create_index_concurrently` and `drop_index_concurrently` are drop-in replacements for
+`op.create_index` / `op.drop_index` inside Alembic migrations. They build or drop the index with
+`CONCURRENTLY`, which Postgres only allows outside a transaction, so they step out of the migration
+transaction with an autocommit block.
+
+`BatchBackfill` fills a new column in small batches. It walks the table in key order (keyset, not
+OFFSET), records its position in `migration_checkpoints` in the same statement as each batch, and
+pauses between batches. An interrupted backfill resumes where it stopped, and no single statement
+holds row locks for long.
+
+Example migration::
+
+    def upgrade() -> None:
+        op.add_column('users', sa.Column('nickname_lower', sa.String(50), nullable=True))
+        with op.get_context().autocommit_block():
+            BatchBackfill(
+                name='users.nickname_lower',
+                table='users',
+                set_sql='nickname_lower = lower(nickname)',
+                where_sql='nickname_lower IS NULL',
+            ).run(op.get_bind())
+        create_index_concurrently('ix_users_nickname_lower', 'users', ['nickname_lower'])
+"""
+
+from builtins import int, str
+import logging
+import time
+from typing import List, Optional
+from alembic import op
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+checkpoint_metadata = MetaData()
+migration_checkpoints = Table(
+    "migration_checkpoints", checkpoint_metadata,
+    Column("name", String(255), primary_key=True),
+    Column("last_key", String(255), nullable=True),
+    Column("rows_done", Integer, nullable=False, server_default="0"),
+    Column("updated_at", DateTime(timezone=True), server_default=func.now()),
+    Column("completed_at", DateTime(timezone=True), nullable=True),
+)
+
+def _drop_invalid_index(index_name: str):
+    """Drop an index left INVALID by an earlier, interrupted concurrent build."""
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().execute(text(
+        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": index_name}).scalar()
+    if invalid:
+        logger.warning(f"Dropping invalid index {index_name} before rebuilding it.")
+        op.drop_index(index_name, postgresql_concurrently=True, if_exists=True)
+
+def _partitions(table_name: str) -> Optional[List[str]]:
+    """The partitions of `table_name`, or None if it is not a partitioned table."""
+    if op.get_context().as_sql:
+        return None
+    bind = op.get_bind()
+    if bind.execute(text("SELECT relkind FROM pg_class WHERE relname = :name"), {"name": table_name}).scalar() != "p":
+        return None
+    return bind.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :name ORDER BY child.relname"
+    ), {"name": table_name}).scalars().all()
+
+def create_index_concurrently(index_name: str, table_name: str, columns: List, **kw):
+    """
+    Build an index without locking the table against writes; safe to re-run after a failure.
+
+    Takes the same arguments as `op.create_index` (e.g. `unique`, `postgresql_where`). Postgres cannot
+    build an index on a partitioned table concurrently, so for one the index is created on the parent
+    alone, built concurrently on each partition, and the partitions' indexes are attached to it.
+    """
+    partitions = _partitions(table_name)
+    if partitions is None:
+        with op.get_context().autocommit_block():
+            _drop_invalid_index(index_name)
+            op.create_index(index_name, table_name, columns, postgresql_concurrently=True, if_not_exists=True, **kw)
+        return
+    where = kw.get("postgresql_where")
+    op.execute(
+        f"CREATE {'UNIQUE ' if kw.get('unique') else ''}INDEX IF NOT EXISTS {index_name} "
+        f"ON ONLY {table_name} ({', '.join(columns)}){f' WHERE {where}' if where is not None else ''}"
+    )
+    for partition in partitions:
+        partition_index = f"{partition}_{index_name}"[:63]
+        with op.get_context().autocommit_block():
+            _drop_invalid_index(partition_index)
+            op.create_index(partition_index, partition, columns, postgresql_concurrently=True, if_not_exists=True, **kw)
+        op.execute(f"ALTER INDEX {index_name} ATTACH PARTITION {partition_index}")
+
+def drop_index_concurrently(index_name: str, table_name: str):
+    """Drop an index without locking the table against reads and writes (only briefly, for a partitioned table)."""
+    if _partitions(table_name) is not None:
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True, if_exists=True)
+
+class BatchBackfill:
+    """
+    Resumable, throttled backfill of one table, one keyset-ordered batch at a time.
+
+    Each batch is a single statement that picks the next `batch_size` keys after the checkpoint,
+    applies `set_sql` to those matching `where_sql`, and advances the checkpoint, so a batch and its
+    checkpoint are committed together even on an autocommit connection. Batches that cannot get
+    their row locks within `lock_timeout` are retried after a pause instead of queueing behind
+    live traffic.
+    """
+
+    def __init__(self, name: str, table: str, set_sql: str, where_sql: Optional[str] = None, key: str = "id",
+                 key_type: str = "uuid", batch_size: int = 1000, pause_seconds: float = 0.1,
+                 lock_timeout: str = "2s", max_retries: int = 10):
+        self.name = name
+        self.table = table
+        self.set_sql = set_sql
+        self.where_sql = where_sql
+        self.key = key
+        self.key_type = key_type
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.lock_timeout = lock_timeout
+        self.max_retries = max_retries
+
+    def _batch_statement(self, first: bool):
+        after = "" if first else f"WHERE {self.key} > CAST(CAST(:last_key AS text) AS {self.key_type})"
+        only = f"AND ({self.where_sql})" if self.where_sql else ""
+        return text(f"""
+            WITH batch AS (
+                SELECT {self.key} FROM {self.table} {after} ORDER BY {self.key} LIMIT :batch_size
+            ), updated AS (
+                UPDATE {self.table} AS t SET {self.set_sql}
+                FROM batch WHERE t.{self.key} = batch.{self.key} {only}
+                RETURNING 1
+            ), checkpoint AS (
+                INSERT INTO migration_checkpoints (name, last_key, rows_done, updated_at)
+                VALUES (:name, (SELECT CAST(batch.{self.key} AS text) FROM batch ORDER BY batch.{self.key} DESC LIMIT 1),
+                        (SELECT count(*) FROM updated), now())
+                ON CONFLICT (name) DO UPDATE SET
+                    last_key = COALESCE(EXCLUDED.last_key, migration_checkpoints.last_key),
+                    rows_done = migration_checkpoints.rows_done + EXCLUDED.rows_done,
+                    updated_at = now()
+                RETURNING last_key
+            )
+            SELECT (SELECT last_key FROM checkpoint), (SELECT count(*) FROM batch)
+        """)
+
+    def run(self, connection: Connection, max_batches: Optional[int] = None) -> int:
+        """
+        Backfill until the end of the table, or for at most `max_batches` batches.
+
+        :return: The total number of rows updated so far, across every run of this backfill.
+        """
+        migration_checkpoints.create(connection, checkfirst=True)
+        connection.execute(text(f"SET lock_timeout = '{self.lock_timeout}'"))
+        connection.commit()
+        checkpoint = connection.execute(
+            migration_checkpoints.select().where(migration_checkpoints.c.name == self.name)
+        ).first()
+        if checkpoint is not None and checkpoint.completed_at is not None:
+            logger.info(f"Backfill {self.name} already completed.")
+            return checkpoint.rows_done
+        last_key = checkpoint.last_key if checkpoint is not None else None
+
+        batches = 0
+        retries = 0
+        while max_batches is None or batches < max_batches:
+            params = {"name": self.name, "batch_size": self.batch_size, "last_key": last_key}
+            try:
+                last_key, scanned = connection.execute(self._batch_statement(last_key is None), params).one()
+                connection.commit()
+            except OperationalError as e:
+                connection.rollback()
+                retries += 1
+                if retries > self.max_retries:
+                    raise
+                logger.warning(f"Backfill {self.name} batch failed ({e.orig}); retrying.")
+                time.sleep(self.pause_seconds * 2 ** retries)
+                continue
+            retries = 0
+            batches += 1
+            if scanned < self.batch_size:
+                connection.execute(
+                    migration_checkpoints.update().where(migration_checkpoints.c.name == self.name)
+                    .values(completed_at=func.now())
+                )
+                connection.commit()
+                break
+            time.sleep(self.pause_seconds)
+
+        connection.execute(text("RESET lock_timeout"))
+        connection.commit()
+        return connection.execute(
+            migration_checkpoints.select().where(migration_checkpoints.c.name == self.name)
+        ).first().rows_done
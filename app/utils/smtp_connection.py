@@ -1,31 +1,129 @@
 # smtp_client.py
-from builtins import Exception, int, str
+from builtins import Exception, bool, float, int, list, str
+from collections import deque
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from settings.config import settings
 import logging
 
+class _Session:
+    """An open, authenticated SMTP connection and its usage so far."""
+
+    def __init__(self, smtp: smtplib.SMTP, generation: int):
+        self.smtp = smtp
+        self.generation = generation
+        self.opened_at = self.used_at = time.monotonic()
+        self.messages = 0
+
 class SMTPClient:
-    def __init__(self, server: str, port: int, username: str, password: str):
+    """
+    Sends emails over a pool of authenticated SMTP sessions that are reused across messages.
+
+    `send_email` blocks, so call it from a worker thread. At most `max_connections` messages are
+    sent to the server at once, each over an idle session when there is one. A session is closed
+    and replaced once it has sent `max_messages` messages or is `max_age` seconds old. A session
+    that has been idle for `health_check_after` seconds is checked with NOOP before it is reused.
+    If the server has dropped a reused session, the message is sent once more on a new session.
+    `close` closes the pooled sessions, but the client stays usable and pools new ones afterwards.
+    """
+
+    def __init__(self, server: str, port: int, username: str, password: str, max_connections: int = 4,
+                 max_messages: int = 100, max_age: float = 300.0, health_check_after: float = 30.0,
+                 use_tls: bool = True, timeout: float = 30.0):
         self.server = server
         self.port = port
         self.username = username
         self.password = password
+        self.max_messages = max_messages
+        self.max_age = max_age
+        self.health_check_after = health_check_after
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._generation = 0
 
-    def send_email(self, subject: str, html_content: str, recipient: str):
+    def _connect(self) -> _Session:
+        smtp = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
         try:
-            message = MIMEMultipart('alternative')
-            message['Subject'] = subject
-            message['From'] = self.username
-            message['To'] = recipient
-            message.attach(MIMEText(html_content, 'html'))
-
-            with smtplib.SMTP(self.server, self.port) as server:
-                server.starttls()  # Use TLS
-                server.login(self.username, self.password)
-                server.sendmail(self.username, recipient, message.as_string())
-            logging.info(f"Email sent to {recipient}")
-        except Exception as e:
-            logging.error(f"Failed to send email: {str(e)}")
+            if self.use_tls:
+                smtp.starttls()  # Use TLS
+            smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
             raise
+        return _Session(smtp, self._generation)
+
+    def _is_reusable(self, session: _Session) -> bool:
+        now = time.monotonic()
+        if session.messages >= self.max_messages or now - session.opened_at >= self.max_age:
+            return False
+        if now - session.used_at < self.health_check_after:
+            return True
+        try:
+            return session.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _close(self, session: _Session):
+        try:
+            session.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            session.smtp.close()
+
+    def _checkout(self) -> _Session:
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                return self._connect()
+            if self._is_reusable(session):
+                return session
+            self._close(session)
+
+    def send_email(self, subject: str, html_content: str, recipient: str):
+        message = MIMEMultipart('alternative')
+        message['Subject'] = subject
+        message['From'] = self.username
+        message['To'] = recipient
+        message.attach(MIMEText(html_content, 'html'))
+        with self._slots:
+            session = self._checkout()
+            try:
+                try:
+                    session.smtp.sendmail(self.username, recipient, message.as_string())
+                except smtplib.SMTPServerDisconnected:
+                    if session.messages == 0:
+                        raise
+                    session.smtp.close()
+                    session = self._connect()
+                    session.smtp.sendmail(self.username, recipient, message.as_string())
+            except Exception as e:
+                # The session may be mid-transaction; it is cheaper to replace it than to reason about it.
+                self._close(session)
+                logging.error(f"Failed to send email: {str(e)}")
+                raise
+            session.messages += 1
+            session.used_at = time.monotonic()
+            with self._lock:
+                keep = session.generation == self._generation
+                if keep:
+                    self._idle.append(session)
+            if not keep:
+                self._close(session)
+        logging.info(f"Email sent to {recipient}")
+
+    def close(self):
+        """
+        Close every idle session; sessions in use are closed when their message has been sent. Messages
+        sent after this open and pool new sessions as usual.
+        """
+        with self._lock:
+            self._generation += 1
+            sessions, self._idle = list(self._idle), deque()
+        for session in sessions:
+            self._close(session)
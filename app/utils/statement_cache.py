@@ -0,0 +1,46 @@
+from builtins import dict, int
+import threading
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+class StatementCacheStats:
+    """
+    Counts how often executed statements were served from SQLAlchemy's compiled-SQL cache.
+
+    SQLAlchemy already records, for every execution, whether the compiled form of the statement
+    came from the engine's cache; this class listens for executions and tallies that outcome.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {outcome: 0 for outcome in CacheStats}
+
+    def install(self, engine: AsyncEngine):
+        """Start counting executions on `engine`."""
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        with self._lock:
+            self._counts[context.cache_hit] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counts = {outcome: 0 for outcome in CacheStats}
+
+    def snapshot(self) -> dict:
+        """Return hit/miss counts and the hit ratio among cacheable executions."""
+        with self._lock:
+            hits = self._counts[CacheStats.CACHE_HIT]
+            misses = self._counts[CacheStats.CACHE_MISS]
+            uncached = sum(self._counts.values()) - hits - misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "uncached": uncached,
+            "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+statement_cache_stats = StatementCacheStats()
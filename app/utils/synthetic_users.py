@@ -0,0 +1,192 @@
+from builtins import BaseException, bool, dict, float, int, len, list, max, min, next, range, str, zip
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import asyncio
+import itertools
+import random
+import re
+from typing import List, Optional, Tuple
+import uuid
+from faker import Faker
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user_model import UserRole
+from app.utils.security import hash_password
+from settings.config import settings
+
+COLUMNS = (
+    "id", "nickname", "email", "first_name", "last_name", "bio", "profile_picture_url", "linkedin_profile_url",
+    "github_profile_url", "role", "is_professional", "professional_status_updated_at", "last_login_at",
+    "failed_login_attempts", "is_locked", "created_at", "updated_at", "verification_token", "email_verified",
+    "hashed_password",
+)
+
+# Unverified users are always ANONYMOUS; verifying an email promotes a user to AUTHENTICATED, and
+# a few are later made managers or admins.
+VERIFIED_ROLE_WEIGHTS = {UserRole.AUTHENTICATED: 0.95, UserRole.MANAGER: 0.04, UserRole.ADMIN: 0.01}
+
+_NOT_WORD = re.compile(r"\W")
+
+def synthetic_password(index: int) -> str:
+    """The plain-text password behind the `index`-th precomputed hash."""
+    return f"Synthetic${index}Password"
+
+class SyntheticUsers:
+    """
+    Generates realistic `users` rows fast enough to load millions of them.
+
+    Faker is only called up front, to fill pools of names, bios, domains and URLs; rows are then
+    assembled from the pools with a `random.Random` seeded per chunk, so chunks can be generated in
+    parallel processes and the same seed and chunk size yield the same rows (bar the bcrypt salts).
+    bcrypt is far too slow to run per row, so every user gets one of `password_count` precomputed
+    hashes of `synthetic_password(i)`. Nicknames and emails end with a per-run tag and the row index,
+    which keeps them unique within a run and, almost always, across runs.
+    """
+
+    def __init__(self, seed: Optional[int] = None, verified_ratio: float = 0.8, locked_ratio: float = 0.02,
+                 professional_ratio: float = 0.1, history_days: int = 730, pool_size: int = 1000,
+                 password_count: int = 16, bcrypt_rounds: int = 12, now: Optional[datetime] = None):
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        setup = random.Random(self.seed)
+        self.verified_ratio = verified_ratio
+        self.locked_ratio = locked_ratio
+        self.professional_ratio = professional_ratio
+        self.history_seconds = history_days * 86400
+        self.now = now or datetime.now(timezone.utc)
+        self.max_attempts = settings.max_login_attempts
+        self.tag = f"{setup.getrandbits(16):04x}"
+        faker = Faker()
+        faker.seed_instance(self.seed)
+        self.first_names = [faker.first_name() for _ in range(pool_size)]
+        self.last_names = [faker.last_name() for _ in range(pool_size)]
+        self.nickname_stems = {name: _NOT_WORD.sub("", name)[:8].lower() for name in self.first_names + self.last_names}
+        self.bios = [None] * pool_size + [faker.sentence(nb_words=12) for _ in range(pool_size)]
+        self.domains = list(dict.fromkeys(faker.free_email_domain() for _ in range(pool_size))) + ["example.com", "example.org"]
+        self.pictures = [faker.image_url() for _ in range(pool_size)]
+        with ThreadPoolExecutor(max_workers=min(password_count, 8)) as executor:
+            self.password_hashes = list(executor.map(
+                lambda index: hash_password(synthetic_password(index), bcrypt_rounds), range(password_count)
+            ))
+        self.roles = [role.name for role in VERIFIED_ROLE_WEIGHTS]
+        self.role_weights = list(VERIFIED_ROLE_WEIGHTS.values())
+
+    def rows(self, start: int, count: int) -> List[Tuple]:
+        """Build rows `start` to `start + count - 1`, as tuples in `COLUMNS` order."""
+        chunk_random = random.Random(f"{self.seed}:{start}")
+        rand = chunk_random.random
+        getrandbits = chunk_random.getrandbits
+        pick = lambda pool: pool[int(rand() * len(pool))]
+        role_thresholds = list(zip(itertools.accumulate(self.role_weights), self.roles))
+        max_attempts = self.max_attempts
+        now, history_seconds = self.now, self.history_seconds
+        rows = []
+        for index in range(start, start + count):
+            first_name, last_name = pick(self.first_names), pick(self.last_names)
+            nickname = f"{self.nickname_stems[first_name]}{self.nickname_stems[last_name]}_{self.tag}{index:x}"
+            age = rand() * history_seconds
+            created_at = now - timedelta(seconds=age)
+            verified = rand() < self.verified_ratio
+            locked = rand() < self.locked_ratio
+            professional = verified and rand() < self.professional_ratio
+            if verified:
+                draw = rand() * role_thresholds[-1][0]
+                role = next(role for threshold, role in role_thresholds if draw < threshold)
+            else:
+                role = "ANONYMOUS"
+            last_login_at = created_at + timedelta(seconds=rand() * age) if verified and rand() < 0.7 else None
+            rows.append((
+                uuid.UUID(int=getrandbits(128), version=4),
+                nickname,
+                f"{nickname}@{pick(self.domains)}",
+                first_name,
+                last_name,
+                pick(self.bios),
+                pick(self.pictures) if rand() < 0.3 else None,
+                f"https://linkedin.com/in/{nickname}" if rand() < 0.2 else None,
+                f"https://github.com/{nickname}" if rand() < 0.15 else None,
+                role,
+                professional,
+                created_at + timedelta(seconds=rand() * age) if professional else None,
+                last_login_at,
+                max_attempts if locked else (1 + int(rand() * (max_attempts - 1)) if rand() < 0.05 else 0),
+                locked,
+                created_at,
+                last_login_at or created_at,
+                None if verified else f"{getrandbits(128):032x}",
+                verified,
+                pick(self.password_hashes),
+            ))
+        return rows
+
+_worker_users: Optional[SyntheticUsers] = None
+
+def _init_worker(users: SyntheticUsers):
+    global _worker_users
+    _worker_users = users
+
+def _worker_rows(start: int, count: int) -> List[Tuple]:
+    return _worker_users.rows(start, count)
+
+_SECONDARY_INDEXES = text("""
+    SELECT i.relname, pg_get_indexdef(i.oid)
+    FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+    WHERE x.indrelid = 'users'::regclass
+      AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid AND c.conrelid = x.indrelid)
+    ORDER BY i.relname
+""")
+
+async def copy_users(session: AsyncSession, users: SyntheticUsers, count: int, chunk_size: int = 50000,
+                     workers: int = 0, defer_indexes: bool = False, on_chunk=None) -> int:
+    """
+    COPY `count` generated users into `users`.
+
+    Chunks are generated ahead of the COPY: on `workers` processes, or on one thread when `workers`
+    is 0. Each chunk is committed on its own, unless `defer_indexes` is set: then the secondary
+    indexes are dropped, every chunk is copied and the indexes are rebuilt in one transaction, which
+    is several times faster on a large load and leaves the table untouched if anything fails.
+    `on_chunk(loaded)` is called after each chunk.
+
+    :return: The number of rows loaded.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(users,)) if workers else None
+
+    def generate(start: int):
+        size = min(chunk_size, count - start)
+        if executor is None:
+            return asyncio.ensure_future(asyncio.to_thread(users.rows, start, size))
+        return loop.run_in_executor(executor, _worker_rows, start, size)
+
+    starts = iter(range(0, count, chunk_size))
+    pending = deque(generate(start) for start in itertools.islice(starts, max(workers, 1)))
+    loaded = 0
+    try:
+        indexes = (await session.execute(_SECONDARY_INDEXES)).all() if defer_indexes else []
+        for name, _ in indexes:
+            await session.execute(text(f'DROP INDEX "{name}"'))
+        while pending:
+            records = await pending.popleft()
+            start = next(starts, None)
+            if start is not None:
+                pending.append(generate(start))
+            connection = await (await session.connection()).get_raw_connection()
+            await connection.driver_connection.copy_records_to_table("users", records=records, columns=COLUMNS)
+            if not defer_indexes:
+                await session.commit()
+            loaded += len(records)
+            if on_chunk is not None:
+                on_chunk(loaded)
+        for _, definition in indexes:
+            # A partitioned table's index is reported as ON ONLY, which would skip the partitions.
+            await session.execute(text(definition.replace(" ON ONLY ", " ON ", 1)))
+        await session.commit()
+    except BaseException:
+        await session.rollback()
+        for future in pending:
+            future.cancel()
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return loaded
@@ -1,12 +1,32 @@
 import markdown2
 from pathlib import Path
 import logging
+import re
+import secrets
+from string import Formatter
+
+# Values that match these come out of markdown2 exactly as they went in, so they can be substituted
+# into already-rendered HTML. Anything else (markup, entities, emphasis markers, line breaks, leading
+# or trailing spaces) is rendered the slow way, through markdown2, to keep the output identical.
+_VERBATIM_TEXT = re.compile(r"[^\W_](?:[^\W_]|[ ,.:;/?=%@'+-])*(?<! )")
+_VERBATIM_LINE_START = re.compile(r"[^\W_]+")  # at the start of a line, "1. " or "- " would start a list
+_VERBATIM_ATTRIBUTE = re.compile(r"[\w.~:/?#@!$+,;=%-]+")
+
+class _CompiledTemplate:
+    """A template rendered to styled HTML once, with a slot wherever a replacement field was."""
+
+    def __init__(self, mtimes: tuple, sources: tuple, parts: list, slots: list):
+        self.mtimes = mtimes
+        self.sources = sources  # header, body and footer markdown, for the slow path
+        self.parts = parts  # literal HTML around the slots, one more than there are slots; None if unusable
+        self.slots = slots  # (replacement field, pattern its value must match) per slot
 
 class TemplateManager:
     def __init__(self):
         """Initialize TemplateManager with project path configuration."""
         self.root_dir = Path(__file__).resolve().parent.parent.parent  # Adjust this based on project structure
         self.templates_dir = self.root_dir / 'email_templates'
+        self._compiled = {}
 
     def _read_template(self, filename: str) -> str:
         """Private method to read the content of a template file."""
@@ -21,6 +41,13 @@ class TemplateManager:
             logging.error(f"Error reading template: {e}")
             raise
 
+    def _mtimes(self, filenames: tuple) -> tuple:
+        try:
+            return tuple((self.templates_dir / filename).stat().st_mtime_ns for filename in filenames)
+        except FileNotFoundError as e:
+            logging.error(f"Template file not found: {e.filename}")
+            raise ValueError(f"Template file {Path(e.filename).name} not found.")
+
     def _apply_email_styles(self, html: str) -> str:
         """Apply inline CSS styles to the HTML for better email rendering compatibility."""
         styles = {
@@ -40,16 +67,63 @@ class TemplateManager:
                 styled_html = styled_html.replace(f'<{tag}>', f'<{tag} style="{style}">')
         return styled_html
 
+    def _compile(self, template_name: str, filenames: tuple) -> _CompiledTemplate:
+        """
+        Render the header, body and footer to styled HTML once, with a unique marker in place of each
+        replacement field of the body, then split the HTML at the markers.
+        """
+        mtimes = self._mtimes(filenames)
+        header, main_template, footer = sources = tuple(self._read_template(filename) for filename in filenames)
+        marker = f"tmplslot{secrets.token_hex(8)}n"
+        main_content, fields = [], []
+        for literal_text, field_name, format_spec, conversion in Formatter().parse(main_template):
+            main_content.append(literal_text)
+            if field_name is not None:
+                at_line_start = "".join(main_content).endswith("\n") or not "".join(main_content)
+                main_content.append(f"{marker}{len(fields)}x")
+                field = "{" + field_name + (f"!{conversion}" if conversion else "") + (f":{format_spec}" if format_spec else "") + "}"
+                fields.append((field, at_line_start))
+        html = self._apply_email_styles(markdown2.markdown(f"{header}\n{''.join(main_content)}\n{footer}"))
+
+        parts, slots, seen, position = [], [], [], 0
+        for match in re.finditer(rf"{marker}(\d+)x", html):
+            parts.append(html[position:match.start()])
+            field, at_line_start = fields[int(match.group(1))]
+            if html.rfind('<', 0, match.start()) > html.rfind('>', 0, match.start()):
+                slots.append((field, _VERBATIM_ATTRIBUTE))
+            else:
+                slots.append((field, _VERBATIM_LINE_START if at_line_start else _VERBATIM_TEXT))
+            seen.append(int(match.group(1)))
+            position = match.end()
+        parts.append(html[position:])
+        if sorted(seen) != list(range(len(fields))):
+            parts = None  # markdown2 dropped or repeated a field; always take the slow path
+        return _CompiledTemplate(mtimes, sources, parts, slots)
+
     def render_template(self, template_name: str, **context) -> str:
-        """Render a markdown template with given context and return styled HTML."""
-        header = self._read_template('header.md')
-        footer = self._read_template('footer.md')
+        """
+        Render a markdown template with given context and return styled HTML.
+
+        Each template is compiled once, and again whenever one of its files changes, so rendering is
+        usually just substituting the values into the compiled HTML.
+        """
+        filenames = ('header.md', f'{template_name}.md', 'footer.md')
+        compiled = self._compiled.get(template_name)
+        if compiled is None or compiled.mtimes != self._mtimes(filenames):
+            compiled = self._compiled[template_name] = self._compile(template_name, filenames)
+
+        if compiled.parts is not None:
+            values = [field.format(**context) for field, _ in compiled.slots]
+            if all(pattern.fullmatch(value) for value, (_, pattern) in zip(values, compiled.slots)):
+                html = [compiled.parts[0]]
+                for value, part in zip(values, compiled.parts[1:]):
+                    html += (value, part)
+                return ''.join(html)
 
-        # Read main template and format it with provided context
-        main_template = self._read_template(f'{template_name}.md')
+        header, main_template, footer = compiled.sources
+        # Some value would not survive markdown verbatim: format the markdown and render it in full
         main_content = main_template.format(**context)
 
         full_markdown = f"{header}\n{main_content}\n{footer}"
         html_content = markdown2.markdown(full_markdown)
         return self._apply_email_styles(html_content)
-    
\ No newline at end of file
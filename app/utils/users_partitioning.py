@@ -0,0 +1,105 @@
+from builtins import RuntimeError, int
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user_model import SYNC_LOOKUPS_FUNCTION, SYNC_LOOKUPS_TRIGGER, users_partition_ddl
+
+# The indexes that enforce email and nickname uniqueness while users is unpartitioned; the lookup
+# tables enforce it while users is partitioned, and these are kept as plain indexes.
+_LOOKUP_INDEXES = {"ix_users_email", "ix_users_nickname"}
+
+_PARTITION_COUNT = text("""
+    SELECT (SELECT count(*) FROM pg_inherits WHERE inhparent = partrelid)
+    FROM pg_partitioned_table WHERE partrelid = to_regclass('users')
+""")
+
+_PARTITIONS = text("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = 'users'::regclass")
+
+_SECONDARY_INDEXES = text("""
+    SELECT i.relname, pg_get_indexdef(i.oid)
+    FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+    WHERE x.indrelid = 'users'::regclass AND NOT x.indisprimary
+    ORDER BY i.relname
+""")
+
+_TRIGGERS = text("""
+    SELECT tgname, pg_get_triggerdef(oid) FROM pg_trigger
+    WHERE tgrelid = 'users'::regclass AND NOT tgisinternal AND tgname <> 'users_sync_lookups'
+    ORDER BY tgname
+""")
+
+async def users_partition_count(session: AsyncSession) -> int:
+    """The number of hash partitions of the users table in the database; 0 if it is not partitioned."""
+    return await session.scalar(_PARTITION_COUNT) or 0
+
+async def check_users_partitioning(session: AsyncSession, expected: int):
+    """
+    Raise RuntimeError unless users is partitioned in the database exactly when `expected` (the
+    USERS_PARTITION_COUNT setting) asks for it, since the model reads and writes the two layouts
+    differently: only a partitioned users table has the email and nickname lookup tables.
+    """
+    count = await users_partition_count(session)
+    if (count > 0) != (expected > 0):
+        layout = f"hash-partitioned into {count}" if count else "not partitioned"
+        raise RuntimeError(
+            f"The users table is {layout}, but USERS_PARTITION_COUNT is {expected}. Set it to match the "
+            f"database, or change the database with `python -m app.cli.partition_users {expected}`."
+        )
+
+async def repartition_users(session: AsyncSession, count: int) -> int:
+    """
+    Rebuild users hash-partitioned by id into `count` partitions, or unpartitioned for 0, and return
+    the partition count it had before. Does nothing if it already has `count` partitions.
+
+    The new table copies the columns, defaults and constraints of the current one, so it follows the
+    schema the migrations have built so far. Rows are copied before the triggers are recreated, which
+    keeps every row's change_seq; indexes and triggers are then rebuilt from their definitions, and
+    email and nickname uniqueness moves between the unique indexes and the lookup tables. Runs in the
+    session's transaction, under an exclusive lock on users, and is not committed.
+    """
+    previous = await users_partition_count(session)
+    if previous == count:
+        return previous
+    await session.execute(text("LOCK TABLE users IN ACCESS EXCLUSIVE MODE"))
+    indexes = (await session.execute(_SECONDARY_INDEXES)).all()
+    triggers = (await session.execute(_TRIGGERS)).all()
+    partitions = (await session.execute(_PARTITIONS)).scalars().all()
+    for name, _ in indexes:
+        await session.execute(text(f'DROP INDEX "{name}"'))
+    await session.execute(text("ALTER TABLE users RENAME TO users_old"))
+    await session.execute(text("ALTER TABLE users_old RENAME CONSTRAINT users_pkey TO users_old_pkey"))
+    for partition in partitions:  # frees the names for the new partitions
+        await session.execute(text(f'ALTER TABLE "{partition}" RENAME TO "{partition}_old"'))
+    await session.execute(text(
+        "CREATE TABLE users (LIKE users_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS, "
+        "CONSTRAINT users_pkey PRIMARY KEY (id))" + (" PARTITION BY HASH (id)" if count else "")
+    ))
+    for statement in users_partition_ddl(count):
+        await session.execute(text(statement))
+    # Same columns in the same order.
+    await session.execute(text("INSERT INTO users SELECT * FROM users_old"))
+    await session.execute(text("DROP TABLE users_old"))
+
+    if count and not previous:
+        await session.execute(text("CREATE TABLE user_emails (email varchar(255) PRIMARY KEY, user_id uuid NOT NULL)"))
+        await session.execute(text("CREATE TABLE user_nicknames (nickname varchar(50) PRIMARY KEY, user_id uuid NOT NULL)"))
+        await session.execute(text("INSERT INTO user_emails SELECT email, id FROM users"))
+        await session.execute(text("INSERT INTO user_nicknames SELECT nickname, id FROM users"))
+    elif previous and not count:
+        await session.execute(text("DROP TABLE user_emails, user_nicknames"))
+        await session.execute(text("DROP FUNCTION users_sync_lookups()"))
+
+    for name, definition in indexes:
+        # A partitioned table's index is reported as ON ONLY, which would skip the partitions.
+        definition = definition.replace(" ON ONLY ", " ON ", 1)
+        if name in _LOOKUP_INDEXES:
+            definition = definition.replace("CREATE UNIQUE INDEX", "CREATE INDEX", 1)
+            if not count:
+                definition = definition.replace("CREATE INDEX", "CREATE UNIQUE INDEX", 1)
+        await session.execute(text(definition))
+    for _, definition in triggers:
+        await session.execute(text(definition))
+    if count:
+        await session.execute(SYNC_LOOKUPS_FUNCTION)
+        await session.execute(SYNC_LOOKUPS_TRIGGER)
+    await session.execute(text("ANALYZE users"))
+    return previous
@@ -0,0 +1,81 @@
+"""
+Benchmark: email throughput of `EmailService` and `SMTPClient` against a local SMTP stand-in.
+
+The stand-in is the minimal SMTP server the tests use (tests/smtp_stand_in.py), run in-process on
+its own thread and event loop, so it competes with the client only for the GIL. It can add latency
+before its greeting, to stand in for the TCP and TLS setup of a remote server, and before
+acknowledging each message. Two workloads are driven through the real rendering and SMTP code:
+
+- verification: `EmailService.send_verification_email`, what the email dispatcher sends;
+- bulk:         `EmailService.send_templated_email` with the announcement template, what campaigns send.
+
+Each reports messages per second, p50/p99 latency per message and the connections and logins the
+server saw. `--max-messages 1` opens a session per message, as `SMTPClient` used to.
+
+Usage:
+    python -m benchmarks.bench_email --messages 2000 --concurrency 4 --connect-latency-ms 50
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+from app.services.email_service import EmailService
+from app.utils.smtp_connection import SMTPClient
+from app.utils.template_manager import TemplateManager
+from tests.smtp_stand_in import SMTPStandIn
+
+def _user(index: int):
+    return SimpleNamespace(id=uuid.uuid4(), first_name=f"User{index}", email=f"user{index}@example.com",
+                           verification_token=uuid.uuid4().hex)
+
+async def _drive(send, messages: int, concurrency: int):
+    """Send `messages` emails with at most `concurrency` in flight; returns (elapsed, sorted latencies in ms)."""
+    latencies = []
+    slots = asyncio.Semaphore(concurrency)
+    async def timed(index):
+        async with slots:
+            start = time.perf_counter()
+            await send(index)
+            latencies.append((time.perf_counter() - start) * 1000)
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(index) for index in range(messages)))
+    return time.perf_counter() - start, sorted(latencies)
+
+async def main(messages: int, concurrency: int, connections: int, max_messages: int, connect_latency_ms: float,
+               message_latency_ms: float, workloads):
+    workload_sends = {
+        "verification": lambda service: lambda index: service.send_verification_email(_user(index)),
+        "bulk": lambda service: lambda index: service.send_templated_email(
+            "Spring update", "announcement",
+            {"message": "We have shipped dark mode.", "name": f"User{index}", "nickname": f"user{index}", "email": f"user{index}@example.com"},
+        ),
+    }
+    print(f"{'workload':<13} {'msgs/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'sessions':>9} {'logins':>7}")
+    for workload in workloads:
+        stand_in = SMTPStandIn(connect_latency_ms / 1000, message_latency_ms / 1000)
+        port = stand_in.serve_in_background()
+        service = EmailService(template_manager=TemplateManager())
+        service.smtp_client = SMTPClient("127.0.0.1", port, "bench@example.com", "secret", max_connections=connections,
+                                         max_messages=max_messages, use_tls=False)
+        send = workload_sends[workload](service)
+        await _drive(send, min(messages, 50), concurrency)  # warm up: compile templates, open sessions
+        sessions, logins = stand_in.sessions, stand_in.logins
+        elapsed, latencies = await _drive(send, messages, concurrency)
+        service.smtp_client.close()
+        print(f"{workload:<13} {messages / elapsed:>8.0f} {latencies[len(latencies) // 2]:>8.2f} "
+              f"{latencies[int(len(latencies) * 0.99)]:>8.2f} {stand_in.sessions - sessions:>9} {stand_in.logins - logins:>7}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4, help="Messages in flight at once")
+    parser.add_argument("--connections", type=int, default=4, help="SMTPClient max_connections")
+    parser.add_argument("--max-messages", type=int, default=100, help="SMTPClient max_messages per session; 1 reconnects for every message")
+    parser.add_argument("--connect-latency-ms", type=float, default=0.0, help="Delay before the server greets a new connection")
+    parser.add_argument("--message-latency-ms", type=float, default=0.0, help="Delay before the server acknowledges a message")
+    parser.add_argument("--workload", choices=["verification", "bulk"], action="append", help="Repeatable; default: both")
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.concurrency, args.connections, args.max_messages, args.connect_latency_ms,
+                     args.message_latency_ms, args.workload or ["verification", "bulk"]))
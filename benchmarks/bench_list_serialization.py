@@ -0,0 +1,77 @@
+"""
+Benchmark: turning a page of `User` rows into the `GET /users/` response body.
+
+- before: `UserResponse.model_validate` per user, a validated `UserListResponse`, then FastAPI's
+          `response_model` handling (dump, validate again, serialize) and `JSONResponse` rendering;
+- after:  one `UserResponseList.validate_python` call for the page and `pydantic_core.to_json` straight
+          to bytes, as `list_users` now does.
+
+No database is involved: the rows are in-memory `User` instances, so only validation and
+serialization are timed. Both paths are checked to produce identical bytes.
+
+Usage:
+    python -m benchmarks.bench_list_serialization --iterations 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timezone
+from fastapi.routing import serialize_response
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+from app.main import app
+from app.models.user_model import User, UserRole
+from app.schemas.user_schemas import UserListResponse, UserResponse, UserResponseList
+
+def _users(count: int):
+    return [
+        User(id=uuid.uuid4(), nickname=f"user_{index}", email=f"user{index}@example.com", first_name="Jane", last_name="Doe",
+             bio="Experienced software developer specializing in web applications.",
+             profile_picture_url=f"https://example.com/profiles/{index}.jpg", linkedin_profile_url=f"https://linkedin.com/in/user{index}",
+             github_profile_url=f"https://github.com/user{index}", role=UserRole.AUTHENTICATED, is_professional=index % 2 == 0,
+             last_login_at=datetime(2026, 10, 19, 12, index % 60, tzinfo=timezone.utc), notification_delivery="immediate")
+        for index in range(count)
+    ]
+
+async def _before(users, response_field):
+    items = [UserResponse.model_validate(user) for user in users]
+    page = UserListResponse(items=items, total=10000, page=1, size=len(items))
+    content = await serialize_response(field=response_field, response_content=page, is_coroutine=True)
+    return JSONResponse(content).body
+
+async def _after(users, response_field):
+    items = UserResponseList.validate_python(users, from_attributes=True)
+    return to_json(UserListResponse.model_construct(items=items, total=10000, page=1, size=len(items)))
+
+async def _latencies(call, users, response_field, iterations):
+    for _ in range(5):
+        await call(users, response_field)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call(users, response_field)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.fmean(samples), samples[len(samples) // 2], samples[int(len(samples) * 0.99)]
+
+async def main(iterations: int, sizes):
+    response_field = next(route for route in app.routes if getattr(route, "name", None) == "list_users").response_field
+    print(f"{'page size':>9} {'path':<7} {'mean us':>10} {'p50 us':>10} {'p99 us':>10} {'speedup':>8}")
+    for size in sizes:
+        users = _users(size)
+        assert await _before(users, response_field) == await _after(users, response_field)
+        before = await _latencies(_before, users, response_field, iterations)
+        after = await _latencies(_after, users, response_field, iterations)
+        for path, (mean, p50, p99) in (("before", before), ("after", after)):
+            speedup = f"{before[1] / p50:.1f}x" if path == "after" else ""
+            print(f"{size:>9} {path:<7} {mean:>10.1f} {p50:>10.1f} {p99:>10.1f} {speedup:>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.sizes))
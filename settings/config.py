@@ -40,6 +40,65 @@ class Settings(BaseSettings):
     smtp_port: int = Field(default=2525, description="SMTP port for sending emails")
     smtp_username: str = Field(default='your-mailtrap-username', description="Username for SMTP server")
     smtp_password: str = Field(default='your-mailtrap-password', description="Password for SMTP server")
+    smtp_use_tls: bool = Field(default=True, description="Upgrade SMTP connections with STARTTLS before logging in")
+    smtp_max_connections: int = Field(default=4, description="Most SMTP sessions open, and messages being sent, at once")
+    smtp_max_messages_per_connection: int = Field(default=100, description="Messages sent over one SMTP session before it is replaced")
+    smtp_connection_max_age_seconds: float = Field(default=300.0, description="Seconds an SMTP session is kept before it is replaced")
+    smtp_health_check_after_seconds: float = Field(default=30.0, description="Idle seconds after which an SMTP session is checked with NOOP before reuse")
+    # Bulk API limits
+    batch_get_max_ids: int = Field(default=200, description="Maximum number of user IDs accepted by a single batch lookup")
+    bulk_update_chunk_size: int = Field(default=1000, description="Rows updated per statement (and transaction) by bulk admin operations")
+    import_chunk_size: int = Field(default=1000, description="Rows validated, COPYed and merged per transaction by the bulk user import")
+    import_hash_workers: int = Field(default=4, description="Threads hashing passwords during a bulk user import")
+    export_batch_size: int = Field(default=1000, description="Rows fetched from the server-side cursor and encoded per chunk by the user export")
+    user_fast_path_enabled: bool = Field(default=True, description="Serve hot user lookups and logins through raw asyncpg instead of the ORM")
+    users_partition_count: int = Field(default=0, description="Hash partitions of the users table; 0 keeps it unpartitioned. Partition the database with `python -m app.cli.partition_users`; the app refuses to start if only one of the two is partitioned")
+    # Audit trail writer
+    audit_batch_size: int = Field(default=100, description="Audit events written per multi-row INSERT")
+    audit_flush_interval_ms: int = Field(default=250, description="Longest time an audit event waits in memory before it is written")
+    audit_queue_size: int = Field(default=10000, description="Audit events buffered in memory before recording blocks")
+    # Background purge of soft-deleted and never-verified users
+    purge_enabled: bool = Field(default=False, description="Run the background purger that archives dead user rows")
+    purge_interval_seconds: int = Field(default=300, description="Seconds between purge runs")
+    purge_batch_size: int = Field(default=500, description="Rows tombstoned or archived per purge batch")
+    purge_batch_pause_seconds: float = Field(default=0.5, description="Pause between purge batches, to rate-limit the purger")
+    purge_unverified_after_days: int = Field(default=30, description="Days after which never-verified users are tombstoned")
+    purge_tombstone_grace_hours: int = Field(default=24, description="Hours a tombstoned user stays in the users table before it is archived")
+    # Login history
+    login_events_batch_size: int = Field(default=200, description="Login events written per multi-row INSERT")
+    login_events_flush_interval_ms: int = Field(default=250, description="Longest time a login event waits in memory before it is written")
+    login_events_queue_size: int = Field(default=10000, description="Login events buffered in memory before recording blocks")
+    login_events_retention_months: int = Field(default=12, description="Months of login history kept, the current month included; older partitions are dropped")
+    login_events_months_ahead: int = Field(default=2, description="Future monthly partitions of login_events created ahead of time")
+    login_events_maintenance_interval_seconds: int = Field(default=3600, description="Seconds between login_events partition maintenance runs")
+    # Outbound webhooks
+    webhook_poll_interval_seconds: float = Field(default=1.0, description="Seconds the webhook dispatcher waits when no deliveries are due")
+    webhook_claim_size: int = Field(default=500, description="Due deliveries claimed by the webhook dispatcher per round")
+    webhook_batch_size: int = Field(default=50, description="Events sent to an endpoint in a single POST")
+    webhook_lease_seconds: int = Field(default=60, description="Seconds a claimed delivery is hidden from other dispatchers before it may be retried")
+    webhook_max_attempts: int = Field(default=8, description="Failed attempts after which a delivery is moved to the dead-letter table")
+    webhook_backoff_base_seconds: float = Field(default=5.0, description="Retry delay after the first failure; doubled after each further failure")
+    webhook_backoff_max_seconds: float = Field(default=3600.0, description="Longest retry delay between webhook attempts")
+    webhook_timeout_seconds: float = Field(default=10.0, description="Timeout of a single webhook POST")
+    webhook_max_connections: int = Field(default=100, description="Connections in the shared webhook HTTP pool, across all endpoints")
+    # Email outbox
+    email_poll_interval_seconds: float = Field(default=1.0, description="Seconds the email dispatcher waits when no emails are due")
+    email_claim_size: int = Field(default=100, description="Due emails claimed by the email dispatcher per round")
+    email_max_concurrency: int = Field(default=4, description="Emails the dispatcher sends at once")
+    email_lease_seconds: int = Field(default=120, description="Seconds a claimed email is hidden from other dispatchers before it may be retried")
+    email_max_attempts: int = Field(default=6, description="Failed attempts after which an email is given up on")
+    email_backoff_base_seconds: float = Field(default=30.0, description="Retry delay after the first failure; doubled after each further failure")
+    email_backoff_max_seconds: float = Field(default=3600.0, description="Longest retry delay between email attempts")
+    # Email campaigns
+    campaign_poll_interval_seconds: float = Field(default=2.0, description="Seconds the campaign runner waits when no campaign is running")
+    campaign_batch_size: int = Field(default=500, description="Most recipients taken per campaign batch")
+    campaign_batch_seconds: float = Field(default=10.0, description="Batches hold at most this many seconds of sending at the campaign's rate, which bounds how long pausing takes")
+    campaign_lease_seconds: int = Field(default=120, description="Seconds a campaign is leased to a runner; renewed every third of that while a batch is being sent")
+    campaign_max_concurrency: int = Field(default=4, description="Campaign emails rendered and sent at once")
+    # Notification digests
+    notification_digest_window_seconds: int = Field(default=3600, description="A digest user's notifications are emailed together once the oldest is this many seconds old")
+    notification_digest_poll_interval_seconds: float = Field(default=30.0, description="Seconds the notification digester waits when no digest is due")
+    notification_digest_batch_size: int = Field(default=100, description="Most users whose digests are queued per round")
 
 
     class Config:
@@ -8,6 +8,7 @@ Fixtures:
 - `async_client`: Manages an asynchronous HTTP client for testing interactions with the FastAPI application.
 - `db_session`: Handles database transactions to ensure a clean database state for each test.
 - User fixtures (`user`, `locked_user`, `verified_user`, etc.): Set up various user states to test different behaviors under diverse conditions.
+- `session_factory`: Provides the testing sessionmaker for code that opens its own sessions.
 - `token`: Generates an authentication token for testing secured endpoints.
 - `initialize_database`: Prepares the database at the session start.
 - `setup_database`: Sets up and tears down the database before and after each test.
@@ -31,7 +32,7 @@ from faker import Faker
 from app.main import app
 from app.database import Base, Database
 from app.models.user_model import User, UserRole
-from app.dependencies import get_db, get_settings
+from app.dependencies import get_db, get_session_factory, get_settings
 from app.utils.security import hash_password
 from app.utils.template_manager import TemplateManager
 from app.services.email_service import EmailService
@@ -59,6 +60,7 @@ def email_service():
 async def async_client(db_session):
     async with AsyncClient(app=app, base_url="http://testserver") as client:
         app.dependency_overrides[get_db] = lambda: db_session
+        app.dependency_overrides[get_session_factory] = lambda: AsyncTestingSessionLocal
         try:
             yield client
         finally:
@@ -90,6 +92,11 @@ async def db_session(setup_database):
         finally:
             await session.close()
 
+@pytest.fixture(scope="function")
+def session_factory(setup_database):
+    """Session factory for code that opens its own sessions, such as background workers."""
+    return AsyncTestingSessionLocal
+
 @pytest.fixture(scope="function")
 async def locked_user(db_session):
     unique_email = fake.email()
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+
+class SMTPStandIn:
+    """
+    A minimal SMTP server that accepts any AUTH and every message, and records sessions, logins and messages.
+
+    It can wait `connect_latency` seconds before its greeting, to stand in for the TCP and TLS setup of a
+    remote server, and `message_latency` seconds before acknowledging each message. Serve `handle` with
+    `asyncio.start_server` on the test's loop, or call `serve_in_background` to run it on its own thread.
+    """
+
+    def __init__(self, connect_latency: float = 0, message_latency: float = 0):
+        self.connect_latency = connect_latency
+        self.message_latency = message_latency
+        self.sessions = 0
+        self.logins = 0
+        self.noops = 0
+        self.messages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.writers = []
+
+    async def handle(self, reader, writer):
+        self.sessions += 1
+        self.writers.append(writer)
+        await asyncio.sleep(self.connect_latency)
+        writer.write(b"220 stand-in ESMTP\r\n")
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith("EHLO"):
+                writer.write(b"250-stand-in\r\n250 AUTH PLAIN\r\n")
+            elif command.startswith("AUTH"):
+                self.logins += 1
+                writer.write(b"235 Authentication successful\r\n")
+            elif command == "NOOP":
+                self.noops += 1
+                writer.write(b"250 OK\r\n")
+            elif command == "DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                data = b""
+                while (chunk := await reader.readline()) != b".\r\n":
+                    data += chunk
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(self.message_latency)
+                self.in_flight -= 1
+                self.messages.append(data)
+                writer.write(b"250 OK\r\n")
+            elif command == "QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:  # MAIL, RCPT, RSET
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+    def drop_sessions(self):
+        for writer in self.writers:
+            writer.close()
+
+    def serve_in_background(self) -> int:
+        """Start serving on a daemon thread with its own event loop; returns the port."""
+        started = threading.Event()
+        def run():
+            loop = asyncio.new_event_loop()
+            server = loop.run_until_complete(asyncio.start_server(self.handle, "127.0.0.1", 0))
+            self.port = server.sockets[0].getsockname()[1]
+            started.set()
+            loop.run_forever()
+        threading.Thread(target=run, daemon=True).start()
+        started.wait()
+        return self.port
@@ -1,9 +1,16 @@
+import json
 import pytest
 from httpx import AsyncClient
 from app.main import app
 from app.utils.nickname_gen import generate_nickname
 from app.services.jwt_service import decode_token, create_access_token
 from urllib.parse import urlencode
+from uuid import uuid4
+from app.dependencies import get_settings
+from fastapi.routing import serialize_response
+from starlette.responses import JSONResponse
+from app.schemas.user_schemas import UserListResponse, UserResponse
+from app.services.user_service import UserService
 
 # Fixtures for tokens
 @pytest.fixture
@@ -129,3 +136,313 @@ async def test_list_users_unauthorized(async_client, user_token):
     headers = {"Authorization": f"Bearer {user_token}"}
     response = await async_client.get("/users/", headers=headers)
     assert response.status_code == 403  # Forbidden
+
+@pytest.mark.asyncio
+async def test_batch_get_users_preserves_order_and_reports_missing(async_client, admin_user, verified_user, admin_token):
+    """Test that a batch lookup returns users in request order and lists unknown IDs."""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    payload = {"ids": [str(verified_user.id), missing_id, str(admin_user.id)]}
+    response = await async_client.post("/users/batch-get", json=payload, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [str(verified_user.id), str(admin_user.id)]
+    assert data["missing"] == [missing_id]
+
+@pytest.mark.asyncio
+async def test_batch_get_users_returns_stored_preferences(async_client, db_session, verified_user, admin_token):
+    """Test that a batch lookup returns each user's stored professional status and notification delivery."""
+    verified_user.is_professional = True
+    verified_user.notification_delivery = "digest"
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.post("/users/batch-get", json={"ids": [str(verified_user.id)]}, headers=headers)
+    assert response.status_code == 200
+    item = response.json()["items"][0]
+    assert item["is_professional"] is True
+    assert item["notification_delivery"] == "digest"
+
+@pytest.mark.asyncio
+async def test_batch_get_users_rejects_oversized_batch(async_client, admin_token):
+    """Test that a batch larger than the configured limit is rejected."""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    payload = {"ids": [str(uuid4()) for _ in range(get_settings().batch_get_max_ids + 1)]}
+    response = await async_client.post("/users/batch-get", json=payload, headers=headers)
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_batch_get_users_unauthorized(async_client, user_token):
+    """Test that a non-admin cannot batch lookup users."""
+    headers = {"Authorization": f"Bearer {user_token}"}
+    response = await async_client.post("/users/batch-get", json={"ids": [str(uuid4())]}, headers=headers)
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_bulk_lock_users_by_ids(async_client, admin_token, users_with_same_role_50_users):
+    """Test that an admin can lock a list of users in one request."""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    ids = [str(user.id) for user in users_with_same_role_50_users[:10]]
+    response = await async_client.post("/users/bulk-update", json={"operation": "lock", "ids": ids}, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"operation": "lock", "affected": 10}
+
+@pytest.mark.asyncio
+async def test_bulk_set_role_requires_admin(async_client, manager_user):
+    """Test that managers cannot change roles in bulk."""
+    manager_token = create_access_token(data={"sub": str(manager_user.id), "role": "MANAGER"})
+    headers = {"Authorization": f"Bearer {manager_token}"}
+    payload = {"operation": "set_role", "role": "ADMIN", "ids": [str(manager_user.id)]}
+    response = await async_client.post("/users/bulk-update", json=payload, headers=headers)
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_bulk_update_requires_single_target(async_client, admin_token):
+    """Test that a bulk update must name either IDs or a filter, not both."""
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    payload = {"operation": "lock", "ids": [str(uuid4())], "filter": {"is_locked": False}}
+    response = await async_client.post("/users/bulk-update", json=payload, headers=headers)
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_list_audit_events_as_admin(async_client, admin_token, session_factory, verified_user):
+    """Test that admins can page through the audit trail, newest first."""
+    from app.services.audit_service import AuditService, audit_writer
+    audit_writer.start(session_factory)
+    for _ in range(3):
+        await AuditService.record("user.updated", verified_user.id)
+    await audit_writer.stop()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    first_page = await async_client.get("/audit-events", params={"limit": 2}, headers=headers)
+    assert first_page.status_code == 200
+    data = first_page.json()
+    assert len(data["items"]) == 2
+    assert data["items"][0]["id"] > data["items"][1]["id"]
+
+    second_page = await async_client.get("/audit-events", params={"limit": 2, "before_id": data["next_before_id"]}, headers=headers)
+    assert len(second_page.json()["items"]) == 1
+    assert second_page.json()["next_before_id"] is None
+
+@pytest.mark.asyncio
+async def test_list_audit_events_requires_admin(async_client, manager_user):
+    """Test that managers cannot read the audit trail."""
+    manager_token = create_access_token(data={"sub": str(manager_user.id), "role": "MANAGER"})
+    response = await async_client.get("/audit-events", headers={"Authorization": f"Bearer {manager_token}"})
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_statement_cache_stats_as_admin(async_client, admin_token):
+    """Test that admins can read compiled-statement cache statistics."""
+    response = await async_client.get("/admin/statement-cache", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert set(response.json()) == {"hits", "misses", "uncached", "hit_ratio"}
+
+@pytest.mark.asyncio
+async def test_list_user_logins(async_client, verified_user, admin_token):
+    await async_client.post("/login/", data=urlencode({"username": verified_user.email, "password": "WrongPassword!"}),
+                            headers={"Content-Type": "application/x-www-form-urlencoded"})
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(f"/users/{verified_user.id}/logins", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["next_before_id"] is None
+
+@pytest.mark.asyncio
+async def test_list_user_logins_requires_manager(async_client, verified_user, user_token):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    response = await async_client.get(f"/users/{verified_user.id}/logins", headers=headers)
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_import_users_ndjson(async_client, admin_token):
+    body = '{"email": "imported@example.com", "password": "Imported$1234"}\n{"email": "bad"}\n'
+    headers = {"Authorization": f"Bearer {admin_token}", "Content-Type": "application/x-ndjson"}
+    response = await async_client.post("/users/import?format=ndjson", content=body, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["imported"] == 1
+    assert [error["line"] for error in response.json()["invalid"]] == [2]
+
+@pytest.mark.asyncio
+async def test_import_users_requires_admin(async_client, manager_user):
+    manager_token = create_access_token(data={"sub": str(manager_user.id), "role": "MANAGER"})
+    headers = {"Authorization": f"Bearer {manager_token}", "Content-Type": "text/csv"}
+    response = await async_client.post("/users/import", content="email,password\n", headers=headers)
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_export_users_ndjson(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}", "Accept-Encoding": "identity"}
+    response = await async_client.get("/users/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 51  # the 50 users plus the admin
+    assert "hashed_password" not in rows[0]
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+
+@pytest.mark.asyncio
+async def test_export_users_csv_gzip(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}", "Accept-Encoding": "gzip"}
+    response = await async_client.get("/users/export?format=csv", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    lines = response.text.splitlines()  # decompressed by the client
+    assert lines[0].startswith("id,nickname,email,")
+    assert len(lines) == 52
+
+@pytest.mark.asyncio
+async def test_export_users_honors_accept_encoding_q_values(async_client, admin_token):
+    encodings = {}
+    for accept_encoding in ("gzip;q=0", "gzip; q=0.0, identity", "*;q=0", "br", "br, *;q=0.5", "identity;q=1, GZIP;q=0.8"):
+        headers = {"Authorization": f"Bearer {admin_token}", "Accept-Encoding": accept_encoding}
+        response = await async_client.get("/users/export", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["vary"] == "Accept-Encoding"
+        encodings[accept_encoding] = response.headers.get("content-encoding")
+    assert encodings == {
+        "gzip;q=0": None, "gzip; q=0.0, identity": None, "*;q=0": None, "br": None,
+        "br, *;q=0.5": "gzip", "identity;q=1, GZIP;q=0.8": "gzip",
+    }
+
+@pytest.mark.asyncio
+async def test_export_users_requires_admin(async_client, user_token):
+    response = await async_client.get("/users/export", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_user_changes_feed(async_client, admin_user, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get("/users/changes?limit=1", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["has_more"] is True
+    cursor = response.json()["next_cursor"]
+
+    response = await async_client.get(f"/users/changes?since={cursor}", headers=headers)
+    assert len(response.json()["items"]) == 1
+    cursor = response.json()["next_cursor"]
+
+    await async_client.delete(f"/users/{verified_user.id}", headers=headers)
+    response = await async_client.get(f"/users/changes?since={cursor}", headers=headers)
+    assert response.json()["items"] == [{"id": str(verified_user.id), "deleted": True, "user": None}]
+
+@pytest.mark.asyncio
+async def test_user_changes_feed_rejects_bad_cursor(async_client, admin_token):
+    response = await async_client.get("/users/changes?since=nope", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_webhook_subscription_lifecycle(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    payload = {"url": "https://hooks.example.com/users", "events": ["user.created", "user.locked"], "max_concurrency": 2}
+    response = await async_client.post("/webhooks", json=payload, headers=headers)
+    assert response.status_code == 201
+    created = response.json()
+    assert created["events"] == ["user.created", "user.locked"]
+    assert len(created["secret"]) >= 16
+
+    response = await async_client.get("/webhooks", headers=headers)
+    assert [(item["id"], "secret" in item) for item in response.json()] == [(created["id"], False)]
+
+    response = await async_client.delete(f"/webhooks/{created['id']}", headers=headers)
+    assert response.status_code == 204
+    response = await async_client.delete(f"/webhooks/{created['id']}", headers=headers)
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_create_webhook_rejects_unknown_event(async_client, admin_token):
+    payload = {"url": "https://hooks.example.com/users", "events": ["user.exploded"]}
+    response = await async_client.post("/webhooks", json=payload, headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_webhooks_require_admin(async_client, manager_user):
+    manager_token = create_access_token(data={"sub": str(manager_user.id), "role": "MANAGER"})
+    response = await async_client.get("/webhooks/dead-letters", headers={"Authorization": f"Bearer {manager_token}"})
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_campaign_lifecycle(async_client, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    payload = {"name": "Launch", "subject": "We launched", "context": {"message": "Dark mode is here."}, "role": "AUTHENTICATED", "rate_per_second": 5}
+    response = await async_client.post("/campaigns", json=payload, headers=headers)
+    assert response.status_code == 201
+    created = response.json()
+    assert (created["status"], created["total"], created["sent_count"]) == ("running", 1, 0)
+
+    response = await async_client.post(f"/campaigns/{created['id']}/pause", headers=headers)
+    assert (response.status_code, response.json()["status"]) == (200, "paused")
+    response = await async_client.post(f"/campaigns/{created['id']}/pause", headers=headers)
+    assert response.status_code == 409
+    response = await async_client.post(f"/campaigns/{created['id']}/resume", headers=headers)
+    assert (response.status_code, response.json()["status"]) == (200, "running")
+    response = await async_client.get(f"/campaigns/{uuid4()}", headers=headers)
+    assert response.status_code == 404
+
+    response = await async_client.get(f"/campaigns/{created['id']}/recipients?status=failed", headers=headers)
+    assert response.json() == {"items": [], "next_after_user_id": None}
+
+@pytest.mark.asyncio
+async def test_create_campaign_rejects_unrenderable_template(async_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.post("/campaigns", json={"name": "Launch", "subject": "Hi", "template": "nope"}, headers=headers)
+    assert response.status_code == 400
+    response = await async_client.post("/campaigns", json={"name": "Launch", "subject": "Hi"}, headers=headers)
+    assert (response.status_code, response.json()["detail"]) == (400, "Template announcement needs a value for 'message'")
+
+# Test that the fast list path returns the same bytes as validating and serializing the response model
+@pytest.mark.asyncio
+async def test_list_users_body_matches_response_model(async_client, admin_token, db_session, users_with_same_role_50_users):
+    response = await async_client.get("/users/?skip=10&limit=25", headers={"Authorization": f"Bearer {admin_token}"})
+
+    users = await UserService.list_users(db_session, 10, 25)
+    page = UserListResponse(items=[UserResponse.model_validate(user) for user in users], total=await UserService.count(db_session), page=1, size=len(users))
+    route = next(route for route in app.routes if getattr(route, "name", None) == "list_users")
+    content = await serialize_response(field=route.response_field, response_content=page, is_coroutine=True)
+
+    # Assertions
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == JSONResponse(content).body
+
+# Test that a sparse fieldset narrows every user to the requested fields plus id, and links are opt-in
+@pytest.mark.asyncio
+async def test_list_users_sparse_fieldset(async_client, admin_token, users_with_same_role_50_users):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    sparse = (await async_client.get("/users/?limit=5&fields=nickname,profile_picture_url", headers=headers)).json()
+    full = (await async_client.get("/users/?limit=5", headers=headers)).json()
+    linked = (await async_client.get("/users/?skip=5&limit=5&fields=nickname&include=links", headers=headers)).json()
+
+    # Assertions
+    assert [set(item) for item in sparse["items"]] == [{"id", "nickname", "profile_picture_url"}] * 5
+    assert sparse["items"] == [{key: item[key] for key in ("nickname", "profile_picture_url", "id")} for item in full["items"]]
+    assert "links" not in sparse and "links" not in full
+    assert [[link["rel"] for link in item["links"]] for item in linked["items"]] == [["self", "update", "delete"]] * 5
+    assert linked["items"][0]["links"][0]["href"] == f"http://testserver/users/{linked['items'][0]['id']}"
+    next_link = next(link["href"] for link in linked["links"] if link["rel"] == "next")
+    assert next_link == "http://testserver/users/?fields=nickname&include=links&skip=10&limit=5"
+
+# Test that a single user can be fetched with a fieldset and links, and that unknown fields are rejected
+@pytest.mark.asyncio
+async def test_get_user_sparse_fieldset(async_client, admin_token, verified_user):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await async_client.get(f"/users/{verified_user.id}?fields=email&include=links", headers=headers)
+    bad_field = await async_client.get(f"/users/{verified_user.id}?fields=hashed_password", headers=headers)
+    bad_include = await async_client.get("/users/?include=roles", headers=headers)
+
+    # Assertions
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["id"], body["email"], set(body)) == (str(verified_user.id), verified_user.email, {"id", "email", "links"})
+    assert [link["action"] for link in body["links"]] == ["view", "update", "delete"]
+    assert (bad_field.status_code, bad_field.json()["detail"]) == (400, "Unknown fields: hashed_password")
+    assert bad_include.status_code == 400
+
+# Test that the email of a soft-deleted user cannot be reused before the user is purged
+@pytest.mark.asyncio
+async def test_create_user_with_deleted_users_email(async_client, admin_token, verified_user, email_service):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    await async_client.delete(f"/users/{verified_user.id}", headers=headers)
+    response = await async_client.post("/users/", json={"email": verified_user.email, "password": "AnotherPassword123!"}, headers=headers)
+
+    # Assertions
+    assert (response.status_code, response.json()["detail"]) == (400, "Email already exists")
@@ -0,0 +1,37 @@
+import asyncio
+import pytest
+from app.utils.background_worker import BackgroundWorker
+
+pytestmark = pytest.mark.asyncio
+
+class FlakyWorker(BackgroundWorker):
+    """Fails its first round the way a refused database connection does, then counts rounds."""
+
+    def __init__(self):
+        super().__init__()
+        self.rounds = 0
+
+    @property
+    def poll_interval(self) -> float:
+        return 0.01
+
+    async def run_once(self) -> bool:
+        self.rounds += 1
+        if self.rounds == 1:
+            raise ConnectionRefusedError("connection refused")
+        return False
+
+# Test that a round that raises is logged and retried, and the worker keeps running until stopped
+async def test_worker_survives_failed_rounds(caplog):
+    worker = FlakyWorker()
+    worker.start(session_factory=None)
+    for _ in range(100):
+        if worker.rounds >= 3:
+            break
+        await asyncio.sleep(0.01)
+
+    # Assertions
+    assert worker.is_running
+    assert "FlakyWorker round failed" in caplog.text and "ConnectionRefusedError" in caplog.text
+    await worker.stop()
+    assert not worker.is_running
@@ -0,0 +1,50 @@
+import pytest
+from app.database import Database
+from app.dependencies import get_email_service, get_settings
+from app.main import app
+from app.models.user_model import USERS_PARTITIONED
+from app.services.audit_service import audit_writer
+from app.services.campaign_service import campaign_runner
+from app.services.email_outbox_service import email_dispatcher
+from app.services.login_event_service import login_event_writer
+from app.services.notification_service import notification_digester
+from app.services.webhook_service import webhook_dispatcher
+
+pytestmark = pytest.mark.asyncio
+
+WORKERS = (audit_writer, login_event_writer, webhook_dispatcher, email_dispatcher, campaign_runner, notification_digester)
+
+# Test that settings and the email service are built once per process and shared with the container
+def test_settings_and_email_service_are_singletons():
+    assert get_settings() is get_settings()
+    assert get_email_service() is get_email_service()
+
+# Test that the lifespan starts every background worker, then stops them and disposes of the engine
+async def test_lifespan_starts_and_disposes_of_resources(setup_database):
+    try:
+        async with app.router.lifespan_context(app):
+            container = app.state.container
+            assert container.settings is get_settings()
+            assert container.email_service is get_email_service()
+            assert container.session_factory is Database.get_session_factory()
+            assert all(worker.is_running for worker in WORKERS)
+
+        # Assertions
+        assert not any(worker.is_running for worker in WORKERS)
+        with pytest.raises(ValueError):
+            Database.get_session_factory()
+    finally:
+        Database.initialize(get_settings().database_url)
+
+# Test that the app refuses to start when the users table is not laid out as the settings declare
+async def test_lifespan_fails_when_partitioning_does_not_match(setup_database, monkeypatch):
+    monkeypatch.setattr(get_settings(), "users_partition_count", 0 if USERS_PARTITIONED else 4)
+    try:
+        with pytest.raises(RuntimeError, match="USERS_PARTITION_COUNT"):
+            async with app.router.lifespan_context(app):
+                pass
+
+        # Assertions
+        assert not any(worker.is_running for worker in WORKERS)
+    finally:
+        Database.initialize(get_settings().database_url)
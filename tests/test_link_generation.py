@@ -5,6 +5,9 @@ from uuid import uuid4
 
 import pytest
 from fastapi import Request
+from starlette.requests import Request as StarletteRequest
+
+from app.main import app
 
 from app.utils.link_generation import create_link, create_pagination_link, create_user_links, generate_pagination_links
 
@@ -49,3 +52,22 @@ def test_generate_pagination_links(mock_request):
     assert len(links) >= 4
     expected_self_url = "http://testserver/users?limit=5&skip=10"
     assert normalize_url(str(links[0].href)) == normalize_url(expected_self_url), "Self link should match expected URL"
+
+# Test that user links built from precompiled templates equal links validated from url_for hrefs
+def test_user_links_equal_validated_links():
+    request = StarletteRequest({
+        "type": "http", "app": app, "router": app.router, "scheme": "http", "server": ("testserver", 80),
+        "root_path": "", "path": "/users/", "query_string": b"skip=20&limit=10", "headers": [],
+    })
+    user_id = uuid4()
+
+    expected_user_links = [
+        create_link(rel, str(request.url_for(route, user_id=str(user_id))), method, action)
+        for rel, route, method, action in [("self", "get_user", "GET", "view"), ("update", "update_user", "PUT", "update"), ("delete", "delete_user", "DELETE", "delete")]
+    ]
+
+    # Assertions
+    for _ in range(2):  # first from freshly resolved templates, then from cached ones
+        user_links = create_user_links(user_id, request)
+        assert [link.model_dump_json() for link in user_links] == [link.model_dump_json() for link in expected_user_links]
+        assert user_links == expected_user_links
@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import func, insert, select, text, update
+from app.models.email_outbox_model import EmailOutbox
+from app.models.user_model import User
+from app.utils.online_migrations import BatchBackfill, migration_checkpoints
+from tests.conftest import engine
+
+@pytest.fixture
+async def nulled_login_attempts(db_session, users_with_same_role_50_users):
+    await db_session.execute(update(User).values(failed_login_attempts=None))
+    await db_session.commit()
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(migration_checkpoints.drop, checkfirst=True)
+
+def _backfill(**kwargs):
+    return BatchBackfill(
+        name="users.failed_login_attempts", table="users", set_sql="failed_login_attempts = 0",
+        where_sql="failed_login_attempts IS NULL", batch_size=7, pause_seconds=0, **kwargs,
+    )
+
+async def _count_null(db_session):
+    return await db_session.scalar(select(func.count()).select_from(User).where(User.failed_login_attempts.is_(None)))
+
+@pytest.mark.asyncio
+async def test_backfill_walks_the_whole_table(db_session, nulled_login_attempts):
+    async with engine.connect() as conn:
+        assert await conn.run_sync(_backfill().run) == 50
+    assert await _count_null(db_session) == 0
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_from_its_checkpoint(db_session, nulled_login_attempts):
+    async with engine.connect() as conn:
+        assert await conn.run_sync(lambda sync_conn: _backfill().run(sync_conn, max_batches=3)) == 21
+    assert await _count_null(db_session) == 29
+
+    async with engine.connect() as conn:
+        assert await conn.run_sync(_backfill().run) == 50
+        checkpoint = (await conn.execute(select(migration_checkpoints))).one()
+        # A completed backfill is a no-op when run again.
+        assert await conn.run_sync(_backfill().run) == 50
+    assert checkpoint.completed_at is not None
+    assert await _count_null(db_session) == 0
+
+@pytest.mark.asyncio
+async def test_backfill_only_touches_rows_matching_the_filter(db_session, nulled_login_attempts):
+    await db_session.execute(text("UPDATE users SET failed_login_attempts = 3 WHERE nickname < 'm'"))
+    await db_session.commit()
+    untouched = await db_session.scalar(select(func.count()).select_from(User).where(User.failed_login_attempts == 3))
+    async with engine.connect() as conn:
+        assert await conn.run_sync(_backfill().run) == 50 - untouched
+    assert await db_session.scalar(select(func.count()).select_from(User).where(User.failed_login_attempts == 3)) == untouched
+
+# Test that integer keys are checkpointed by value, not in text order ('9' sorts after '10')
+@pytest.mark.asyncio
+async def test_backfill_checkpoints_integer_keys(db_session, nulled_login_attempts):
+    await db_session.execute(insert(EmailOutbox), [{"email_type": "email_verification", "recipient": f"user{index}@example.com", "context": {}} for index in range(12)])
+    await db_session.commit()
+    backfill = BatchBackfill(
+        name="email_outbox.attempts", table="email_outbox", set_sql="attempts = 1", key_type="bigint", batch_size=5, pause_seconds=0,
+    )
+    async with engine.connect() as conn:
+        assert await conn.run_sync(backfill.run) == 12
+        checkpoint = (await conn.execute(select(migration_checkpoints))).one()
+
+    # Assertions
+    assert int(checkpoint.last_key) == await db_session.scalar(select(func.max(EmailOutbox.id)))
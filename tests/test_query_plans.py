@@ -0,0 +1,190 @@
+"""
+Query-plan regression suite for `UserService`.
+
+The users table is seeded with `QUERY_PLAN_SCALE` synthetic users (20000 by default), then every
+statement each `UserService` operation issues is captured and run again under
+`EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`; the asyncpg fast-path statements are explained directly.
+The test fails when any of them scans `users` sequentially, and when the plan report, which lists
+each statement with its plan shape (node types, relations and indexes, without costs or timings),
+differs from the checked-in baseline in `tests/query_plans/`.
+
+After an intended plan change, regenerate the baseline and review its diff:
+
+    UPDATE_QUERY_PLANS=1 pytest tests/test_query_plans.py
+
+Parallel query is disabled while explaining, so reports do not depend on the machine's CPU count.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import difflib
+import json
+import os
+from pathlib import Path
+import re
+from unittest.mock import AsyncMock
+from asyncpg.exceptions import UniqueViolationError
+import pytest
+from sqlalchemy import event, select, text
+from app.models.user_model import User, UserRole
+from app.services.user_fast_path import UserFastPath
+from app.services.user_service import UserService
+from app.utils.security import verify_password
+from app.utils.synthetic_users import SyntheticUsers, copy_users, synthetic_password
+from settings.config import settings
+
+pytestmark = pytest.mark.slow
+
+SCALE = int(os.getenv("QUERY_PLAN_SCALE", "20000"))
+UPDATE = os.getenv("UPDATE_QUERY_PLANS") == "1"
+BASELINE = Path(__file__).parent / "query_plans" / (
+    f"user_service-{SCALE}" + (f"-p{settings.users_partition_count}" if settings.users_partition_count else "") + ".txt"
+)
+# Tables that are large in production and must never be read in full.
+LARGE_TABLES = re.compile(r"^(users|users_p\d+|user_emails|user_nicknames)$")
+
+@contextmanager
+def captured_statements(session):
+    """Collect the (statement, parameters) pairs `session` sends to the database."""
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        for params in (parameters if executemany else [parameters]):
+            statements.append((statement, tuple(params or ())))
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+def plan_shape(node, depth=0):
+    line = "  " * depth + node["Node Type"]
+    if "Subplan Name" in node:
+        line = f"{line} ({node['Subplan Name']})"
+    if "Relation Name" in node:
+        line += f" on {node['Relation Name']}"
+    if "Index Name" in node:
+        line += f" using {node['Index Name']}"
+    return [line] + [child for plan in node.get("Plans", []) for child in plan_shape(plan, depth + 1)]
+
+def sequential_scans(node):
+    scans = [node["Relation Name"]] if node["Node Type"] == "Seq Scan" and LARGE_TABLES.match(node["Relation Name"]) else []
+    return scans + [scan for plan in node.get("Plans", []) for scan in sequential_scans(plan)]
+
+async def explain(session, statement, parameters, analyze=True):
+    """
+    EXPLAIN one statement in a transaction that is rolled back, so writes leave no trace.
+
+    Statements that cannot run twice, like the INSERT of a user that now exists, are explained
+    without ANALYZE.
+    """
+    async with session.bind.connect() as connection:
+        raw = (await connection.get_raw_connection()).driver_connection
+        transaction = raw.transaction()
+        await transaction.start()
+        try:
+            await raw.execute("SET LOCAL max_parallel_workers_per_gather = 0")
+            options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+            output = await raw.fetchval(f"EXPLAIN ({options}) {statement}", *parameters)
+            # SQLAlchemy's connections decode json themselves; a plain asyncpg connection returns text.
+            [result] = json.loads(output) if isinstance(output, str) else output
+        except UniqueViolationError:
+            if not analyze:
+                raise
+            result = None
+        finally:
+            await transaction.rollback()
+    return result["Plan"] if result else await explain(session, statement, parameters, analyze=False)
+
+@pytest.fixture
+async def seeded_users(db_session):
+    users = SyntheticUsers(seed=40, pool_size=200, password_count=2, bcrypt_rounds=4, locked_ratio=0.05)
+    # Rebuilding the indexes in name order fixes their OIDs' order, which breaks the planner's ties
+    # between equally cheap indexes, like the primary key and ix_users_live_id.
+    await copy_users(db_session, users, SCALE, chunk_size=10000, defer_indexes=True)
+    async with db_session.bind.connect() as connection:
+        await (await connection.execution_options(isolation_level="AUTOCOMMIT")).execute(text("VACUUM ANALYZE users"))
+    return users
+
+async def _pick(session, *criteria) -> User:
+    return await session.scalar(select(User).where(User.deleted_at.is_(None), *criteria).order_by(User.id).limit(1))
+
+async def _cases(session, users: SyntheticUsers):
+    """(name, coroutine factory) for every UserService operation, and (name, SQL, args) for the fast path."""
+    verified = await _pick(session, User.email_verified.is_(True), User.is_locked.is_(False))
+    unverified = await _pick(session, User.email_verified.is_(False), User.is_locked.is_(False))
+    doomed = await _pick(session, User.id > verified.id)
+    some_ids = (await session.scalars(select(User.id).order_by(User.id).limit(50))).all()
+    password = next(
+        synthetic_password(index) for index in range(len(users.password_hashes))
+        if verify_password(synthetic_password(index), verified.hashed_password)
+    )
+    email_service = AsyncMock()
+    service_cases = [
+        ("get_by_id", lambda: UserService.get_by_id(session, verified.id)),
+        ("get_by_email", lambda: UserService.get_by_email(session, verified.email)),
+        ("get_by_nickname", lambda: UserService.get_by_nickname(session, verified.nickname)),
+        ("get_by_ids", lambda: UserService.get_by_ids(session, some_ids)),
+        ("list_users first page", lambda: UserService.list_users(session, 0, 10)),
+        ("list_users deep page", lambda: UserService.list_users(session, SCALE // 2, 10)),
+        ("list_users sparse fieldset", lambda: UserService.list_users(session, 0, 10, ("id", "nickname", "profile_picture_url"))),
+        ("count", lambda: UserService.count(session)),
+        ("list_changes", lambda: UserService.list_changes(session, 0, verified.id, 100)),
+        ("create", lambda: UserService.create(session, {"email": "plans@example.com", "password": "MySuperPassword$1234"}, email_service)),
+        ("update", lambda: UserService.update(session, verified.id, {"first_name": "Plan"})),
+        ("login_user success", lambda: UserService.login_user(session, verified.email, password)),
+        ("login_user failure", lambda: UserService.login_user(session, verified.email, "WrongPassword$1234")),
+        ("is_account_locked", lambda: UserService.is_account_locked(session, verified.email)),
+        ("verify_email_with_token", lambda: UserService.verify_email_with_token(session, unverified.email, unverified.verification_token)),
+        ("reset_password", lambda: UserService.reset_password(session, verified.id, "MyNewPassword$1234")),
+        ("unlock_user_account", lambda: UserService.unlock_user_account(session, verified.id)),
+        ("bulk_lock by ids", lambda: UserService.bulk_lock(session, some_ids[:10])),
+        ("bulk_set_role by filter", lambda: UserService.bulk_set_role(session, UserRole.MANAGER, filters={"role": UserRole.ADMIN})),
+        ("delete", lambda: UserService.delete(session, doomed.id)),
+    ]
+    fast_path_cases = [
+        ("fast path profile by id", UserFastPath._PROFILE_BY_ID, (verified.id,)),
+        ("fast path sparse profile by id", UserFastPath._profile_by_id_sparse(("id", "nickname", "profile_picture_url")), (verified.id,)),
+        ("fast path profile by email", UserFastPath._PROFILE_BY_EMAIL, (verified.email,)),
+        ("fast path credentials by email", UserFastPath._CREDENTIALS_BY_EMAIL, (verified.email,)),
+        ("fast path is locked by email", UserFastPath._IS_LOCKED_BY_EMAIL, (verified.email,)),
+        ("fast path login success", UserFastPath._RECORD_LOGIN_SUCCESS, (verified.id, datetime.now(timezone.utc))),
+        ("fast path login failure", UserFastPath._RECORD_LOGIN_FAILURE, (verified.id, settings.max_login_attempts)),
+    ]
+    return service_cases, fast_path_cases
+
+async def test_user_service_query_plans(db_session, seeded_users, monkeypatch):
+    # The fast path bypasses SQLAlchemy, so its statements are explained separately below.
+    monkeypatch.setattr("app.services.user_service.settings.user_fast_path_enabled", False)
+    service_cases, fast_path_cases = await _cases(db_session, seeded_users)
+    explained = []
+    for name, run in service_cases:
+        with captured_statements(db_session) as statements:
+            await run()
+        assert statements, f"{name} issued no statement"
+        explained.append((name, list({statement: parameters for statement, parameters in reversed(statements)}.items())[::-1]))
+    explained.extend((name, [(statement, parameters)]) for name, statement, parameters in fast_path_cases)
+
+    report = [f"# UserService query plans at {SCALE} users, users_partition_count={settings.users_partition_count}", ""]
+    failures = []
+    for name, statements in explained:
+        report.append(f"## {name}")
+        for statement, parameters in statements:
+            plan = await explain(db_session, statement, parameters)
+            report.append("-- " + " ".join(statement.split()))
+            report.extend(plan_shape(plan))
+            failures.extend(f"{name}: sequential scan on {table}" for table in sequential_scans(plan))
+        report.append("")
+    report = "\n".join(report)
+
+    if UPDATE:
+        BASELINE.parent.mkdir(exist_ok=True)
+        BASELINE.write_text(report)
+    assert BASELINE.exists(), f"No baseline {BASELINE.name}; rerun with UPDATE_QUERY_PLANS=1"
+    diff = "".join(difflib.unified_diff(
+        BASELINE.read_text().splitlines(keepends=True), report.splitlines(keepends=True), str(BASELINE), "actual",
+    ))
+
+    # Assertions
+    assert not failures, "\n".join(failures)
+    assert not diff, f"Query plans changed; rerun with UPDATE_QUERY_PLANS=1 if this is intended:\n{diff}"
@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError
+from app.models.audit_event_model import AuditEvent
+from app.models.user_model import UserRole
+from app.services.audit_service import AuditService, audit_writer
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+async def running_audit_writer(session_factory):
+    audit_writer.start(session_factory)
+    yield audit_writer
+    await audit_writer.stop()
+
+async def _count_events(db_session, action=None):
+    query = select(func.count()).select_from(AuditEvent)
+    if action:
+        query = query.where(AuditEvent.action == action)
+    result = await db_session.execute(query)
+    return result.scalar()
+
+# Test that bulk role changes are logged once per user, and flushed when the writer stops
+async def test_bulk_role_change_is_audited(db_session, running_audit_writer, users_with_same_role_50_users):
+    ids = [user.id for user in users_with_same_role_50_users[:5]]
+    await UserService.bulk_set_role(db_session, UserRole.MANAGER, ids, actor="admin@example.com")
+    await running_audit_writer.stop()
+
+    events = await AuditService.list_events(db_session, limit=10)
+
+    # Assertions
+    assert len(events) == 5
+    assert {event.target_user_id for event in events} == set(ids)
+    assert all(event.actor == "admin@example.com" and event.details == {"role": "MANAGER"} for event in events)
+
+# Test that a full batch is written without waiting for the flush interval
+async def test_writer_flushes_full_batch(db_session, running_audit_writer, monkeypatch):
+    monkeypatch.setattr(running_audit_writer, "flush_interval", 60)
+    for _ in range(running_audit_writer.max_batch_size):
+        await AuditService.record("user.updated")
+    for _ in range(50):
+        if await _count_events(db_session):
+            break
+        await asyncio.sleep(0.05)
+
+    # Assertions
+    assert await _count_events(db_session) == running_audit_writer.max_batch_size
+
+# Test that audit rows cannot be modified
+async def test_audit_events_are_append_only(db_session, running_audit_writer):
+    await AuditService.record("user.deleted")
+    await running_audit_writer.stop()
+
+    # Assertions
+    with pytest.raises(DBAPIError, match="append-only"):
+        await db_session.execute(text("DELETE FROM audit_events"))
+    await db_session.rollback()
+
+# Test that a database that cannot be reached loses one batch but does not stop the writer
+async def test_writer_survives_connection_errors(db_session, session_factory, caplog):
+    calls = []
+
+    def flaky_session_factory():
+        calls.append(None)
+        if len(calls) == 1:
+            raise ConnectionRefusedError("connection refused")
+        return session_factory()
+
+    audit_writer.start(flaky_session_factory)
+    try:
+        await AuditService.record("user.updated")
+        for _ in range(50):
+            if calls:
+                break
+            await asyncio.sleep(0.05)
+        await AuditService.record("user.deleted")
+    finally:
+        await audit_writer.stop()
+
+    # Assertions
+    assert "Failed to write 1 rows to audit_events" in caplog.text
+    assert await _count_events(db_session, "user.updated") == 0
+    assert await _count_events(db_session, "user.deleted") == 1
@@ -0,0 +1,120 @@
+import asyncio
+import time
+from unittest.mock import MagicMock
+import pytest
+from sqlalchemy import select
+from app.models.campaign_model import CampaignRecipient, CampaignStatus, RecipientStatus
+from app.models.user_model import User, UserRole
+from app.services.campaign_service import CampaignRunner, CampaignService
+from app.utils.synthetic_users import SyntheticUsers, copy_users
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+async def audience(db_session):
+    """The emails of the verified users among 120 synthetic ones."""
+    users = SyntheticUsers(seed=44, pool_size=50, password_count=1, bcrypt_rounds=4, verified_ratio=0.5)
+    await copy_users(db_session, users, 120)
+    return set((await db_session.scalars(select(User.email).where(User.email_verified.is_(True)))).all())
+
+@pytest.fixture
+def smtp(email_service):
+    email_service.smtp_client.send_email = MagicMock()
+    return email_service.smtp_client.send_email
+
+@pytest.fixture
+def runner(session_factory, email_service, monkeypatch):
+    monkeypatch.setattr("app.services.campaign_service.settings.campaign_batch_size", 20)
+    runner = CampaignRunner()
+    runner.open(session_factory, email_service)
+    return runner
+
+async def _create(db_session, email_service, **options):
+    return await CampaignService.create(
+        db_session, "Launch", "We launched", "announcement", {"message": "Dark mode is here."},
+        options.pop("role", None), options.pop("rate_per_second", 1000), email_service,
+    )
+
+async def _run(runner, batches=100):
+    for _ in range(batches):
+        if not await runner.run_batch():
+            return
+
+# Test that a campaign reaches every verified user once, in batches, and records each outcome
+async def test_campaign_sends_to_every_verified_user(db_session, email_service, smtp, runner, audience):
+    unlucky = sorted(audience)[0]
+    smtp.side_effect = lambda subject, html, recipient: (_ for _ in ()).throw(ConnectionError("refused")) if recipient == unlucky else None
+    campaign = await _create(db_session, email_service)
+
+    await _run(runner)
+
+    # Assertions
+    assert sorted(call.args[2] for call in smtp.call_args_list) == sorted(audience)
+    assert all(call.args[0] == "We launched" and "Dark mode is here." in call.args[1] for call in smtp.call_args_list)
+    campaign = await CampaignService.get(db_session, campaign.id)
+    assert (campaign.status, campaign.total, campaign.sent_count, campaign.failed_count) == (
+        CampaignStatus.COMPLETED.value, len(audience), len(audience) - 1, 1,
+    )
+    [failed] = await CampaignService.list_recipients(db_session, campaign.id, RecipientStatus.FAILED)
+    assert (failed.email, failed.last_error) == (unlucky, "ConnectionError: refused")
+
+# Test that a paused campaign is skipped, and resumes where it stopped, sending leftover pending recipients first
+async def test_pause_and_resume(db_session, email_service, smtp, runner, audience):
+    campaign = await _create(db_session, email_service)
+    assert await runner.run_batch()
+    assert (await CampaignService.pause(db_session, campaign.id)).status == CampaignStatus.PAUSED.value
+    assert await CampaignService.pause(db_session, campaign.id) is None
+
+    assert not await runner.run_batch()
+    assert smtp.call_count == 20
+
+    # A batch whose runner died before recording it is left pending
+    await db_session.execute(CampaignRecipient.__table__.update().values(status=RecipientStatus.PENDING.value))
+    await db_session.commit()
+    await CampaignService.resume(db_session, campaign.id)
+    await runner.run_batch()
+    assert smtp.call_count == 40
+    assert sorted(call.args[2] for call in smtp.call_args_list[20:]) == sorted(call.args[2] for call in smtp.call_args_list[:20])
+    await _run(runner)
+
+    # Assertions
+    campaign = await CampaignService.get(db_session, campaign.id)
+    assert (campaign.status, campaign.sent_count) == (CampaignStatus.COMPLETED.value, len(audience) + 20)
+    assert len({call.args[2] for call in smtp.call_args_list}) == len(audience)
+
+# Test that a campaign sends no faster than its rate, and only to the chosen role
+async def test_rate_and_role(db_session, email_service, smtp, runner, audience):
+    promoted = set((await db_session.scalars(select(User.email).where(User.email_verified.is_(True), User.role == UserRole.AUTHENTICATED).limit(10))).all())
+    await db_session.execute(User.__table__.update().where(User.email.in_(promoted)).values(role=UserRole.ADMIN.name))
+    await db_session.commit()
+    campaign = await _create(db_session, email_service, role=UserRole.ADMIN, rate_per_second=50)
+
+    started = time.monotonic()
+    await _run(runner)
+
+    # Assertions
+    assert time.monotonic() - started >= 9 / 50
+    sent = {call.args[2] for call in smtp.call_args_list}
+    assert promoted <= sent and len(sent) == (await CampaignService.get(db_session, campaign.id)).total
+
+# Test that a batch outlasting the lease keeps it, so a second runner cannot claim the campaign and resend
+async def test_slow_batch_keeps_its_lease(db_session, session_factory, email_service, smtp, runner, audience, monkeypatch):
+    monkeypatch.setattr("app.services.campaign_service.settings.campaign_batch_size", 4)
+    monkeypatch.setattr("app.services.campaign_service.settings.campaign_max_concurrency", 1)
+    monkeypatch.setattr("app.services.campaign_service.settings.campaign_lease_seconds", 1)
+    smtp.side_effect = lambda subject, html, recipient: time.sleep(0.4)
+    await _create(db_session, email_service)
+    rival = CampaignRunner()
+    rival.open(session_factory, email_service)
+
+    batch = asyncio.create_task(runner.run_batch())
+    rival_claims = []
+    while not batch.done():
+        await asyncio.sleep(0.2)
+        rival_claims.append(await rival.run_batch())
+
+    # Assertions
+    assert await batch
+    assert not any(rival_claims[:-1])  # the last claim may follow the batch and take the next one
+    recipients = [call.args[2] for call in smtp.call_args_list]
+    assert len(recipients) == len(set(recipients)) >= 4
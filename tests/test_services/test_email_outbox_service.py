@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock
+import pytest
+from sqlalchemy import select
+from app.models.email_outbox_model import EmailOutbox
+from app.services.email_outbox_service import EmailDispatcher, EmailOutboxService
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+def smtp(email_service):
+    email_service.smtp_client.send_email = MagicMock()
+    return email_service.smtp_client.send_email
+
+@pytest.fixture
+def dispatcher(session_factory, email_service):
+    dispatcher = EmailDispatcher()
+    dispatcher.open(session_factory, email_service)
+    return dispatcher
+
+async def _outbox(db_session):
+    query = select(EmailOutbox).order_by(EmailOutbox.id).execution_options(populate_existing=True)
+    return (await db_session.execute(query)).scalars().all()
+
+# Test that an email is queued only if the transaction that queues it commits
+async def test_emails_are_queued_with_the_change(db_session, email_service, smtp, user):
+    await email_service.queue_verification_email(db_session, user)
+    await db_session.rollback()
+    assert await _outbox(db_session) == []
+
+    created = await UserService.create(db_session, {"email": "outboxed@example.com", "password": "MySuperPassword$1234"}, email_service)
+
+    # Assertions
+    [queued] = await _outbox(db_session)
+    assert (queued.email_type, queued.recipient, queued.user_id) == ("email_verification", created.email, created.id)
+    assert queued.context["verification_url"].endswith(f"verify-email/{created.id}/{created.verification_token}")
+    smtp.assert_not_called()
+
+# Test that the dispatcher renders and sends due emails, then removes them from the outbox
+async def test_dispatch_sends_queued_emails(db_session, dispatcher, email_service, smtp, users_with_same_role_50_users):
+    for user in users_with_same_role_50_users[:5]:
+        await email_service.queue_verification_email(db_session, user)
+    await db_session.commit()
+
+    claimed = await dispatcher.dispatch_once()
+
+    # Assertions
+    assert claimed == 5
+    assert sorted(call.args[2] for call in smtp.call_args_list) == sorted(user.email for user in users_with_same_role_50_users[:5])
+    assert all(call.args[0] == "Verify Your Account" and "verify-email/" in call.args[1] for call in smtp.call_args_list)
+    assert await _outbox(db_session) == []
+    assert await dispatcher.dispatch_once() == 0
+
+# Test exponential backoff after SMTP failures, giving up after the last attempt, and retrying by hand
+async def test_failed_emails_back_off_then_give_up(db_session, dispatcher, email_service, smtp, user, monkeypatch):
+    monkeypatch.setattr("app.services.email_outbox_service.settings.email_max_attempts", 2)
+    smtp.side_effect = ConnectionRefusedError("SMTP server unavailable")
+    await email_service.queue_verification_email(db_session, user)
+    await db_session.commit()
+
+    await dispatcher.dispatch_once()
+    [queued] = await _outbox(db_session)
+    assert queued.attempts == 1
+    assert queued.last_error == "ConnectionRefusedError: SMTP server unavailable"
+    assert queued.next_attempt_at > queued.created_at
+    assert await dispatcher.dispatch_once() == 0  # not due yet
+
+    await db_session.execute(EmailOutbox.__table__.update().values(next_attempt_at=queued.created_at))
+    await db_session.commit()
+    await dispatcher.dispatch_once()
+
+    # Assertions
+    [failed] = await _outbox(db_session)
+    assert (failed.attempts, failed.next_attempt_at) == (2, None)
+    assert await EmailOutboxService.list_failed(db_session) == [failed]
+    assert await dispatcher.dispatch_once() == 0
+
+    smtp.side_effect = None
+    assert await EmailOutboxService.retry(db_session, failed.id)
+    assert await dispatcher.dispatch_once() == 1
+    assert await _outbox(db_session) == []
+    assert smtp.call_count == 3
@@ -0,0 +1,89 @@
+from datetime import date, datetime, timedelta, timezone
+import pytest
+from sqlalchemy import text
+from app.models.login_event_model import create_partitions, existing_partitions, partition_name
+from app.services.login_event_service import LoginEventService, login_event_writer
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+async def running_login_event_writer(session_factory):
+    login_event_writer.start(session_factory)
+    yield login_event_writer
+    await login_event_writer.stop()
+
+def _window():
+    now = datetime.now(timezone.utc)
+    return now - timedelta(days=1), now + timedelta(minutes=1)
+
+# Test that every login attempt is recorded, with the reason it failed
+async def test_login_attempts_are_recorded(db_session, running_login_event_writer, verified_user):
+    await UserService.login_user(db_session, verified_user.email, "wrongpassword")
+    await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+    await UserService.login_user(db_session, "nobody@example.com", "MySuperPassword$1234")
+    await running_login_event_writer.stop()
+
+    events = await LoginEventService.list_for_user(db_session, verified_user.id, *_window())
+
+    # Assertions
+    assert [(event.succeeded, event.failure_reason) for event in events] == [(True, None), (False, "bad_password")]
+    assert all(event.email == verified_user.email for event in events)
+
+# Test paging through a user's history with the (occurred_at, id) cursor
+async def test_list_for_user_pages_newest_first(db_session, running_login_event_writer, verified_user):
+    for _ in range(3):
+        await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+    await running_login_event_writer.stop()
+    since, until = _window()
+
+    first = await LoginEventService.list_for_user(db_session, verified_user.id, since, until, limit=2)
+    rest = await LoginEventService.list_for_user(db_session, verified_user.id, since, first[-1].occurred_at, first[-1].id, limit=2)
+
+    # Assertions
+    assert len(first) == 2 and len(rest) == 1
+    assert first[0].occurred_at >= first[1].occurred_at >= rest[0].occurred_at
+
+# Test that a time-bounded history query only reads the partition it covers
+async def test_history_query_prunes_partitions(db_session, verified_user):
+    since, until = _window()
+    since = max(since, until.replace(day=1, hour=0, minute=0, second=0, microsecond=0))
+    plan = await db_session.execute(
+        text("EXPLAIN SELECT * FROM login_events WHERE user_id = :user_id AND occurred_at >= :since AND occurred_at <= :until"),
+        {"user_id": verified_user.id, "since": since, "until": until},
+    )
+    plan = "\n".join(plan.scalars().all())
+
+    # Assertions
+    assert partition_name(since.date()) in plan
+    assert partition_name((since + timedelta(days=32)).date()) not in plan
+
+# Test that maintenance creates upcoming partitions and drops those past retention
+async def test_maintain_partitions(db_session, monkeypatch):
+    monkeypatch.setattr("app.services.login_event_service.settings.login_events_retention_months", 3)
+    today = datetime.now(timezone.utc).date()
+    expired = date(today.year - 1, today.month, 1)
+    await db_session.run_sync(lambda s: create_partitions(s.connection(), expired, 0))
+    await db_session.commit()
+
+    created, dropped = await LoginEventService.maintain_partitions(db_session)
+    partitions = await db_session.run_sync(lambda s: existing_partitions(s.connection()))
+
+    # Assertions
+    assert dropped == [partition_name(expired)]
+    assert partition_name(expired) not in partitions
+    assert set(created) <= set(partitions)
+    assert partition_name(today) in partitions
+
+# Test that an over-long login email is cut to fit, and a row the table rejects does not cost the rest of its batch
+async def test_bad_rows_do_not_drop_their_batch(db_session, running_login_event_writer, verified_user):
+    await LoginEventService.record("x" * 300 + "@example.com", False, failure_reason="no_user")
+    await login_event_writer.record(occurred_at=datetime.now(timezone.utc), user_id=verified_user.id, email=verified_user.email,
+                                    succeeded=False, failure_reason="x" * 51)
+    await LoginEventService.record(verified_user.email, True, verified_user.id)
+    await running_login_event_writer.stop()
+
+    emails = (await db_session.execute(text("SELECT email FROM login_events ORDER BY id"))).scalars().all()
+
+    # Assertions
+    assert emails == ["x" * 255, verified_user.email]
@@ -0,0 +1,69 @@
+from datetime import timedelta
+import pytest
+from sqlalchemy import select
+from app.models.email_outbox_model import EmailOutbox
+from app.models.notification_model import PendingNotification
+from app.models.user_model import User, UserRole
+from app.services.notification_service import NotificationService
+from app.services.user_service import UserService
+from app.utils.security import hash_password
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+async def audience(db_session):
+    """A verified user of each delivery preference, and an unverified one who wants digests."""
+    users = {
+        name: User(nickname=f"notified_{name}", email=f"{name}@example.com", first_name=name.title(), hashed_password=hash_password("MySuperPassword$1234"),
+                   role=UserRole.AUTHENTICATED, email_verified=verified, notification_delivery=delivery)
+        for name, verified, delivery in (("immediate", True, "immediate"), ("digest", True, "digest"), ("unverified", False, "digest"))
+    }
+    db_session.add_all(users.values())
+    await db_session.commit()
+    return users
+
+async def _all(db_session, model):
+    query = select(model).order_by(model.id).execution_options(populate_existing=True)
+    return (await db_session.execute(query)).scalars().all()
+
+# Test that a change emails users who want notifications right away and holds them for the others' digests
+async def test_changes_notify_by_preference(db_session, audience):
+    assert await UserService.bulk_set_role(db_session, UserRole.MANAGER, [user.id for user in audience.values()]) == 3
+
+    # Assertions
+    [email] = await _all(db_session, EmailOutbox)
+    assert (email.email_type, email.recipient, email.user_id) == ("notification", "immediate@example.com", audience["immediate"].id)
+    assert email.context == {"name": "Immediate", "message": "Your role is now MANAGER.", "email": "immediate@example.com"}
+    [pending] = await _all(db_session, PendingNotification)
+    assert (pending.user_id, pending.kind, pending.message) == (audience["digest"].id, "user.role_changed", "Your role is now MANAGER.")
+
+# Test that due notifications are coalesced into one digest email per user, and the rest wait for their window
+async def test_due_notifications_are_digested(db_session, audience, email_service):
+    digest_user = audience["digest"]
+    await UserService.bulk_lock(db_session, [digest_user.id])
+    await UserService.unlock_user_account(db_session, digest_user.id)
+    await UserService.bulk_update_professional_status(db_session, True, [digest_user.id])
+
+    assert await NotificationService.digest_due(db_session, timedelta(hours=1), 100) == 0
+    assert await NotificationService.digest_due(db_session, timedelta(0), 100) == 1
+
+    # Assertions
+    assert await _all(db_session, PendingNotification) == []
+    [digest] = await _all(db_session, EmailOutbox)
+    assert (digest.email_type, digest.recipient) == ("notification_digest", digest_user.email)
+    messages = [line.split(" UTC: ")[1] for line in digest.context["notifications"].splitlines()]
+    assert messages == ["Your account has been locked.", "Your account has been unlocked.", "Your professional status has been granted."]
+    html = email_service.template_manager.render_template("notification_digest", **digest.context)
+    assert html.count("<li") == 3
+
+# Test that users choose their delivery through a profile update
+async def test_delivery_preference_is_updated(db_session, audience):
+    user = audience["immediate"]
+
+    updated = await UserService.update(db_session, user.id, {"notification_delivery": "digest"})
+    await UserService.bulk_lock(db_session, [user.id])
+
+    # Assertions
+    assert updated.notification_delivery == "digest"
+    assert [pending.user_id for pending in await _all(db_session, PendingNotification)] == [user.id]
+    assert await _all(db_session, EmailOutbox) == []
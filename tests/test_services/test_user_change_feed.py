@@ -0,0 +1,53 @@
+import uuid
+import pytest
+from sqlalchemy import update
+from app.models.user_model import User
+from app.services.user_service import UserService
+from tests.conftest import engine
+
+pytestmark = pytest.mark.asyncio
+
+START = (-1, uuid.UUID(int=0))
+
+async def _changes_after(session, position, limit=100):
+    changes = await UserService.list_changes(session, *position, limit)
+    await session.commit()  # end the read snapshot, so the next poll sees newly settled changes
+    return changes
+
+async def test_feed_returns_changes_in_order_with_tombstones(db_session, users_with_same_role_50_users):
+    changes = await _changes_after(db_session, START)
+    assert len(changes) == 50
+    cursor = (changes[-1].change_seq, changes[-1].id)
+    assert await _changes_after(db_session, cursor) == []
+
+    first, second = users_with_same_role_50_users[:2]
+    await UserService.update(db_session, second.id, {"first_name": "Changed"})
+    await UserService.delete(db_session, first.id)
+
+    changes = await _changes_after(db_session, cursor)
+    assert [user.id for user in changes] == [second.id, first.id]
+    assert changes[0].first_name == "Changed"
+    assert changes[1].is_deleted
+
+async def test_feed_pages_with_limit(db_session, users_with_same_role_50_users):
+    seen = []
+    position = START
+    while page := await _changes_after(db_session, position, limit=15):
+        seen.extend(user.id for user in page)
+        position = (page[-1].change_seq, page[-1].id)
+    assert sorted(seen) == sorted(user.id for user in users_with_same_role_50_users)
+
+async def test_feed_waits_for_open_transactions(db_session, users_with_same_role_50_users):
+    changes = await _changes_after(db_session, START)
+    cursor = (changes[-1].change_seq, changes[-1].id)
+    slow_user, fast_user = users_with_same_role_50_users[:2]
+
+    async with engine.connect() as slow:
+        # This transaction takes its change sequence first but commits last.
+        await slow.execute(update(User).where(User.id == slow_user.id).values(bio="slow"))
+        await UserService.update(db_session, fast_user.id, {"bio": "fast"})
+        assert await _changes_after(db_session, cursor) == []
+        await slow.commit()
+
+    changes = await _changes_after(db_session, cursor)
+    assert [user.id for user in changes] == [slow_user.id, fast_user.id]
@@ -0,0 +1,32 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from app.schemas.user_import_schemas import UserFileFormat
+from app.services.user_export_service import EXPORT_COLUMNS, UserExportService
+
+pytestmark = pytest.mark.asyncio
+
+async def _collect(session_factory, format, compress):
+    return [chunk async for chunk in UserExportService.stream(session_factory, format, compress, batch_size=7)]
+
+# Test that the export is produced one cursor batch at a time
+async def test_export_streams_in_batches(session_factory, users_with_same_role_50_users):
+    chunks = await _collect(session_factory, UserFileFormat.NDJSON, False)
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+
+    # Assertions
+    assert len(chunks) == 8  # ceil(50 / 7)
+    assert {row["email"] for row in rows} == {user.email for user in users_with_same_role_50_users}
+    assert set(rows[0]) == set(EXPORT_COLUMNS)
+
+# Test that each gzip chunk is flushed, so the decompressed stream is valid CSV
+async def test_export_gzip_csv(session_factory, users_with_same_role_50_users):
+    chunks = await _collect(session_factory, UserFileFormat.CSV, True)
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(b"".join(chunks)).decode())))
+
+    # Assertions
+    assert all(chunks[:-1])
+    assert len(rows) == 50
+    assert rows[0]["role"] == users_with_same_role_50_users[0].role.value
@@ -0,0 +1,47 @@
+from builtins import range
+import pytest
+from app.dependencies import get_settings
+from app.models.user_model import UserRole
+from app.schemas.user_schemas import UserResponse
+from app.services.user_fast_path import UserFastPath
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.asyncio
+
+# Test that the fast path and the ORM path build the same response
+async def test_profile_matches_orm_path(db_session, verified_user, monkeypatch):
+    fast = await UserService.get_profile_by_id(db_session, verified_user.id)
+    monkeypatch.setattr("app.services.user_service.settings.user_fast_path_enabled", False)
+    orm = await UserService.get_profile_by_id(db_session, verified_user.id)
+
+    # Assertions
+    assert isinstance(fast, UserResponse)
+    assert fast.model_dump() == orm.model_dump()
+
+# Test that soft-deleted users are invisible to the fast path
+async def test_profile_skips_deleted_users(db_session, user):
+    await UserService.delete(db_session, user.id)
+
+    # Assertions
+    assert await UserService.get_profile_by_id(db_session, user.id) is None
+    assert await UserService.get_profile_by_email(db_session, user.email) is None
+
+# Test that a fast-path login returns a read-only record of the user
+async def test_fast_login_returns_user_record(db_session, verified_user):
+    logged_in = await UserService.login_user(db_session, verified_user.email, "MySuperPassword$1234")
+
+    # Assertions
+    assert logged_in.id == verified_user.id
+    assert logged_in.role is UserRole.AUTHENTICATED
+    assert verified_user.last_login_at is not None
+
+# Test that failed fast-path logins lock the account and keep loaded users in sync
+async def test_fast_login_failures_lock_account(db_session, verified_user):
+    for _ in range(get_settings().max_login_attempts):
+        assert await UserService.login_user(db_session, verified_user.email, "wrongpassword") is None
+
+    # Assertions
+    assert await UserFastPath.is_locked(db_session, verified_user.email)
+    assert verified_user.is_locked
+    refreshed_user = await UserService.get_by_id(db_session, verified_user.id)
+    assert refreshed_user.failed_login_attempts == get_settings().max_login_attempts
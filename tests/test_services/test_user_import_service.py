@@ -0,0 +1,73 @@
+import pytest
+from app.schemas.user_import_schemas import UserFileFormat
+from app.services.user_import_service import UserImportService
+from app.services.user_service import UserService
+from app.utils.security import hash_password, verify_password
+
+pytestmark = pytest.mark.asyncio
+
+PRE_HASHED = hash_password("AlreadyHashed$1", rounds=4)
+
+async def _stream(data: bytes, block_size: int = 7):
+    # Small blocks, so records are split across reads like a real request body.
+    for start in range(0, len(data), block_size):
+        yield data[start:start + block_size]
+
+# Test a CSV import covering every outcome, loaded over several chunks
+async def test_import_csv(db_session, user):
+    data = "\n".join([
+        "email,password,nickname,first_name",
+        f"alice@example.com,{PRE_HASHED},alice_import,Alice",
+        "bob@example.com,PlainPassword$1,,Bob",
+        "carol@example.com,,carol,Carol",
+        f"{user.email},PlainPassword$1,dave_import,Dave",
+        f"erin@example.com,{PRE_HASHED},alice_import,Erin",
+        f"alice@example.com,{PRE_HASHED},alice_again,Alice",
+    ]).encode()
+
+    result = await UserImportService.import_users(db_session, _stream(data), UserFileFormat.CSV, chunk_size=2)
+
+    # Assertions
+    assert (result.received, result.imported) == (6, 2)
+    assert [error.line for error in result.invalid] == [4]
+    assert [(conflict.line, conflict.reason) for conflict in result.conflicts] == [
+        (5, "email_taken"), (6, "nickname_taken"), (7, "email_taken"),
+    ]
+    alice = await UserService.get_by_email(db_session, "alice@example.com")
+    assert alice.hashed_password == PRE_HASHED and alice.nickname == "alice_import"
+    bob = await UserService.get_by_email(db_session, "bob@example.com")
+    assert verify_password("PlainPassword$1", bob.hashed_password)
+    assert bob.nickname and bob.email_verified is False and bob.verification_token
+
+# Test that rows colliding with existing users are set aside before repeats within a chunk are ranked
+async def test_import_ranks_repeats_after_existing_conflicts(db_session, user):
+    data = "\n".join([
+        "email,password,nickname",
+        f"grace@example.com,{PRE_HASHED},{user.nickname}",
+        f"grace@example.com,{PRE_HASHED},grace",
+        f"grace@example.com,{PRE_HASHED},grace_again",
+        f"heidi@example.com,{PRE_HASHED},heidi",
+        f"ivan@example.com,{PRE_HASHED},heidi",
+        f"ivan@example.com,{PRE_HASHED},ivan",
+    ]).encode()
+
+    result = await UserImportService.import_users(db_session, _stream(data), UserFileFormat.CSV)
+
+    # Assertions
+    assert (result.received, result.imported) == (6, 3)
+    assert [(conflict.line, conflict.reason) for conflict in result.conflicts] == [
+        (2, "nickname_taken"), (4, "duplicate_in_file"), (6, "duplicate_in_file"),
+    ]
+    assert (await UserService.get_by_email(db_session, "grace@example.com")).nickname == "grace"
+    assert (await UserService.get_by_email(db_session, "ivan@example.com")).nickname == "ivan"
+
+# Test that malformed NDJSON lines are reported without stopping the import
+async def test_import_ndjson(db_session):
+    data = b'{"email": "frank@example.com", "password": "' + PRE_HASHED.encode() + b'"}\n{not json}\n[1, 2]\n'
+
+    result = await UserImportService.import_users(db_session, _stream(data), UserFileFormat.NDJSON)
+
+    # Assertions
+    assert (result.received, result.imported) == (3, 1)
+    assert [error.line for error in result.invalid] == [2, 3]
+    assert await UserService.get_by_email(db_session, "frank@example.com") is not None
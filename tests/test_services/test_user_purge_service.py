@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import func, select
+from app.models.user_archive_model import UserArchive
+from app.models.user_model import User
+from app.services.user_purge_service import UserPurgeService
+from app.services.user_service import UserService
+
+pytestmark = pytest.mark.asyncio
+
+async def _count(db_session, model):
+    result = await db_session.execute(select(func.count()).select_from(model))
+    return result.scalar()
+
+# Test that a soft-deleted user is hidden but kept until it is purged
+async def test_soft_deleted_user_is_hidden(db_session, user):
+    assert await UserService.delete(db_session, user.id) is True
+
+    # Assertions
+    assert await UserService.get_by_id(db_session, user.id) is None
+    assert await UserService.count(db_session) == 0
+    assert await _count(db_session, User) == 1
+    assert await UserService.delete(db_session, user.id) is False
+
+# Test that tombstoned users past their grace period are archived in batches
+async def test_archive_tombstoned_users_in_batches(db_session, users_with_same_role_50_users, monkeypatch):
+    monkeypatch.setattr("app.services.user_purge_service.settings.purge_batch_size", 20)
+    monkeypatch.setattr("app.services.user_purge_service.settings.purge_batch_pause_seconds", 0)
+    for user in users_with_same_role_50_users[:45]:
+        await UserService.delete(db_session, user.id)
+
+    purged = await UserPurgeService.purge_once(db_session, now=datetime.now(timezone.utc) + timedelta(days=1, hours=1))
+
+    # Assertions
+    assert purged == 45
+    assert await _count(db_session, User) == 5
+    assert await _count(db_session, UserArchive) == 45
+
+# Test that long-unverified users are tombstoned first and kept through the grace period
+async def test_unverified_users_are_tombstoned_before_archival(db_session, unverified_user, verified_user):
+    unverified_user.created_at = datetime.now(timezone.utc) - timedelta(days=31)
+    verified_user.created_at = datetime.now(timezone.utc) - timedelta(days=31)
+    await db_session.commit()
+
+    await UserPurgeService.purge_once(db_session)
+
+    # Assertions
+    assert await UserService.get_by_id(db_session, unverified_user.id) is None
+    assert await UserService.get_by_id(db_session, verified_user.id) is not None
+    assert await _count(db_session, UserArchive) == 0
@@ -1,9 +1,11 @@
 from builtins import range
 import pytest
 from unittest.mock import AsyncMock
-from sqlalchemy import select
+from uuid import uuid4
+from sqlalchemy import func, select
 from app.dependencies import get_settings
-from app.models.user_model import User
+from app.models.email_outbox_model import EmailOutbox
+from app.models.user_model import User, UserRole
 from app.services.user_service import UserService
 
 pytestmark = pytest.mark.asyncio
@@ -22,7 +24,9 @@ async def test_create_user_with_valid_data(db_session, email_service):
     # Assertions
     assert user is not None
     assert user.email == user_data["email"]
-    email_service.send_verification_email.assert_called_once_with(user)  # Ensure the email sending was called
+    email_service.send_verification_email.assert_not_called()  # Sent later by the email dispatcher
+    queued = (await db_session.execute(select(EmailOutbox))).scalars().all()
+    assert [(email.email_type, email.recipient, email.user_id) for email in queued] == [("email_verification", user.email, user.id)]
 
 
 # Test creating a user with invalid data
@@ -54,6 +58,14 @@ async def test_get_by_id_user_does_not_exist(db_session):
     # Assertions
     assert retrieved_user is None
 
+# Test fetching several users by ID in one query
+async def test_get_by_ids(db_session, users_with_same_role_50_users):
+    wanted = users_with_same_role_50_users[:5]
+    retrieved_users = await UserService.get_by_ids(db_session, [user.id for user in wanted] + [uuid4()])
+
+    # Assertions
+    assert {user.id for user in retrieved_users} == {user.id for user in wanted}
+
 # Test fetching a user by nickname when the user exists
 async def test_get_by_nickname_user_exists(db_session, user):
     retrieved_user = await UserService.get_by_nickname(db_session, user.nickname)
@@ -203,4 +215,36 @@ async def test_unlock_user_account(db_session, locked_user):
     assert unlocked, "The account should be unlocked"
     refreshed_user = await UserService.get_by_id(db_session, locked_user.id)
     assert not refreshed_user.is_locked, "The user should no longer be locked"
-    
\ No newline at end of file
+    
+# Test bulk role changes by filter, walking the table in several chunks
+async def test_bulk_set_role_by_filter_in_chunks(db_session, users_with_same_role_50_users, monkeypatch):
+    monkeypatch.setattr("app.services.user_service.settings.bulk_update_chunk_size", 7)
+    affected = await UserService.bulk_set_role(db_session, UserRole.MANAGER, filters={"role": UserRole.AUTHENTICATED})
+
+    # Assertions
+    assert affected == 50
+    result = await db_session.execute(select(func.count()).select_from(User).filter_by(role=UserRole.MANAGER))
+    assert result.scalar() == 50
+
+# Test bulk unlock resets failed login attempts
+async def test_bulk_unlock_by_ids(db_session, locked_user):
+    affected = await UserService.bulk_unlock(db_session, [locked_user.id])
+
+    # Assertions
+    assert affected == 1
+    refreshed_user = await UserService.get_by_id(db_session, locked_user.id)
+    assert not refreshed_user.is_locked
+    assert refreshed_user.failed_login_attempts == 0
+
+# Test that a fieldset reads only its columns, through the fast path and the ORM alike
+@pytest.mark.parametrize("fast_path", [True, False])
+async def test_sparse_fieldsets(db_session, users_with_same_role_50_users, verified_user, monkeypatch, fast_path):
+    monkeypatch.setattr("app.services.user_service.settings.user_fast_path_enabled", fast_path)
+    fields = ("nickname", "id")
+
+    rows = await UserService.list_users(db_session, 0, 5, fields)
+    profile = await UserService.get_profile_by_id(db_session, verified_user.id, fields)
+
+    # Assertions
+    assert [tuple(row._fields) for row in rows] == [fields] * 5
+    assert profile.model_dump() == {"nickname": verified_user.nickname, "id": verified_user.id}
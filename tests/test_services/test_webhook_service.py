@@ -0,0 +1,134 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+import pytest
+from sqlalchemy import select
+from app.models.webhook_model import WebhookDeadLetter, WebhookDelivery
+from app.services.user_service import UserService
+from app.services.webhook_service import WebhookDispatcher, WebhookService, sign
+
+pytestmark = pytest.mark.asyncio
+
+class StandIn:
+    """A minimal keep-alive HTTP/1.1 server that records each request and answers with `status`."""
+
+    def __init__(self):
+        self.requests = []
+        self.connections = 0
+        self.status = 200
+        self.delay = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, value = line.decode().split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(self.delay)
+            self.in_flight -= 1
+            self.requests.append((headers, body))
+            writer.write(f"HTTP/1.1 {self.status} X\r\nContent-Length: 0\r\n\r\n".encode())
+            await writer.drain()
+        writer.close()
+
+@pytest.fixture
+async def stand_in():
+    endpoint = StandIn()
+    server = await asyncio.start_server(endpoint.handle, "127.0.0.1", 0)
+    endpoint.url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/hooks"
+    yield endpoint
+    server.close()
+
+@pytest.fixture
+async def dispatcher(session_factory):
+    dispatcher = WebhookDispatcher()
+    dispatcher.open(session_factory)
+    yield dispatcher
+    await dispatcher.stop()
+
+async def _pending(db_session):
+    return (await db_session.execute(select(WebhookDelivery).order_by(WebhookDelivery.id))).scalars().all()
+
+# Test that user changes queue an event per subscriber, in the same transaction
+async def test_user_changes_are_queued_for_subscribers(db_session, stand_in, user, email_service):
+    subscription = await WebhookService.create_subscription(db_session, stand_in.url, ["user.created", "user.deleted"])
+    await WebhookService.create_subscription(db_session, stand_in.url, ["user.locked"])
+    email_service.send_verification_email = AsyncMock(return_value=None)
+    created = await UserService.create(db_session, {"email": "hooked@example.com", "password": "MySuperPassword$1234"}, email_service)
+    await UserService.delete(db_session, user.id)
+
+    pending = await _pending(db_session)
+
+    # Assertions
+    assert [(row.subscription_id, row.event_type, row.user_id) for row in pending] == [
+        (subscription.id, "user.created", created.id), (subscription.id, "user.deleted", user.id),
+    ]
+    assert pending[0].payload["event"] == "user.created"
+    assert pending[0].payload["user_id"] == str(created.id)
+
+# Test that queued events are POSTed in one signed batch and removed once delivered
+async def test_dispatch_batches_and_signs(db_session, dispatcher, stand_in, users_with_same_role_50_users):
+    subscription = await WebhookService.create_subscription(db_session, stand_in.url, ["user.locked"])
+    locked = await UserService.bulk_lock(db_session, [user.id for user in users_with_same_role_50_users[:10]])
+
+    claimed = await dispatcher.dispatch_once()
+
+    # Assertions
+    assert claimed == locked == 10
+    [(headers, body)] = stand_in.requests
+    assert headers["x-webhook-signature"] == sign(subscription.secret, body)
+    deliveries = json.loads(body)["deliveries"]
+    assert {delivery["event"] for delivery in deliveries} == {"user.locked"}
+    assert len({delivery["id"] for delivery in deliveries}) == 10
+    assert await _pending(db_session) == []
+
+# Test that batches share pooled connections and respect the per-endpoint concurrency limit
+async def test_dispatch_limits_concurrency_per_endpoint(db_session, dispatcher, stand_in, users_with_same_role_50_users, monkeypatch):
+    monkeypatch.setattr("app.services.webhook_service.settings.webhook_batch_size", 5)
+    stand_in.delay = 0.05
+    await WebhookService.create_subscription(db_session, stand_in.url, ["user.deleted"], max_concurrency=2)
+    for user in users_with_same_role_50_users[:20]:
+        await UserService.delete(db_session, user.id)
+
+    await dispatcher.dispatch_once()
+
+    # Assertions
+    assert len(stand_in.requests) == 4
+    assert stand_in.max_in_flight == 2
+    assert stand_in.connections == 2
+
+# Test exponential backoff after failures and dead-lettering after the last attempt
+async def test_failed_deliveries_back_off_then_dead_letter(db_session, dispatcher, stand_in, user, monkeypatch):
+    monkeypatch.setattr("app.services.webhook_service.settings.webhook_max_attempts", 2)
+    stand_in.status = 503
+    await WebhookService.create_subscription(db_session, stand_in.url, ["user.deleted"])
+    await UserService.delete(db_session, user.id)
+
+    await dispatcher.dispatch_once()
+    [pending] = await _pending(db_session)
+    assert (pending.attempts, pending.last_error) == (1, "HTTP 503")
+    assert await dispatcher.dispatch_once() == 0  # not due yet
+
+    await db_session.execute(WebhookDelivery.__table__.update().values(next_attempt_at=pending.created_at))
+    await db_session.commit()
+    await dispatcher.dispatch_once()
+
+    # Assertions
+    assert await _pending(db_session) == []
+    [dead] = (await db_session.execute(select(WebhookDeadLetter))).scalars().all()
+    assert (dead.id, dead.attempts, dead.event_type, dead.user_id) == (pending.id, 2, "user.deleted", user.id)
+
+    stand_in.status = 200
+    assert await WebhookService.replay_dead_letter(db_session, dead.id)
+    await dispatcher.dispatch_once()
+    assert len(stand_in.requests) == 3
+    assert (await db_session.execute(select(WebhookDeadLetter))).scalars().all() == []
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from app.utils.smtp_connection import SMTPClient
+from tests.smtp_stand_in import SMTPStandIn
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+async def smtp_stand_in():
+    stand_in = SMTPStandIn()
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    stand_in.port = server.sockets[0].getsockname()[1]
+    yield stand_in
+    server.close()
+
+def _client(stand_in, **options):
+    return SMTPClient("127.0.0.1", stand_in.port, "sender@example.com", "secret", use_tls=False, timeout=5, **options)
+
+async def _send(client, count, offset=0):
+    await asyncio.gather(*(
+        asyncio.to_thread(client.send_email, "Hello", f"<p>message {index}</p>", f"user{index}@example.com")
+        for index in range(offset, offset + count)
+    ))
+
+# Test that one authenticated session carries many messages, and is replaced after max_messages
+async def test_sessions_are_reused(smtp_stand_in):
+    client = _client(smtp_stand_in, max_connections=1, max_messages=4)
+
+    for index in range(10):
+        await _send(client, 1, index)
+    await asyncio.to_thread(client.close)
+
+    # Assertions
+    assert len(smtp_stand_in.messages) == 10
+    assert b"message 9" in smtp_stand_in.messages[-1]
+    assert smtp_stand_in.sessions == smtp_stand_in.logins == 3
+
+# Test that concurrent sends are capped at max_connections sessions
+async def test_concurrency_is_capped(smtp_stand_in):
+    smtp_stand_in.message_latency = 0.05
+    client = _client(smtp_stand_in, max_connections=2)
+
+    await _send(client, 8)
+    await asyncio.to_thread(client.close)
+
+    # Assertions
+    assert len(smtp_stand_in.messages) == 8
+    assert smtp_stand_in.max_in_flight == 2
+    assert smtp_stand_in.sessions == 2
+
+# Test that idle sessions are health-checked, and ones the server dropped are replaced transparently
+async def test_idle_sessions_are_checked_and_replaced(smtp_stand_in):
+    checked = _client(smtp_stand_in, max_connections=1, health_check_after=0)
+    await _send(checked, 2)
+    assert (smtp_stand_in.sessions, smtp_stand_in.noops) == (1, 1)
+
+    unchecked = _client(smtp_stand_in, max_connections=1)
+    await _send(unchecked, 1)
+    smtp_stand_in.drop_sessions()
+    await asyncio.sleep(0.01)
+    await _send(unchecked, 1)
+
+    # Assertions
+    assert len(smtp_stand_in.messages) == 4
+    assert smtp_stand_in.sessions == 3
+
+# Test that closing the client drops its idle sessions but leaves it pooling new ones, as for a second lifespan
+async def test_client_pools_again_after_close(smtp_stand_in):
+    client = _client(smtp_stand_in, max_connections=1)
+    await _send(client, 2)
+    await asyncio.to_thread(client.close)
+
+    for index in range(3):
+        await _send(client, 1, index)
+
+    # Assertions
+    assert len(smtp_stand_in.messages) == 5
+    assert smtp_stand_in.sessions == smtp_stand_in.logins == 2
@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.dependencies import get_settings
+from app.services.user_service import UserService
+from app.utils.statement_cache import StatementCacheStats
+
+@pytest.fixture
+async def counted_session_factory():
+    engine = create_async_engine(get_settings().database_url)
+    stats = StatementCacheStats()
+    stats.install(engine)
+    yield stats, sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_repeated_lookups_hit_the_compiled_cache(counted_session_factory, user):
+    stats, session_factory = counted_session_factory
+    async with session_factory() as session:
+        for _ in range(5):
+            assert await UserService.get_by_email(session, user.email) is not None
+            assert await UserService.count(session) == 1
+
+    snapshot = stats.snapshot()
+    assert snapshot["misses"] == 2
+    assert snapshot["hits"] == 8
+    assert snapshot["hit_ratio"] == pytest.approx(0.8)
+
+def test_snapshot_without_executions():
+    assert StatementCacheStats().snapshot() == {"hits": 0, "misses": 0, "uncached": 0, "hit_ratio": 0.0}
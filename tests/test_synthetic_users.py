@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from asyncpg.exceptions import UniqueViolationError
+import pytest
+from sqlalchemy import func, select, text
+from app.models.user_model import User, UserRole
+from app.services.user_service import UserService
+from app.utils.security import verify_password
+from app.utils.synthetic_users import SyntheticUsers, copy_users, synthetic_password
+
+pytestmark = pytest.mark.asyncio
+
+NOW = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+def _generator(**options):
+    return SyntheticUsers(seed=7, pool_size=50, password_count=2, bcrypt_rounds=4, now=NOW, **options)
+
+# Test that the same seed generates the same rows, apart from the password salts
+async def test_rows_are_reproducible():
+    assert [row[:-1] for row in _generator().rows(0, 100)] == [row[:-1] for row in _generator().rows(0, 100)]
+
+# Test that generated rows follow the requested distributions and stay consistent with each other
+async def test_rows_are_realistic():
+    rows = [dict(zip(("id", "nickname", "email", "role", "locked", "verified", "token"), (
+        row[0], row[1], row[2], row[9], row[14], row[18], row[17],
+    ))) for row in _generator(verified_ratio=0.5, locked_ratio=0.1).rows(0, 4000)]
+
+    # Assertions
+    assert len({row["nickname"] for row in rows}) == len({row["email"] for row in rows}) == len({row["id"] for row in rows}) == 4000
+    assert all(3 <= len(row["nickname"]) <= 30 for row in rows)
+    assert 0.45 < sum(row["verified"] for row in rows) / 4000 < 0.55
+    assert 0.07 < sum(row["locked"] for row in rows) / 4000 < 0.13
+    assert all((row["role"] == UserRole.ANONYMOUS.name) == (not row["verified"]) for row in rows)
+    assert all((row["token"] is None) == row["verified"] for row in rows)
+
+# Test that users are COPYed in chunks and can log in with the precomputed passwords
+async def test_copy_users(db_session):
+    users = _generator(locked_ratio=0)
+    progress = []
+
+    loaded = await copy_users(db_session, users, 2500, chunk_size=1000, on_chunk=progress.append)
+
+    # Assertions
+    assert loaded == 2500
+    assert progress == [1000, 2000, 2500]
+    assert await db_session.scalar(select(func.count()).select_from(User)) == 2500
+    user = await db_session.scalar(select(User).where(User.email_verified.is_(True)).limit(1))
+    password = next(synthetic_password(index) for index in range(2) if verify_password(synthetic_password(index), user.hashed_password))
+    assert await UserService.login_user(db_session, user.email, password) is not None
+
+# Test a load that generates on worker processes and rebuilds the secondary indexes afterwards
+async def test_copy_users_with_workers_and_deferred_indexes(db_session):
+    index_names = text("SELECT array_agg(indexname::text ORDER BY indexname) FROM pg_indexes WHERE tablename = 'users'")
+    indexes_before = await db_session.scalar(index_names)
+
+    loaded = await copy_users(db_session, _generator(), 3000, chunk_size=1000, workers=2, defer_indexes=True)
+
+    # Assertions
+    assert loaded == 3000
+    assert await db_session.scalar(index_names) == indexes_before
+    assert await db_session.scalar(select(func.count()).select_from(User)) == 3000
+    with pytest.raises(UniqueViolationError):
+        await copy_users(db_session, _generator(), 10, defer_indexes=True)  # same seed: duplicate emails
+    assert await db_session.scalar(index_names) == indexes_before
@@ -0,0 +1,53 @@
+import os
+import shutil
+import markdown2
+import pytest
+from app.utils.template_manager import TemplateManager
+
+@pytest.fixture
+def template_manager(tmp_path):
+    manager = TemplateManager()
+    shutil.copytree(manager.templates_dir, tmp_path, dirs_exist_ok=True)
+    (tmp_path / "line_start.md").write_text("{greeting}\n\n{item} is listed.\n")
+    manager.templates_dir = tmp_path
+    return manager
+
+def _render_from_scratch(manager, template_name, **context):
+    """What render_template returned before templates were compiled."""
+    header, main, footer = (manager._read_template(name) for name in ("header.md", f"{template_name}.md", "footer.md"))
+    return manager._apply_email_styles(markdown2.markdown(f"{header}\n{main.format(**context)}\n{footer}"))
+
+# Test that compiled templates render exactly what rendering from scratch does, whatever the values
+@pytest.mark.parametrize("template_name, context", [
+    ("email_verification", {"name": "Jane O'Neil", "verification_url": "http://localhost/verify-email/1f0e/Ab_c-D"}),
+    ("email_verification", {"name": "<b>Jane</b> & *friends*", "verification_url": "http://x/?a=1&b=\"2\""}),
+    ("email_verification", {"name": "", "verification_url": ""}),
+    ("email_verification", {"name": None, "verification_url": "a_b_c"}),
+    ("line_start", {"greeting": "Hello", "item": "Widget"}),
+    ("line_start", {"greeting": "1. Hello", "item": "- Widget"}),
+    ("test_email", {}),
+])
+def test_render_matches_from_scratch(template_manager, template_name, context):
+    assert template_manager.render_template(template_name, **context) == _render_from_scratch(template_manager, template_name, **context)
+
+# Test that a compiled template is only read again after one of its files changes
+def test_compiled_templates_follow_file_changes(template_manager, monkeypatch):
+    reads = []
+    read_template = template_manager._read_template
+    monkeypatch.setattr(template_manager, "_read_template", lambda filename: reads.append(filename) or read_template(filename))
+    context = {"name": "Jane", "verification_url": "http://localhost/verify"}
+
+    first = template_manager.render_template("email_verification", **context)
+    template_manager.render_template("email_verification", **context)
+    assert len(reads) == 3
+
+    footer = template_manager.templates_dir / "footer.md"
+    footer.write_text("Bye for now.\n")
+    os.utime(footer, ns=(footer.stat().st_atime_ns, footer.stat().st_mtime_ns + 1_000_000_000))
+    second = template_manager.render_template("email_verification", **context)
+
+    # Assertions
+    assert len(reads) == 6
+    assert "Bye for now." in second and "Bye for now." not in first
+    with pytest.raises(ValueError, match="missing.md not found"):
+        template_manager.render_template("missing")
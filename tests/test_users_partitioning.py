@@ -0,0 +1,86 @@
+"""
+Tests for hash-partitioned `users`. Most only run with partitioning enabled, e.g.
+
+    USERS_PARTITION_COUNT=4 pytest
+
+in which case the rest of the suite also runs against the partitioned table.
+"""
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from app.models.user_model import USER_LOOKUP_TABLES, USERS_PARTITION_COUNT, USERS_PARTITIONED, User, UserRole
+from app.services.user_service import UserService, _USER_LOOKUPS
+from app.utils.users_partitioning import repartition_users, users_partition_count
+
+pytestmark = pytest.mark.asyncio
+partitioned_only = pytest.mark.skipif(not USERS_PARTITIONED, reason="users is not partitioned (USERS_PARTITION_COUNT=0)")
+
+async def _lookup_rows(db_session, column):
+    table = USER_LOOKUP_TABLES[column]
+    result = await db_session.execute(select(table.c[column], table.c.user_id))
+    return dict(result.all())
+
+@partitioned_only
+async def test_duplicate_email_is_rejected_across_partitions(db_session, user):
+    db_session.add(User(nickname="someone_else", email=user.email, hashed_password="x", role=UserRole.AUTHENTICATED))
+    with pytest.raises(IntegrityError):
+        await db_session.commit()
+
+@partitioned_only
+async def test_lookup_tables_follow_updates_and_deletes(db_session, user):
+    await UserService.update(db_session, user.id, {"email": "moved@example.com", "nickname": "moved_user"})
+    assert (await _lookup_rows(db_session, "email")) == {"moved@example.com": user.id}
+    assert (await _lookup_rows(db_session, "nickname")) == {"moved_user": user.id}
+
+    await db_session.execute(text("DELETE FROM users WHERE id = :id"), {"id": user.id})
+    await db_session.commit()
+    assert (await _lookup_rows(db_session, "email")) == {}
+
+@partitioned_only
+async def test_email_lookup_reads_a_single_partition(db_session, users_with_same_role_50_users):
+    email = users_with_same_role_50_users[0].email
+    query = _USER_LOOKUPS["email", False].params(value=email)
+    sql = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = await db_session.execute(text(f"EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF, SUMMARY OFF) {sql}"))
+    plan = "\n".join(plan.scalars().all())
+
+    # Every partition but the one holding the user is pruned at run time.
+    assert plan.count("never executed") == USERS_PARTITION_COUNT - 1
+    assert (await UserService.get_by_email(db_session, email)).id == users_with_same_role_50_users[0].id
+
+_ROWS = text("SELECT id, email, nickname, change_seq FROM users ORDER BY id")
+_INSERT_DUPLICATE = text(
+    "INSERT INTO users (id, nickname, email, role, email_verified, hashed_password) "
+    "VALUES (gen_random_uuid(), 'duplicate', :email, 'AUTHENTICATED', false, 'x')"
+)
+
+# Test that repartitioning to another partition count and back keeps every row and its change_seq, and
+# keeps email uniqueness and the change_seq trigger working in between
+async def test_repartition_users_round_trip(db_session, user, verified_user, admin_user):
+    user_id, email = user.id, user.email
+    rows = (await db_session.execute(_ROWS)).all()
+    other = USERS_PARTITION_COUNT + 1 if USERS_PARTITIONED else 3
+
+    assert await repartition_users(db_session, other) == USERS_PARTITION_COUNT
+    await db_session.commit()
+    assert await users_partition_count(db_session) == other
+    assert (await db_session.execute(_ROWS)).all() == rows
+    assert await db_session.scalar(text("SELECT count(*) FROM user_emails")) == len(rows)
+    with pytest.raises(IntegrityError):
+        await db_session.execute(_INSERT_DUPLICATE, {"email": email})
+    await db_session.rollback()
+    await db_session.execute(text("UPDATE users SET bio = 'moved' WHERE id = :id"), {"id": user_id})
+    stamped = await db_session.scalar(text("SELECT change_seq FROM users WHERE id = :id"), {"id": user_id})
+    await db_session.commit()
+
+    assert await repartition_users(db_session, USERS_PARTITION_COUNT) == other
+    await db_session.commit()
+
+    # Assertions
+    assert await users_partition_count(db_session) == USERS_PARTITION_COUNT
+    assert stamped > 0
+    assert (await db_session.execute(_ROWS)).all() == [
+        (id, email, nickname, stamped if id == user_id else change_seq) for id, email, nickname, change_seq in rows
+    ]
+    assert await repartition_users(db_session, USERS_PARTITION_COUNT) == USERS_PARTITION_COUNT